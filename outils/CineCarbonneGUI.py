@@ -9,8 +9,7 @@ from pathlib import Path
 import normalize
 import enrich_3_0 as enrich
 import excel_to_json
-import make_tableau_ingest as ingest
-import make_tableau_service as service
+import tableau_engine
 import generate_prochainement_json as gen_prochainement
 
 TMDB_API_KEY=os.getenv ("TMDB_API_KEY","4b400d47b0a36eed006040846feebaf5")
@@ -96,13 +95,10 @@ def convert():
                     "veuillez sélectionner  l'option 'normalize' dans l'interface")
         continu=False
 
-    #create ingest file
-    if continu and options["ingest"].get():
-        ingest.main()
-
-    #create service file
-    if continu and options["service"].get():
-        service.main()
+    #create ingest / service files (normalized.xlsx lu une seule fois)
+    tableaux = [name for name in ("ingest", "service") if options[name].get()]
+    if continu and tableaux:
+        tableau_engine.render_tableaux(tableaux)
 
     # create enriched file for site MAJ
     if continu and options["enrich"].get():
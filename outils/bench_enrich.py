@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+bench_enrich.py
+Mesure enrich_3_0.main() de bout en bout, hors ligne, sur une archive HTTP.
+
+1) Enregistrer une archive (passage reel, une fois):
+   python outils/enrich_3_0.py --record outils/work/fixtures/enrich.jsonl.gz
+2) Rejouer et mesurer (sans reseau):
+   python outils/bench_enrich.py outils/work/fixtures/enrich.jsonl.gz --latency 0.15
+
+- Chaque passage tourne dans un dossier temporaire (copie de work/normalized.xlsx),
+  sans cache HTTP ni point de reprise, avec le choix 'm' aux conflits Allocine/TMDB.
+- Mesures: temps total, CPU du processus, requetes par hote, requetes absentes
+  de l'archive, et par etape du pipeline: taches, temps cumule, CPU.
+- --json ecrit les mesures pour comparer deux versions du code.
+
+3) Extracteurs seuls (--extractors): chaque extracteur HTML est chronometre
+   sur les pages de l'archive qui le concernent (meilleur de 5 series, en
+   microsecondes par page). Avec --baseline, le script echoue (code 1) si un
+   extracteur est plus lent que la reference au-dela de --tolerance:
+   python outils/bench_enrich.py ARCHIVE --extractors --json extracteurs.json
+   python outils/bench_enrich.py ARCHIVE --extractors --baseline extracteurs.json
+
+4) Similarite (--similarity, archive facultative): paires de titres et de
+   realisateurs distincts de data/programme.json (--programme), plus les
+   paires (variante de la requete, titre trouve) des recherches Allocine /
+   TMDB / YouTube de l'archive si elle est donnee. Chronometre chaque moteur
+   de similarity.py, verifie que rapidfuzz et python donnent exactement les
+   memes scores (si rapidfuzz est installe) et que ratio_matrix donne les
+   memes valeurs que ratio pour chaque moteur, puis compte les paires qui
+   changent de cote d'un seuil de enrich_3_0.py par rapport a difflib. Code 1
+   si un score differe ou si le moteur actif (SIMILARITY_BACKEND, difflib par
+   defaut) fait changer de cote une seule paire:
+   python outils/bench_enrich.py --similarity
+   SIMILARITY_BACKEND=rapidfuzz python outils/bench_enrich.py --similarity
+
+5) Fiches Allocine (--fiches): pour chaque fiche de l'archive, les champs
+   extraits du balayage unique (AllocineFiche) doivent etre ceux obtenus par
+   des recherches independantes sur toute la page (carte, sections, bloc
+   acteurs, meta, JSON-LD, etiquettes d'age, bandes-annonces), y compris pour
+   les blocs imbriques dans la carte. Code 1 au moindre champ different:
+   python outils/bench_enrich.py ARCHIVE --fiches
+"""
+
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import enrich_3_0 as enrich
+import fetch_engine
+import http_replay
+import similarity
+
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_INPUT = BASE_DIR / "work" / "normalized.xlsx"
+DEFAULT_PROGRAMME = BASE_DIR.parent / "data" / "programme.json"
+SIMILARITY_MATRIX_ROWS = 256
+SIMILARITY_FLIP_EXAMPLES = 5
+EXTRACTOR_SERIES = 5
+EXTRACTOR_TOLERANCE = 0.30
+
+
+# Recherches independantes sur toute la page (extracteurs d'avant
+# AllocineFiche): reference du controle --fiches.
+REFERENCE_FICHE_BLOCKS = {
+    "card": re.compile(
+        r'<div[^>]*class="[^"]*entity-card-player-ovw[^"]*"[^>]*>.*?</div>\s*</div>',
+        re.IGNORECASE | re.DOTALL,
+    ),
+    "synopsis_section": re.compile(
+        r'<section[^>]*class="[^"]*ovw-synopsis[^"]*"[^>]*>(.*?)</section>',
+        re.IGNORECASE | re.DOTALL,
+    ),
+    "technical_section": re.compile(
+        r'<section[^>]*class="[^"]*ovw-technical[^"]*"[^>]*>(.*?)</section>',
+        re.IGNORECASE | re.DOTALL,
+    ),
+    "actors_block": re.compile(
+        r'<div[^>]*class="[^"]*meta-body-actor[^"]*"[^>]*>(.*?)</div>',
+        re.IGNORECASE | re.DOTALL,
+    ),
+}
+REFERENCE_META_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+REFERENCE_JSON_LD_RE = re.compile(
+    r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+FICHE_FIELDS = (
+    "json_ld",
+    "og_title",
+    "synopsis",
+    "actors",
+    "thumbnail",
+    "og_image",
+    "release_date",
+    "countries",
+    "jp_age",
+    "trailer",
+)
+
+
+def _reference_fiche(url: str, text: str) -> "enrich.AllocineFiche":
+    """AllocineFiche remplie bloc par bloc par des recherches sur toute la page."""
+    fiche = enrich.AllocineFiche(url, "")
+    fiche.html = text
+    for name, pattern in REFERENCE_FICHE_BLOCKS.items():
+        match = pattern.search(text)
+        if match:
+            setattr(fiche, name, match.group(match.lastindex or 0))
+    for tag in REFERENCE_META_RE.findall(text):
+        attrs = {k.lower(): v for k, v in enrich.ALLOCINE_META_ATTR_RE.findall(tag)}
+        if attrs.get("content") is not None:
+            for attr in ("property", "name"):
+                if attrs.get(attr):
+                    fiche.meta.setdefault((attr, attrs[attr].lower()), attrs["content"])
+    fiche.json_ld = REFERENCE_JSON_LD_RE.findall(text)
+    fiche.kids_labels = enrich.JP_AGE_LABEL_RE.findall(text)
+    for match in enrich.ALLOCINE_TRAILER_LINK_RE.finditer(text):
+        fiche._add_trailer_link(match.group(0))
+    return fiche
+
+
+def _fiche_fields(url: str, text: str, fiche=None) -> list:
+    fiche = fiche or enrich.AllocineFiche(url, text)
+    return [
+        enrich._allocine_parse_json_ld(fiche),
+        enrich._allocine_extract_og_title(fiche),
+        enrich._allocine_parse_synopsis(fiche),
+        enrich._allocine_parse_main_actors(fiche),
+        enrich._allocine_extract_affiche_thumbnail(fiche),
+        enrich._allocine_extract_og_image(fiche),
+        enrich._allocine_parse_release_date(fiche),
+        enrich._allocine_parse_countries(fiche),
+        enrich._extract_jp_age_from_allocine_html(fiche),
+        enrich._allocine_extract_trailer_url(fiche),
+    ]
+
+
+def _search_query(url: str, params: dict) -> str:
+    query = (
+        params.get("q")
+        or params.get("search_query")
+        or params.get("query")
+        or parse_qs(urlsplit(url).query).get("q", [""])[0]
+    )
+    return str(query or "")
+
+
+# nom -> (selection des pages de l'archive, extracteur(url, texte, parametres))
+EXTRACTORS = {
+    "allocine_fiche": (
+        lambda url: "/film/fichefilm_gen_cfilm=" in url,
+        lambda url, text, params: _fiche_fields(url, text),
+    ),
+    "allocine_palmares": (
+        lambda url: url.endswith("/palmares/"),
+        lambda url, text, params: enrich._allocine_parse_awards(text),
+    ),
+    "allocine_photos": (
+        lambda url: url.endswith("/photos/"),
+        lambda url, text, params: enrich._allocine_extract_shot_urls(text),
+    ),
+    "allocine_search": (
+        lambda url: url.startswith(enrich.ALLOCINE_SEARCH_URL),
+        lambda url, text, params: enrich._allocine_parse_movies(enrich._allocine_movies_section(text)),
+    ),
+    "allocine_player": (
+        lambda url: "player_gen_cmedia=" in url,
+        lambda url, text, params: enrich._allocine_player_video_url(text),
+    ),
+    "youtube_search": (
+        lambda url: url.startswith(enrich.YOUTUBE_SEARCH_URL),
+        lambda url, text, params: enrich._youtube_parse_candidates(text, _search_query(url, params)),
+    ),
+    "title_variants": (
+        lambda url: url.startswith((enrich.ALLOCINE_SEARCH_URL, enrich.YOUTUBE_SEARCH_URL)),
+        lambda url, text, params: (
+            enrich._title_variants(_search_query(url, params)),
+            enrich._normalize_title_for_search(_search_query(url, params)),
+        ),
+    ),
+}
+
+
+@contextlib.contextmanager
+def _track_engines():
+    """Garde une reference sur chaque FetchEngine cree pendant le passage."""
+    engines = []
+    original = fetch_engine.FetchEngine
+
+    class TrackedEngine(original):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            engines.append(self)
+
+    fetch_engine.FetchEngine = TrackedEngine
+    try:
+        yield engines
+    finally:
+        fetch_engine.FetchEngine = original
+
+
+def run_once(fixtures: http_replay.FixtureArchive, input_path: Path, latency: float, verbose: bool) -> dict:
+    replay = http_replay.ReplaySession(fixtures, latency=latency)
+    http_replay.install(enrich, replay)
+    enrich.TMDB_CREDITS_MEMO.clear()
+    enrich.ALLOCINE_FICHE_MEMO.clear()
+    enrich._clear_match_caches()
+    enrich.ALLOCINE_RATE_LIMITER.reset()
+
+    with tempfile.TemporaryDirectory(prefix="bench_enrich_") as tmp:
+        base = Path(tmp)
+        (base / "work").mkdir()
+        shutil.copy(input_path, base / "work" / "normalized.xlsx")
+        enrich.BASE_DIR = base
+        enrich.ENRICHMENT_REPORT_PATH = base / "work" / "enrichment_report.json"
+        enrich.CHECKPOINT_PATH = base / "work" / "enrich_checkpoint.jsonl"
+        enrich.FILM_INDEX_PATH = base / "work" / "film_index.json"
+        enrich.PROGRAMME_JSON_PATH = base / "programme.json"
+
+        output = io.StringIO()
+        redirect = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(output)
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        with redirect, _track_engines() as engines:
+            enrich.main()
+        wall = time.perf_counter() - started_wall
+        cpu = time.process_time() - started_cpu
+
+    stages = {}
+    for engine in engines:
+        for stage, stats in engine.monitor.snapshot().items():
+            total = stages.setdefault(stage, {"tasks": 0, "busy": 0.0, "cpu": 0.0})
+            total["tasks"] += int(stats["done"])
+            total["busy"] += stats["busy"]
+            total["cpu"] += stats["cpu"]
+    return {
+        "wall": wall,
+        "cpu": cpu,
+        "requests": replay.request_count(),
+        "requests_by_host": dict(replay.requests_by_host),
+        "missing": len(replay.missing),
+        "stages": stages,
+    }
+
+
+def print_run(index: int, result: dict) -> None:
+    hosts = ", ".join(f"{host}={count}" for host, count in sorted(result["requests_by_host"].items()))
+    print(
+        f"[{index}] {result['wall']:.2f}s total, cpu {result['cpu']:.2f}s, "
+        f"{result['requests']} requete(s) ({hosts}), {result['missing']} absente(s) de l'archive",
+        flush=True,
+    )
+    for stage, stats in result["stages"].items():
+        print(
+            f"      {stage:<16} {stats['tasks']:>4} tache(s) {stats['busy']:>7.2f}s cumulees  cpu {stats['cpu']:.2f}s",
+            flush=True,
+        )
+
+
+def _archive_pages(fixtures: http_replay.FixtureArchive) -> list[tuple[str, str, dict]]:
+    pages = []
+    for entry in fixtures.entries.values():
+        if int(entry["status"]) != 200:
+            continue
+        body = base64.b64decode(entry["body"])
+        pages.append((entry["url"], body.decode(entry.get("encoding") or "utf-8", "replace"), entry["params"]))
+    return pages
+
+
+def bench_extractors(fixtures: http_replay.FixtureArchive) -> dict:
+    """Microsecondes par page pour chaque extracteur (meilleure serie)."""
+    pages = _archive_pages(fixtures)
+    results = {}
+    for name, (selects, extract) in EXTRACTORS.items():
+        selected = [page for page in pages if selects(page[0])]
+        if not selected:
+            continue
+
+        def run_all(selected=selected, extract=extract):
+            for url, text, params in selected:
+                extract(url, text, params)
+
+        timer = timeit.Timer(run_all)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=EXTRACTOR_SERIES, number=number))
+        results[name] = {
+            "pages": len(selected),
+            "bytes": sum(len(text) for _, text, _ in selected),
+            "us_per_page": best / number / len(selected) * 1e6,
+        }
+    return results
+
+
+def check_extractors(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Extracteurs plus lents que la reference au-dela de la tolerance."""
+    regressions = []
+    for name, stats in results.items():
+        reference = (baseline.get(name) or {}).get("us_per_page")
+        if not reference:
+            continue
+        if stats["us_per_page"] > reference * (1.0 + tolerance):
+            regressions.append(
+                f"{name}: {stats['us_per_page']:.1f} us/page > reference {reference:.1f} us/page (+{tolerance:.0%})"
+            )
+    return regressions
+
+
+def main_extractors(args: argparse.Namespace, fixtures: http_replay.FixtureArchive) -> int:
+    results = bench_extractors(fixtures)
+    baseline = {}
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")).get("extractors", {})
+    for name, stats in results.items():
+        reference = (baseline.get(name) or {}).get("us_per_page")
+        delta = f"  ({stats['us_per_page'] / reference - 1.0:+.0%})" if reference else ""
+        print(
+            f"{name:<18} {stats['pages']:>4} page(s) {stats['bytes'] / 1024:>8.0f} Ko "
+            f"{stats['us_per_page']:>10.1f} us/page{delta}",
+            flush=True,
+        )
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"extractors": results}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+    regressions = check_extractors(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", flush=True)
+    return 1 if regressions else 0
+
+
+def _similarity_pairs(fixtures: http_replay.FixtureArchive) -> list[tuple[str, str]]:
+    pairs = []
+    for url, text, params in _archive_pages(fixtures):
+        query = _search_query(url, params)
+        if not query:
+            continue
+        if url.startswith(enrich.ALLOCINE_SEARCH_URL):
+            titles = [item["title"] for item in enrich._allocine_parse_movies(enrich._allocine_movies_section(text))]
+        elif url.startswith(enrich.YOUTUBE_SEARCH_URL):
+            titles = [item["title"] for item in enrich._youtube_parse_candidates(text, query)]
+        elif "/search/movie" in url:
+            results = json.loads(text).get("results") or []
+            titles = [item.get(key) or "" for item in results for key in ("title", "original_title")]
+        else:
+            continue
+        variants = enrich._title_variants(query)
+        for title in titles:
+            candidate = enrich.normalize_for_match(title)
+            if candidate:
+                pairs.extend((variant, candidate) for variant in variants)
+    return pairs
+
+
+def main_fiches(fixtures: http_replay.FixtureArchive) -> int:
+    """Champs extraits par le balayage unique == recherches independantes, fiche par fiche."""
+    pages = [page for page in _archive_pages(fixtures) if EXTRACTORS["allocine_fiche"][0](page[0])]
+    if not pages:
+        print("fiches: aucune fiche Allocine dans l'archive", flush=True)
+        return 0
+    differences = 0
+    for url, text, _ in pages:
+        scanned = _fiche_fields(url, text)
+        reference = _fiche_fields(url, text, _reference_fiche(url, text))
+        for name, got, expected in zip(FICHE_FIELDS, scanned, reference):
+            if got != expected:
+                differences += 1
+                print(f"DIFFERENCE {url} {name}: {got!r} != {expected!r}", flush=True)
+    print(f"fiches: {len(pages)} fiche(s), {differences} champ(s) different(s)", flush=True)
+    return 1 if differences else 0
+
+
+def _programme_pairs(path: Path) -> list[tuple[str, str]]:
+    """Paires de titres (titre, titre original) et de realisateurs distincts du programme publie."""
+    films = json.loads(path.read_text(encoding="utf-8"))
+    titles = sorted(
+        {enrich.normalize_for_match(film.get(key) or "") for film in films for key in ("titre", "titre_original")}
+        - {""}
+    )
+    directors = sorted(
+        {
+            enrich.normalize_for_match(name)
+            for film in films
+            for name in str(film.get("realisateur") or "").split(",")
+        }
+        - {""}
+    )
+    return [
+        (left, right)
+        for names in (titles, directors)
+        for index, left in enumerate(names)
+        for right in names[index + 1 :]
+    ]
+
+
+def _matrix_differences(ratio_matrix, ratio, pairs: list[tuple[str, str]]) -> int:
+    """Paires ou ratio_matrix (lignes x colonnes distinctes) differe de ratio."""
+    rows = sorted({left for left, _ in pairs})
+    cols = sorted({right for _, right in pairs})
+    col_index = {col: idx for idx, col in enumerate(cols)}
+    by_row: dict[str, list[str]] = {}
+    for left, right in pairs:
+        by_row.setdefault(left, []).append(right)
+    different = 0
+    for start in range(0, len(rows), SIMILARITY_MATRIX_ROWS):
+        chunk = rows[start : start + SIMILARITY_MATRIX_ROWS]
+        scores = ratio_matrix(chunk, cols)
+        for row_idx, left in enumerate(chunk):
+            different += sum(
+                1 for right in by_row[left] if scores[row_idx, col_index[right]] != ratio(left, right)
+            )
+    return different
+
+
+def main_similarity(pairs: list[tuple[str, str]]) -> int:
+    if not pairs:
+        print("similarite: aucune paire de titres", flush=True)
+        return 0
+    scores = {}
+    for name, ratio in similarity.BACKENDS.items():
+
+        # Cout du calcul, sans le cache de ratio (difflib).
+        def run_all(ratio=getattr(ratio, "__wrapped__", ratio)):
+            for left, right in pairs:
+                ratio(left, right)
+
+        timer = timeit.Timer(run_all)
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=EXTRACTOR_SERIES, number=number))
+        scores[name] = [ratio(left, right) for left, right in pairs]
+        print(f"{name:<10} {len(pairs):>6} paire(s) {best / number / len(pairs) * 1e6:>8.2f} us/paire", flush=True)
+
+    status = 0
+    if "rapidfuzz" in scores:
+        different = sum(1 for a, b in zip(scores["rapidfuzz"], scores["python"]) if a != b)
+        print(f"rapidfuzz / python: {different} score(s) different(s)", flush=True)
+        status = 1 if different else status
+    else:
+        print("rapidfuzz / python: rapidfuzz non installe, comparaison ignoree", flush=True)
+
+    for name, ratio_matrix in similarity.MATRIX_BACKENDS.items():
+        different = _matrix_differences(ratio_matrix, similarity.BACKENDS[name], pairs)
+        print(f"{name:<10} ratio_matrix / ratio: {different} score(s) different(s)", flush=True)
+        status = 1 if different else status
+
+    thresholds = sorted(
+        {
+            enrich.ALLOCINE_MATCH_THRESHOLD,
+            enrich.TMDB_MATCH_THRESHOLD,
+            enrich.CROSS_MATCH_TITLE_THRESHOLD,
+            enrich.GOOGLE_MATCH_TITLE_THRESHOLD,
+            enrich.GOOGLE_MATCH_DIRECTOR_THRESHOLD,
+            enrich.YOUTUBE_ACCEPT_SCORE,
+        }
+    )
+    active = similarity.backend_name()
+    for name in scores:
+        if name == "difflib":
+            continue
+        for threshold in thresholds:
+            flips = [
+                pair
+                for pair, new, old in zip(pairs, scores[name], scores["difflib"])
+                if (new >= threshold) != (old >= threshold)
+            ]
+            print(
+                f"{name:<10} seuil {threshold:.2f}: {len(flips)} paire(s) changent de cote par rapport a difflib",
+                flush=True,
+            )
+            for left, right in flips[:SIMILARITY_FLIP_EXAMPLES]:
+                print(f"    {left!r} / {right!r}", flush=True)
+            if flips and name == active:
+                status = 1
+    print(f"moteur actif: {active}", flush=True)
+    return status
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bench hors ligne de enrich_3_0.py sur une archive HTTP.")
+    parser.add_argument(
+        "fixtures",
+        nargs="?",
+        help="Archive enregistree avec enrich_3_0.py --record (facultative avec --similarity).",
+    )
+    parser.add_argument("--input", default=str(DEFAULT_INPUT), help="normalized.xlsx a enrichir.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence simulee par requete (s).")
+    parser.add_argument("--repeat", type=int, default=1, help="Nombre de passages.")
+    parser.add_argument("--json", help="Ecrit les mesures dans ce fichier JSON.")
+    parser.add_argument("--verbose", action="store_true", help="Affiche le journal de enrich_3_0.py.")
+    parser.add_argument("--extractors", action="store_true", help="Chronometre les extracteurs HTML seuls.")
+    parser.add_argument("--similarity", action="store_true", help="Compare les moteurs de similarite.")
+    parser.add_argument(
+        "--programme",
+        default=str(DEFAULT_PROGRAMME),
+        help="programme.json dont les titres / realisateurs servent de paires pour --similarity.",
+    )
+    parser.add_argument(
+        "--fiches",
+        action="store_true",
+        help="Verifie les champs des fiches Allocine contre des recherches independantes.",
+    )
+    parser.add_argument("--baseline", help="Mesures --extractors de reference (JSON): echec si plus lent.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=EXTRACTOR_TOLERANCE,
+        help="Ralentissement toleree par rapport a --baseline (0.30 = +30%%).",
+    )
+    args = parser.parse_args()
+    if not args.fixtures and not args.similarity:
+        parser.error("archive requise (sauf avec --similarity)")
+    return args
+
+
+def main() -> int:
+    args = parse_args()
+    os.environ.setdefault("TMDB_API_KEY", "replay")
+    os.environ["OPEN_ENRICHMENT_REPORT"] = "0"
+    enrich._prompt_source_choices = lambda reviews: ["m"] * len(reviews)
+    enrich.mode_Gui = False
+    enrich.HTTP_CACHE.enabled = False
+
+    if args.similarity:
+        pairs = _programme_pairs(Path(args.programme))
+        print(f"{args.programme}: {len(pairs)} paire(s) titres / realisateurs", flush=True)
+        if args.fixtures:
+            fixtures = http_replay.FixtureArchive(Path(args.fixtures)).load()
+            archive_pairs = _similarity_pairs(fixtures)
+            print(f"archive: {len(fixtures.entries)} reponse(s), {len(archive_pairs)} paire(s)", flush=True)
+            pairs += archive_pairs
+        return main_similarity(pairs)
+
+    fixtures = http_replay.FixtureArchive(Path(args.fixtures)).load()
+    if any(entry["url"].startswith(enrich.GOOGLE_CSE_URL) for entry in fixtures.entries.values()):
+        # Le secours Google n'est actif qu'avec des identifiants (ignores au rejeu).
+        os.environ.setdefault("GOOGLE_API_KEY", "replay")
+        os.environ.setdefault("GOOGLE_CX", "replay")
+    if args.fiches:
+        print(f"archive: {len(fixtures.entries)} reponse(s)", flush=True)
+        return main_fiches(fixtures)
+    if args.extractors:
+        print(f"archive: {len(fixtures.entries)} reponse(s)", flush=True)
+        return main_extractors(args, fixtures)
+    print(f"archive: {len(fixtures.entries)} reponse(s), latence {args.latency:.2f}s", flush=True)
+
+    results = []
+    for index in range(1, max(1, args.repeat) + 1):
+        result = run_once(fixtures, Path(args.input), args.latency, args.verbose)
+        print_run(index, result)
+        results.append(result)
+
+    walls = [result["wall"] for result in results]
+    if len(walls) > 1:
+        print(f"mediane: {statistics.median(walls):.2f}s (min {min(walls):.2f}s, max {max(walls):.2f}s)", flush=True)
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"latency": args.latency, "runs": results}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
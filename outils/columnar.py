@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+columnar.py
+Traitement colonne par colonne des tableaux Excel (normalize.py,
+excel_to_json.py, make_tableau_*.py, enrich_3_0.py).
+
+- column_values(df, colonne): la colonne en liste Python (valeurs telles que
+  lues, sans Series par ligne comme DataFrame.iterrows).
+- map_unique(func, *colonnes): func n'est appelee qu'une fois par valeur (ou
+  combinaison de valeurs) distincte. Un programme de plusieurs annees repete
+  les memes dates, horaires, tarifs et categories: les parseurs et les
+  normalisations a base de regex ne tournent que sur les valeurs distinctes.
+  La cle tient compte du type (1, 1.0 et "1" ne se confondent pas).
+"""
+
+from typing import Any, Callable, Iterable
+
+import pandas as pd
+
+
+def column_values(df: pd.DataFrame, column: Any, default: Any = "") -> list:
+    """Valeurs d'une colonne (default pour chaque ligne si la colonne manque)."""
+    if column in df.columns:
+        return df[column].tolist()
+    return [default] * len(df)
+
+
+def _value_key(value: Any) -> tuple:
+    return (type(value), value)
+
+
+def map_unique(func: Callable[..., Any], *columns: Iterable) -> list:
+    """Comme list(map(func, *columns)), memoise par valeur distincte."""
+    cache: dict = {}
+    results = []
+    if len(columns) == 1:
+        keyed = ((_value_key(value), (value,)) for value in columns[0])
+    else:
+        keyed = (
+            (tuple(_value_key(value) for value in values), values)
+            for values in zip(*columns)
+        )
+    for key, values in keyed:
+        try:
+            result = cache[key]
+        except KeyError:
+            result = cache[key] = func(*values)
+        except TypeError:
+            # valeur non hashable: pas de memoisation
+            result = func(*values)
+        results.append(result)
+    return results
@@ -7,25 +7,34 @@ Pseudocode-first version.
 We will replace each step with real code progressively.
 """
 
+import argparse
 import base64
-import difflib
+import functools
 import html
 import json
 import os
 import sys
 import time
+import asyncio
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from threading import Lock
 from urllib.parse import quote_plus
-from typing import Optional
+from typing import Callable, Optional
 
+import numpy as np
 import pandas as pd
 import re
 import requests
 import unicodedata
 
+import enrich_checkpoint
+import fetch_engine
+import film_index
+import http_cache
+import http_replay
+import similarity
+from columnar import column_values, map_unique
+
 #for GUI
 import  tkinter as tk
 from tkinter import ttk as ttk
@@ -34,6 +43,12 @@ mode_Gui=False
 window=None
 BASE_DIR = Path(__file__).resolve().parent
 ENRICHMENT_REPORT_PATH = BASE_DIR / "work" / "enrichment_report.json"
+PROGRAMME_JSON_PATH = BASE_DIR.parent / "data" / "programme.json"
+CHECKPOINT_PATH = BASE_DIR / "work" / "enrich_checkpoint.jsonl"
+FILM_INDEX_PATH = BASE_DIR / "work" / "film_index.json"
+HTTP_CACHE = http_cache.HttpCache(BASE_DIR / "work" / "http_cache.sqlite")
+TMDB_CREDITS_MEMO = fetch_engine.SharedMemo("tmdb credits")
+ALLOCINE_FICHE_MEMO = fetch_engine.SharedMemo("allocine fiches")
 
 def log_step(text: str) -> None:
     print(f"- {text}", flush=True)
@@ -61,7 +76,7 @@ def _normalize_text(value: str) -> str:
 
 def _has_cineclub_or_patrimoine(categorie: str, commentaire: str) -> bool:
     text = _normalize_text(f"{categorie} {commentaire}")
-    compact = re.sub(r"[^a-z0-9]+", "", text)
+    compact = NON_ALNUM_RE.sub("", text)
     if "cineclub" in compact:
         return True
     return "patrimoine" in text
@@ -70,14 +85,23 @@ def _has_cineclub_or_patrimoine(categorie: str, commentaire: str) -> bool:
 ALLOCINE_BASE_URL = "https://www.allocine.fr"
 ALLOCINE_SEARCH_URL = "https://www.allocine.fr/rechercher/"
 ALLOCINE_TIMEOUT = 12
+# URL video resolue d'un lecteur Allocine, gardee dans le cache HTTP
+# (les films reconduits d'un mois sur l'autre ne rechargent pas le lecteur).
+ALLOCINE_PLAYER_RESOLVED_TTL = 90 * http_cache.DAY
 ALLOCINE_MATCH_THRESHOLD = 0.85
 ALLOCINE_WEIGHT_TITLE = 0.70
 ALLOCINE_WEIGHT_DIRECTOR = 0.30
-ALLOCINE_MAX_WORKERS = 2
+ALLOCINE_MAX_WORKERS = 4
 ALLOCINE_MAX_RETRIES = 6
 ALLOCINE_RETRY_BASE_DELAY = 1.0
 ALLOCINE_RETRY_MAX_DELAY = 20.0
 ALLOCINE_MIN_REQUEST_INTERVAL = 0.45
+# Debit adaptatif (AIMD): depart a 1 / ALLOCINE_MIN_REQUEST_INTERVAL, +0.05 req/s
+# par reponse propre, divise par 2 a chaque 429/5xx (au plus une fois par 2 s).
+ALLOCINE_MIN_RATE = 0.5
+ALLOCINE_MAX_RATE = 6.0
+ALLOCINE_RATE_INCREASE = 0.05
+ALLOCINE_RATE_DECREASE = 0.5
 ALLOCINE_RETRY_STATUS = {429, 500, 502, 503, 504}
 ALLOCINE_SESSION = requests.Session()
 ALLOCINE_SESSION.headers.update(
@@ -86,8 +110,13 @@ ALLOCINE_SESSION.headers.update(
         "Accept-Language": "fr-FR,fr;q=0.9",
     }
 )
-_ALLOCINE_REQUEST_LOCK = Lock()
-_ALLOCINE_LAST_REQUEST_TS = 0.0
+ALLOCINE_RATE_LIMITER = fetch_engine.AdaptiveTokenBucket(
+    rate=1.0 / ALLOCINE_MIN_REQUEST_INTERVAL,
+    min_rate=ALLOCINE_MIN_RATE,
+    max_rate=ALLOCINE_MAX_RATE,
+    increase=ALLOCINE_RATE_INCREASE,
+    decrease=ALLOCINE_RATE_DECREASE,
+)
 
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_TIMEOUT = 12
@@ -112,10 +141,31 @@ JP_AGE_TEXT_RE = re.compile(
     r"(?:a\s*partir\s*de|des|d\s*e?\s*s)\s*(\d{1,2})\s*ans?",
     flags=re.IGNORECASE,
 )
+# Balayage unique d'une fiche film: une alternative par element utile.
+ALLOCINE_FICHE_SCAN_RE = re.compile(
+    r'(?P<meta><meta\b[^>]*>)'
+    r'|<script[^>]*type="application/ld\+json"[^>]*>(?P<ld>.*?)</script>'
+    r'|(?P<card><div[^>]*class="[^"]*entity-card-player-ovw[^"]*"[^>]*>.*?</div>\s*</div>)'
+    r'|<section[^>]*class="[^"]*ovw-synopsis[^"]*"[^>]*>(?P<synopsis>.*?)</section>'
+    r'|<section[^>]*class="[^"]*ovw-technical[^"]*"[^>]*>(?P<technical>.*?)</section>'
+    r'|<div[^>]*class="[^"]*meta-body-actor[^"]*"[^>]*>(?P<actors>.*?)</div>'
+    r'|<[^>]*class="[^"]*kids-label[^"]*"[^>]*>(?P<kids>.*?)</[^>]+>'
+    r'|(?P<trailer>(?:https?://www\.allocine\.fr)?/video/player_gen_cmedia=\d+(?:(?:&amp;|&)cfilm=\d+)?\.html)',
+    flags=re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_META_ATTR_RE = re.compile(r'([\w:-]+)\s*=\s*"([^"]*)"')
+ALLOCINE_TRAILER_LINK_RE = re.compile(
+    r"(?:https?://www\.allocine\.fr)?/video/player_gen_cmedia=\d+(?:(?:&amp;|&)cfilm=\d+)?\.html",
+    flags=re.IGNORECASE,
+)
+ALLOCINE_TRAILER_CFILM_RE = re.compile(r"(?:[?&]|&amp;)cfilm=\d+\.html", re.IGNORECASE)
 TITLE_NOISE_TOKEN_RE = re.compile(
     r"\b(?:vo|vf|vost|vostf|vostfr|stfr|jp|scol|scolaire|3d|2d|imax)\b",
     flags=re.IGNORECASE,
 )
+# Caches LRU bornes: normalisation et variantes de titres (voir _match_cache_stats_line).
+NORMALIZE_CACHE_SIZE = 65536
+TITLE_VARIANTS_CACHE_SIZE = 4096
 TITLE_SEARCH_STOPWORDS = {
     "l",
     "le",
@@ -135,6 +185,11 @@ TITLE_SEARCH_STOPWORDS = {
 YOUTUBE_SEARCH_URL = "https://www.youtube.com/results"
 YOUTUBE_TIMEOUT = 10
 YOUTUBE_MAX_RESULTS = 12
+YOUTUBE_MAX_WORKERS = 2
+# Score (similarite + bonus bande annonce / annee) a partir duquel les
+# requetes YouTube suivantes d'un film ne sont pas lancees.
+YOUTUBE_EARLY_STOP_SCORE = 1.05
+YOUTUBE_ACCEPT_SCORE = 0.45
 YOUTUBE_SESSION = requests.Session()
 YOUTUBE_SESSION.headers.update(
     {
@@ -147,6 +202,14 @@ GOOGLE_TIMEOUT = 12
 GOOGLE_MAX_RESULTS = 5
 GOOGLE_MATCH_TITLE_THRESHOLD = 0.88
 GOOGLE_MATCH_DIRECTOR_THRESHOLD = 0.75
+GOOGLE_SESSION = requests.Session()
+FETCH_HOST_LIMITS = {
+    "allocine": ALLOCINE_MAX_WORKERS,
+    "tmdb": TMDB_MAX_WORKERS,
+    "youtube": YOUTUBE_MAX_WORKERS,
+    "google": 1,
+}
+PIPELINE_REPORT_INTERVAL = 5.0
 TRAILER_YOUTUBE_RE = re.compile(r"(?:youtube\.com/(?:watch\?v=|embed/)|youtu\.be/)[A-Za-z0-9_-]{6,}", re.IGNORECASE)
 TRAILER_VIMEO_RE = re.compile(r"(?:vimeo\.com/(?:video/)?)(\d+)", re.IGNORECASE)
 TRAILER_ALLOCINE_PLAYER_RE = re.compile(
@@ -159,6 +222,108 @@ TRAILER_DIRECT_VIDEO_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Motifs precompiles des extracteurs (bench: bench_enrich.py --extractors).
+# Texte
+WHITESPACE_RE = re.compile(r"\s+")
+MULTI_SPACE_RE = re.compile(r"\s{2,}")
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+DIGIT_RE = re.compile(r"\d")
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+HTML_SPAN_RE = re.compile(r"<span[^>]*>(.*?)</span>", re.IGNORECASE | re.DOTALL)
+COMMA_SPLIT_RE = re.compile(r"\s*,\s*")
+JP_TOKEN_RE = re.compile(r"\bjp\b")
+FIRST_URL_RE = re.compile(r"https?://[^\s\"']+")
+ISO_DURATION_RE = re.compile(r"^PT(?:(\d+)H)?(?:(\d+)M)?")
+NUMERIC_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+FRENCH_TEXT_DATE_RE = re.compile(r"(\d{1,2})\s+([a-z]+)\s+(\d{4})")
+YEAR_PREFIX_RE = re.compile(r"^\d{4}")
+YEAR_RE = re.compile(r"(?:19|20)\d{2}")
+# Titres et realisateurs
+TITLE_PLURAL_S_RE = re.compile(r"([A-Za-zÀ-ÖØ-öø-ÿ])\(\s*s\s*\)", re.IGNORECASE)
+PARENTHESIZED_RE = re.compile(r"\([^)]*\)")
+PAREN_CONTENT_RE = re.compile(r"\(([^)]+)\)")
+DIRECTOR_SPLIT_RE = re.compile(r"[,/]| et | and | & ", re.IGNORECASE)
+DIRECTOR_PREFIX_RE = re.compile(r"(?:Un film de|De)\s+([^|]+?)(?:\bAvec\b|$)", re.IGNORECASE)
+# Fiche film Allocine
+ALLOCINE_THUMBNAIL_RE = re.compile(
+    r'<img[^>]*class="[^"]*thumbnail-img[^"]*"[^>]*(?:src|data-src)="([^"]+)"',
+    re.IGNORECASE,
+)
+ALLOCINE_CARD_DATE_RE = re.compile(
+    r'<span[^>]*class="[^"]*date[^"]*"[^>]*>(.*?)</span>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_NATIONALITY_ITEM_RE = re.compile(
+    r'<div[^>]*class="[^"]*item[^"]*"[^>]*>\s*'
+    r'<span[^>]*class="[^"]*what[^"]*"[^>]*>\s*Nationalit[^<]*</span>(.*?)</div>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_NATIONALITY_SPAN_RE = re.compile(
+    r'<span[^>]*class="[^"]*nationality[^"]*"[^>]*>(.*?)</span>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_THAT_SPAN_RE = re.compile(r'<span[^>]*class="[^"]*that[^"]*"[^>]*>(.*?)</span>', re.IGNORECASE | re.DOTALL)
+ALLOCINE_SYNOPSIS_P_RE = re.compile(r'<p[^>]*class="[^"]*bo-p[^"]*"[^>]*>(.*?)</p>', re.IGNORECASE | re.DOTALL)
+ALLOCINE_CONTENT_TXT_RE = re.compile(
+    r'<div[^>]*class="[^"]*content-txt[^"]*"[^>]*>(.*?)</div>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_DARK_GREY_LINK_RE = re.compile(
+    r'<span[^>]*class="[^"]*dark-grey-link[^"]*"[^>]*>(.*?)</span>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_CFILM_ID_RE = re.compile(r"cfilm=(\d+)")
+ALLOCINE_FICHEFILM_ID_RE = re.compile(r"fichefilm-(\d+)")
+# Palmares: reperes de blocs / lignes, puis recherches bornees a chaque ligne
+ALLOCINE_AWARDS_MARKER_RE = re.compile(r'<div class="(?:(?P<block>awards mdl)|(?P<row>table-award-row))">')
+ALLOCINE_AWARDS_TITLE_RE = re.compile(r"card-awards-link[^>]*>(.*?)</span>", re.IGNORECASE | re.DOTALL)
+ALLOCINE_AWARDS_STATUS_RE = re.compile(r'class="awards-[^"]+"[^>]*>([^<]+)', re.IGNORECASE | re.DOTALL)
+ALLOCINE_AWARDS_ITEM_RE = re.compile(r'<div class="item">(.*?)</div>', re.IGNORECASE | re.DOTALL)
+AWARD_EDITION_NUMBER_PAREN_RE = re.compile(r"\(\s*(?:edition|édition)\s*\d+\s*\)", re.IGNORECASE)
+AWARD_EDITION_PAREN_RE = re.compile(r"\(\s*(?:edition|édition)\s*\)", re.IGNORECASE)
+AWARD_EDITION_NUMBER_RE = re.compile(r"\b(?:edition|édition)\s*\d+\b", re.IGNORECASE)
+EMPTY_PARENS_RE = re.compile(r"\(\s*\)")
+# Photos
+ALLOCINE_PHOTO_SIZE_RE = re.compile(r"/[cr]_\d+_\d+")
+ALLOCINE_PHOTO_SECTION_RE = re.compile(
+    r'<section[^>]*class="[^"]*section-movie-photo[^"]*"[^>]*>.*?</section>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_TITLEBAR_RE = re.compile(r'<h2[^>]*class="[^"]*titlebar[^"]*"[^>]*>(.*?)</h2>', re.IGNORECASE | re.DOTALL)
+ALLOCINE_SHOT_IMG_RE = re.compile(r'<img[^>]*class="[^"]*shot-img[^"]*"[^>]*>', re.IGNORECASE)
+IMG_DATA_SRC_RE = re.compile(r'data-src="([^"]+)"', re.IGNORECASE)
+IMG_SRC_RE = re.compile(r'src="([^"]+)"', re.IGNORECASE)
+# Recherche Allocine
+ALLOCINE_MOVIES_SECTION_RE = re.compile(
+    r'<section[^>]*class="[^"]*movies-results[^"]*"[^>]*>(.*?)</section>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_RESULT_ITEM_RE = re.compile(r'<li[^>]*class="[^"]*mdl[^"]*"[^>]*>(.*?)</li>', re.IGNORECASE | re.DOTALL)
+ALLOCINE_RESULT_TITLE_RE = re.compile(
+    r'<span[^>]*class="([^"]*meta-title-link[^"]*)"[^>]*>(.*?)</span>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_DIRECTION_RE = re.compile(
+    r'<div[^>]*class="[^"]*meta-body-direction[^"]*"[^>]*>(.*?)</div>',
+    re.IGNORECASE | re.DOTALL,
+)
+ALLOCINE_OBFUSCATED_TOKEN_RE = re.compile(r"ACr[0-9A-Za-z+/=]+")
+# Lecteur video Allocine
+PLAYER_CONTENT_URL_RE = re.compile(r'"contentUrl"\s*:\s*"([^"]+)"', re.IGNORECASE)
+PLAYER_MP4_RE = re.compile(r'https?://[^\s"\']+\.mp4(?:\?[^\s"\']*)?', re.IGNORECASE)
+PLAYER_EMBED_URL_RE = re.compile(r'"embedUrl"\s*:\s*"([^"]+)"', re.IGNORECASE)
+# YouTube / Google
+YOUTUBE_WATCH_ID_RE = re.compile(r"watch\?v=([A-Za-z0-9_-]{11})")
+YOUTUBE_INITIAL_DATA_MARKERS = ("var ytInitialData =", 'window["ytInitialData"] =', "ytInitialData =")
+YOUTUBE_VIDEO_RENDERER_RE = re.compile(r'"videoRenderer"\s*:\s*\{')
+YOUTUBE_JSON_DECODER = json.JSONDecoder()
+ALLOCINE_FILM_URL_RE = re.compile(r"https?://www\.allocine\.fr/film/[^\s\"<>]+")
+ALLOCINE_FICHE_URL_RE = re.compile(
+    r"https?://www\.allocine\.fr/film/(?:fichefilm_gen_cfilm=\d+|fichefilm-\d+)[^\"'<>\s]*",
+    re.IGNORECASE,
+)
+TRACKING_PARAM_RE = re.compile(r"[?&](?:utm_[^=&]+|cmpid)=[^&]+")
+
 COUNTRY_NAME_FR_OVERRIDES = {
     "united states": "Etats-Unis",
     "united states of america": "Etats-Unis",
@@ -191,27 +356,32 @@ COUNTRY_NAME_FR_OVERRIDES = {
 }
 
 
-def normalize_for_match(text: str) -> str:
+@functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _normalize_for_match_cached(text: str) -> str:
     text = _normalize_text(text)
     text = text.replace("-", " ")
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
+    text = NON_ALNUM_RE.sub(" ", text)
+    return WHITESPACE_RE.sub(" ", text).strip()
+
+
+def normalize_for_match(text: str) -> str:
+    return _normalize_for_match_cached(str(text or ""))
 
 
 def _strip_tags(value: str) -> str:
-    return re.sub(r"<[^>]+>", " ", value or "")
+    return HTML_TAG_RE.sub(" ", value or "")
 
 
 def _clean_html_text(value: str) -> str:
     text = html.unescape(_strip_tags(value))
-    return re.sub(r"\s+", " ", text).strip()
+    return WHITESPACE_RE.sub(" ", text).strip()
 
 
 def _normalize_country_name_fr(value: str) -> str:
     text = _clean_html_text(value)
     if not text:
         return ""
-    text = re.sub(r"\s+", " ", text).strip(" ,;-")
+    text = WHITESPACE_RE.sub(" ", text).strip(" ,;-")
     key = normalize_for_match(text)
     return COUNTRY_NAME_FR_OVERRIDES.get(key, text)
 
@@ -222,7 +392,7 @@ def _normalize_country_names(values: list[str]) -> list[str]:
     for value in values:
         if not value:
             continue
-        for part in re.split(r"\s*,\s*", str(value)):
+        for part in COMMA_SPLIT_RE.split(str(value)):
             cleaned = _normalize_country_name_fr(part)
             if not cleaned:
                 continue
@@ -241,22 +411,14 @@ def _allocine_retry_delay(response: requests.Response, attempt: int) -> float:
     return min(delay, ALLOCINE_RETRY_MAX_DELAY)
 
 
-def _allocine_wait_rate_limit_slot() -> None:
-    global _ALLOCINE_LAST_REQUEST_TS
-    with _ALLOCINE_REQUEST_LOCK:
-        now = time.monotonic()
-        elapsed = now - _ALLOCINE_LAST_REQUEST_TS
-        wait = ALLOCINE_MIN_REQUEST_INTERVAL - elapsed
-        if wait > 0:
-            time.sleep(wait)
-        _ALLOCINE_LAST_REQUEST_TS = time.monotonic()
-
-
 def allocine_get(url: str) -> requests.Response:
+    cached = HTTP_CACHE.lookup(url)
+    if cached is not None:
+        return cached
     last_error = None
     for attempt in range(ALLOCINE_MAX_RETRIES + 1):
         try:
-            _allocine_wait_rate_limit_slot()
+            ALLOCINE_RATE_LIMITER.acquire()
             response = ALLOCINE_SESSION.get(url, timeout=ALLOCINE_TIMEOUT)
         except requests.RequestException as exc:
             last_error = exc
@@ -267,12 +429,17 @@ def allocine_get(url: str) -> requests.Response:
             continue
 
         if response.status_code in ALLOCINE_RETRY_STATUS:
+            # Ralentissement global: le limiteur baisse le debit et met tous
+            # les threads Allocine en pause (Retry-After si fourni).
+            ALLOCINE_RATE_LIMITER.throttle(_allocine_retry_delay(response, attempt))
+            log_step(f"allocine: {response.status_code} -> debit {ALLOCINE_RATE_LIMITER.rate_line()}")
             if attempt >= ALLOCINE_MAX_RETRIES:
                 response.raise_for_status()
-            time.sleep(_allocine_retry_delay(response, attempt))
             continue
 
+        ALLOCINE_RATE_LIMITER.success()
         response.raise_for_status()
+        HTTP_CACHE.store(url, response)
         return response
 
     if last_error:
@@ -288,17 +455,17 @@ def _extract_jp_age_from_text(value: str) -> Optional[int]:
     return int(match.group(1))
 
 
-def _extract_jp_age_from_allocine_html(html_text: str) -> Optional[int]:
-    for label_html in JP_AGE_LABEL_RE.findall(html_text or ""):
+def _extract_jp_age_from_allocine_html(fiche: "AllocineFiche") -> Optional[int]:
+    for label_html in fiche.kids_labels:
         age = _extract_jp_age_from_text(label_html)
         if age is not None:
             return age
-    return _extract_jp_age_from_text(html_text or "")
+    return _extract_jp_age_from_text(fiche.html)
 
 
 def _is_jeune_public_category(categorie: str) -> bool:
     cleaned = normalize_for_match(categorie)
-    return "jeune public" in cleaned or bool(re.search(r"\bjp\b", cleaned))
+    return "jeune public" in cleaned or bool(JP_TOKEN_RE.search(cleaned))
 
 
 def _merge_comment_with_jp_age(commentaire: str, age: int) -> str:
@@ -339,99 +506,47 @@ def _image_key(url: str) -> str:
     return base.rsplit("/", 1)[-1].lower()
 
 
-def _allocine_extract_og_image(html_text: str) -> str:
-    match = re.search(
-        r'<meta[^>]+property="og:image"[^>]+content="([^"]+)"',
-        html_text,
-        flags=re.IGNORECASE,
-    )
-    if not match:
-        match = re.search(
-            r'<meta[^>]+name="twitter:image"[^>]+content="([^"]+)"',
-            html_text,
-            flags=re.IGNORECASE,
-        )
-    return match.group(1) if match else ""
+def _allocine_extract_og_image(fiche: "AllocineFiche") -> str:
+    return fiche.meta_content("property", "og:image") or fiche.meta_content("name", "twitter:image")
 
 
-def _allocine_extract_affiche_thumbnail(html_text: str) -> str:
-    card = re.search(
-        r'<div[^>]*class="[^"]*entity-card-player-ovw[^"]*"[^>]*>.*?</div>\s*</div>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    if not card:
+def _allocine_extract_affiche_thumbnail(fiche: "AllocineFiche") -> str:
+    if not fiche.card:
         return ""
-    match = re.search(
-        r'<img[^>]*class="[^"]*thumbnail-img[^"]*"[^>]*(?:src|data-src)="([^"]+)"',
-        card.group(0),
-        flags=re.IGNORECASE,
-    )
+    match = ALLOCINE_THUMBNAIL_RE.search(fiche.card)
     return match.group(1) if match else ""
 
 
-def _allocine_parse_release_date(html_text: str) -> str:
-    card = re.search(
-        r'<div[^>]*class="[^"]*entity-card-player-ovw[^"]*"[^>]*>.*?</div>\s*</div>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    if not card:
+def _allocine_parse_release_date(fiche: "AllocineFiche") -> str:
+    if not fiche.card:
         return ""
-    match = re.search(
-        r'<span[^>]*class="[^"]*date[^"]*"[^>]*>(.*?)</span>',
-        card.group(0),
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    match = ALLOCINE_CARD_DATE_RE.search(fiche.card)
     if not match:
         return ""
     raw = _clean_html_text(match.group(1))
     return _parse_french_date(raw)
 
 
-def _allocine_parse_countries(html_text: str) -> str:
-    section_match = re.search(
-        r'<section[^>]*class="[^"]*ovw-technical[^"]*"[^>]*>(.*?)</section>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    search_area = section_match.group(1) if section_match else html_text
+def _allocine_parse_countries(fiche: "AllocineFiche") -> str:
+    search_area = fiche.technical_section if fiche.technical_section is not None else fiche.html
 
-    item_match = re.search(
-        r'<div[^>]*class="[^"]*item[^"]*"[^>]*>\s*'
-        r'<span[^>]*class="[^"]*what[^"]*"[^>]*>\s*Nationalit[^<]*</span>(.*?)</div>',
-        search_area,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    item_match = ALLOCINE_NATIONALITY_ITEM_RE.search(search_area)
     if not item_match:
         return ""
 
     block = item_match.group(1)
-    names = re.findall(
-        r'<span[^>]*class="[^"]*nationality[^"]*"[^>]*>(.*?)</span>',
-        block,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    names = ALLOCINE_NATIONALITY_SPAN_RE.findall(block)
     if not names:
-        names = re.findall(
-            r'<span[^>]*class="[^"]*that[^"]*"[^>]*>(.*?)</span>',
-            block,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        names = ALLOCINE_THAT_SPAN_RE.findall(block)
     if not names:
-        names = re.findall(r"<span[^>]*>(.*?)</span>", block, flags=re.IGNORECASE | re.DOTALL)
+        names = HTML_SPAN_RE.findall(block)
 
     normalized = _normalize_country_names([_clean_html_text(n) for n in names if _clean_html_text(n)])
     return ", ".join(normalized)
 
 
-def _allocine_parse_json_ld(html_text: str) -> dict:
-    scripts = re.findall(
-        r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    for raw in scripts:
+def _allocine_parse_json_ld(fiche: "AllocineFiche") -> dict:
+    for raw in fiche.json_ld:
         try:
             data = json.loads(raw)
         except Exception:
@@ -445,77 +560,74 @@ def _allocine_parse_json_ld(html_text: str) -> dict:
     return {}
 
 
-def allocine_awards(allocine_url: str) -> list[str]:
-    film_id = extract_allocine_film_id(allocine_url)
-    if not film_id:
-        return []
-    awards_url = f"{ALLOCINE_BASE_URL}/film/fichefilm-{film_id}/palmares/"
-    resp = allocine_get(awards_url)
-    if resp.status_code != 200:
-        return []
-    html_text = resp.text
-    starts = [m.start() for m in re.finditer(r'<div class="awards mdl">', html_text)]
+def _award_is_nomination(text: str) -> bool:
+    norm = normalize_for_match(text)
+    return "nomme" in norm or "nomination" in norm or "nominee" in norm
+
+
+def _award_is_prize(text: str) -> bool:
+    norm = normalize_for_match(text)
+    return "prix" in norm or "palme" in norm or "laureat" in norm or "gagnant" in norm
+
+
+def _award_strip_edition(text: str) -> str:
+    cleaned = AWARD_EDITION_NUMBER_PAREN_RE.sub("", text)
+    cleaned = AWARD_EDITION_PAREN_RE.sub("", cleaned)
+    cleaned = AWARD_EDITION_NUMBER_RE.sub("", cleaned)
+    cleaned = EMPTY_PARENS_RE.sub("", cleaned)
+    return MULTI_SPACE_RE.sub(" ", cleaned).strip()
+
+
+def _allocine_parse_awards(html_text: str) -> list[str]:
+    """
+    Page palmares -> ["Festival: categorie, ...", ...] (prix seulement).
+    Un seul balayage des reperes de blocs et de lignes, puis des recherches
+    bornees (pos, endpos) a chaque ligne: lineaire en taille de page, sans
+    recopier les blocs.
+    """
     blocks = []
-    for i, start in enumerate(starts):
-        end = starts[i + 1] if i + 1 < len(starts) else len(html_text)
-        blocks.append(html_text[start:end])
-    results = []
+    for marker in ALLOCINE_AWARDS_MARKER_RE.finditer(html_text):
+        if marker.group("block"):
+            if blocks:
+                blocks[-1][1] = marker.start()
+            blocks.append([marker.start(), len(html_text), []])
+        elif blocks:
+            blocks[-1][2].append(marker.start())
 
-    def is_nomination(text: str) -> bool:
-        norm = normalize_for_match(text)
-        return "nomme" in norm or "nomination" in norm or "nominee" in norm
-
-    def is_prize_status(text: str) -> bool:
-        norm = normalize_for_match(text)
-        return "prix" in norm or "palme" in norm or "laureat" in norm or "gagnant" in norm
-
-    def strip_edition(text: str) -> str:
-        cleaned = re.sub(r"\(\s*(?:edition|édition)\s*\d+\s*\)", "", text, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\(\s*(?:edition|édition)\s*\)", "", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\b(?:edition|édition)\s*\d+\b", "", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\(\s*\)", "", cleaned)
-        cleaned = re.sub(r"\s{2,}", " ", cleaned).strip()
-        return cleaned
-
-    for block in blocks:
-        title_match = re.search(
-            r'card-awards-link[^>]*>(.*?)</span>',
-            block,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+    results = []
+    for start, end, row_starts in blocks:
+        title_match = ALLOCINE_AWARDS_TITLE_RE.search(html_text, start, end)
         title_text = _clean_html_text(title_match.group(1)) if title_match else ""
-        title_text = strip_edition(title_text)
-        row_starts = [m.start() for m in re.finditer(r'<div class="table-award-row">', block)]
+        title_text = _award_strip_edition(title_text)
         categories = []
-        for i, start in enumerate(row_starts):
-            end = row_starts[i + 1] if i + 1 < len(row_starts) else len(block)
-            row = block[start:end]
-            status_match = re.search(
-                r'class="awards-[^"]+"[^>]*>([^<]+)',
-                row,
-                flags=re.IGNORECASE | re.DOTALL,
-            )
+        for i, row_start in enumerate(row_starts):
+            row_end = row_starts[i + 1] if i + 1 < len(row_starts) else end
+            status_match = ALLOCINE_AWARDS_STATUS_RE.search(html_text, row_start, row_end)
             status_text = _clean_html_text(status_match.group(1)) if status_match else ""
-            if status_text and is_nomination(status_text):
-                continue
-            if not status_text or not is_prize_status(status_text):
+            if not status_text or _award_is_nomination(status_text) or not _award_is_prize(status_text):
                 continue
-            row_categories = re.findall(
-                r'<div class="item">(.*?)</div>',
-                row,
-                flags=re.IGNORECASE | re.DOTALL,
-            )
-            row_categories = [_clean_html_text(c) for c in row_categories]
-            row_categories = [c for c in row_categories if c]
-            if row_categories:
-                cat = row_categories[0]
-                if cat not in categories:
-                    categories.append(cat)
+            for item in ALLOCINE_AWARDS_ITEM_RE.finditer(html_text, row_start, row_end):
+                cat = _clean_html_text(item.group(1))
+                if cat:
+                    if cat not in categories:
+                        categories.append(cat)
+                    break
         if title_text and categories:
             results.append(f"{title_text}: {', '.join(categories)}")
     return results
 
 
+def allocine_awards(allocine_url: str) -> list[str]:
+    film_id = extract_allocine_film_id(allocine_url)
+    if not film_id:
+        return []
+    awards_url = f"{ALLOCINE_BASE_URL}/film/fichefilm-{film_id}/palmares/"
+    resp = allocine_get(awards_url)
+    if resp.status_code != 200:
+        return []
+    return _allocine_parse_awards(resp.text)
+
+
 def _clean_image_url(value: str) -> str:
     if not value:
         return ""
@@ -539,14 +651,14 @@ def _clean_image_url(value: str) -> str:
             return _clean_image_url(payload.get("url") or payload.get("@id") or "")
     if text.startswith("http://") or text.startswith("https://"):
         return text
-    match = re.search(r"https?://[^\s\"']+", text)
+    match = FIRST_URL_RE.search(text)
     return match.group(0) if match else ""
 
 
 def _parse_iso_duration_minutes(value: str) -> int:
     if not value:
         return 0
-    match = re.match(r"^PT(?:(\d+)H)?(?:(\d+)M)?", value)
+    match = ISO_DURATION_RE.match(value)
     if not match:
         return 0
     hours = int(match.group(1) or 0)
@@ -568,11 +680,11 @@ def _parse_french_date(value: str) -> str:
     text = normalize_for_match(value)
     if not text:
         return ""
-    match = re.search(r"(\d{1,2})/(\d{1,2})/(\d{4})", text)
+    match = NUMERIC_DATE_RE.search(text)
     if match:
         day, month, year = match.groups()
         return f"{year}-{int(month):02d}-{int(day):02d}"
-    match = re.search(r"(\d{1,2})\s+([a-z]+)\s+(\d{4})", text)
+    match = FRENCH_TEXT_DATE_RE.search(text)
     if not match:
         return ""
     day, month_name, year = match.groups()
@@ -631,23 +743,15 @@ def _allocine_fullsize_photo_url(url: str) -> str:
     cleaned = _clean_image_url(url)
     if cleaned.startswith("//"):
         cleaned = f"https:{cleaned}"
-    cleaned = re.sub(r"/[cr]_\d+_\d+", "", cleaned)
+    cleaned = ALLOCINE_PHOTO_SIZE_RE.sub("", cleaned)
     return cleaned
 
 
 def _allocine_extract_shot_urls(html_text: str) -> list[str]:
-    sections = re.findall(
-        r'<section[^>]*class="[^"]*section-movie-photo[^"]*"[^>]*>.*?</section>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    sections = ALLOCINE_PHOTO_SECTION_RE.findall(html_text)
     content_blocks = []
     for section in sections:
-        title_match = re.search(
-            r'<h2[^>]*class="[^"]*titlebar[^"]*"[^>]*>(.*?)</h2>',
-            section,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        title_match = ALLOCINE_TITLEBAR_RE.search(section)
         title_text = _clean_html_text(title_match.group(1)) if title_match else ""
         title_norm = normalize_for_match(title_text)
         if not title_norm:
@@ -660,16 +764,12 @@ def _allocine_extract_shot_urls(html_text: str) -> list[str]:
             continue
         content_blocks.append(section)
     content = "\n".join(content_blocks) if content_blocks else ""
-    tags = re.findall(
-        r'<img[^>]*class="[^"]*shot-img[^"]*"[^>]*>',
-        content,
-        flags=re.IGNORECASE,
-    )
+    tags = ALLOCINE_SHOT_IMG_RE.findall(content)
     urls = []
     for tag in tags:
-        match = re.search(r'data-src="([^"]+)"', tag, flags=re.IGNORECASE)
+        match = IMG_DATA_SRC_RE.search(tag)
         if not match:
-            match = re.search(r'src="([^"]+)"', tag, flags=re.IGNORECASE)
+            match = IMG_SRC_RE.search(tag)
         if match:
             url = match.group(1)
             if url and "acsta.net" in url:
@@ -678,20 +778,19 @@ def _allocine_extract_shot_urls(html_text: str) -> list[str]:
 
 
 def extract_allocine_film_id(allocine_url: str) -> str:
-    match = re.search(r"cfilm=(\d+)", allocine_url or "")
+    match = ALLOCINE_CFILM_ID_RE.search(allocine_url or "")
     if match:
         return match.group(1)
-    match = re.search(r"fichefilm-(\d+)", allocine_url or "")
+    match = ALLOCINE_FICHEFILM_ID_RE.search(allocine_url or "")
     return match.group(1) if match else ""
 
 
 def allocine_affiche_url(allocine_url: str) -> str:
     if not allocine_url:
         return ""
-    resp = allocine_get(allocine_url)
-    html_text = resp.text
-    thumb_url = _allocine_extract_affiche_thumbnail(html_text)
-    og_url = _allocine_extract_og_image(html_text)
+    fiche = allocine_fiche(allocine_url)
+    thumb_url = _allocine_extract_affiche_thumbnail(fiche)
+    og_url = _allocine_extract_og_image(fiche)
     if thumb_url and og_url:
         if _image_key(thumb_url) == _image_key(og_url):
             return _clean_image_url(thumb_url)
@@ -699,15 +798,98 @@ def allocine_affiche_url(allocine_url: str) -> str:
     return _clean_image_url(thumb_url or og_url or "")
 
 
+class AllocineFiche:
+    """
+    Fiche film Allocine decoupee en une seule passe (ALLOCINE_FICHE_SCAN_RE):
+    balises meta, JSON-LD, carte principale, sections synopsis / technique /
+    acteurs, etiquettes d'age et liens de bande-annonce. Les extracteurs
+    travaillent ensuite sur ces blocs au lieu de rebalayer toute la page.
+    """
+
+    def __init__(self, url: str, html_text: str):
+        self.url = url
+        self.film_id = extract_allocine_film_id(url)
+        self.html = html_text or ""
+        self.meta: dict[tuple[str, str], str] = {}
+        self.json_ld: list[str] = []
+        self.card = ""
+        self.synopsis_section: Optional[str] = None
+        self.technical_section: Optional[str] = None
+        self.actors_block: Optional[str] = None
+        self.kids_labels: list[str] = []
+        self._trailer_links: list[tuple[int, str]] = []
+
+        self._scan(0, len(self.html))
+
+    def _scan(self, start: int, end: int) -> None:
+        for match in ALLOCINE_FICHE_SCAN_RE.finditer(self.html, start, end):
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "trailer":
+                self._add_trailer_link(value)
+                continue
+            if kind == "kids":
+                self.kids_labels.append(value)
+            elif kind == "meta":
+                attrs = {k.lower(): v for k, v in ALLOCINE_META_ATTR_RE.findall(value)}
+                content = attrs.get("content")
+                if content is not None:
+                    for attr in ("property", "name"):
+                        if attrs.get(attr):
+                            self.meta.setdefault((attr, attrs[attr].lower()), content)
+            elif kind == "ld":
+                self.json_ld.append(value)
+            elif kind == "card" and not self.card:
+                self.card = value
+            elif kind == "synopsis" and self.synopsis_section is None:
+                self.synopsis_section = value
+            elif kind == "technical" and self.technical_section is None:
+                self.technical_section = value
+            elif kind == "actors" and self.actors_block is None:
+                self.actors_block = value
+            # Un bloc consomme par le balayage (carte, section, script...) peut
+            # contenir d'autres elements utiles (bloc acteurs dans la carte,
+            # liens de bande-annonce, etiquettes d'age): on rebalaie le bloc
+            # apres son premier caractere, dans l'ordre du document.
+            self._scan(match.start() + 1, match.end())
+
+    def _add_trailer_link(self, raw: str) -> None:
+        url = html.unescape(raw)
+        if url.startswith("/"):
+            url = f"{ALLOCINE_BASE_URL}{url}"
+        if ALLOCINE_TRAILER_CFILM_RE.search(url) is None:
+            rank = 2
+        else:
+            rank = 0 if raw.lower().startswith("http") else 1
+        self._trailer_links.append((rank, url))
+
+    def meta_content(self, attr: str, key: str) -> str:
+        return self.meta.get((attr.lower(), key.lower()), "")
+
+    def trailer_links(self) -> list[str]:
+        """Liens absolus: d'abord ceux avec cfilm (absolus puis relatifs), puis les autres."""
+        links = []
+        for _, url in sorted(self._trailer_links, key=lambda item: item[0]):
+            if url not in links:
+                links.append(url)
+        return links
+
+
+def allocine_fiche(allocine_url: str) -> AllocineFiche:
+    """Fiche analysee une seule fois par URL et partagee (meta, affiche, prochainement)."""
+    return ALLOCINE_FICHE_MEMO.get(
+        allocine_url,
+        lambda: AllocineFiche(allocine_url, allocine_get(allocine_url).text),
+    )
+
+
 def allocine_movie_meta(allocine_url: str) -> dict:
     if not allocine_url:
         return {}
-    film_id = extract_allocine_film_id(allocine_url)
-    resp = allocine_get(allocine_url)
-    html_text = resp.text
+    fiche = allocine_fiche(allocine_url)
 
-    data = _allocine_parse_json_ld(html_text)
-    title = _clean_html_text(data.get("name") or _allocine_extract_og_title(html_text) or "")
+    data = _allocine_parse_json_ld(fiche)
+    title = _clean_html_text(data.get("name") or _allocine_extract_og_title(fiche) or "")
     alt_title = _clean_html_text(data.get("alternateName") or "")
     directors_raw = data.get("director") or []
     directors = []
@@ -728,7 +910,7 @@ def allocine_movie_meta(allocine_url: str) -> dict:
 
     synopsis = _clean_html_text(data.get("description") or "")
     if not synopsis:
-        synopsis = _allocine_parse_synopsis(html_text)
+        synopsis = _allocine_parse_synopsis(fiche)
     genres_raw = data.get("genre") or []
     if isinstance(genres_raw, str):
         genres = [genres_raw]
@@ -749,10 +931,10 @@ def allocine_movie_meta(allocine_url: str) -> dict:
                 actors.append(item)
     actors = [a for a in actors if a][:8]
     if not actors:
-        actors = _allocine_parse_main_actors(html_text)
+        actors = _allocine_parse_main_actors(fiche)
 
-    thumb_url = _allocine_extract_affiche_thumbnail(html_text)
-    og_url = _allocine_extract_og_image(html_text)
+    thumb_url = _allocine_extract_affiche_thumbnail(fiche)
+    og_url = _allocine_extract_og_image(fiche)
     if thumb_url and og_url:
         if _image_key(thumb_url) == _image_key(og_url):
             affiche = _clean_image_url(thumb_url)
@@ -761,14 +943,14 @@ def allocine_movie_meta(allocine_url: str) -> dict:
     else:
         affiche = _clean_image_url(thumb_url or og_url or "")
 
-    release_date = _allocine_parse_release_date(html_text)
-    countries = _allocine_parse_countries(html_text)
+    release_date = _allocine_parse_release_date(fiche)
+    countries = _allocine_parse_countries(fiche)
     try:
         awards = allocine_awards(allocine_url)
     except Exception:
         awards = []
-    age_min = _extract_jp_age_from_allocine_html(html_text)
-    trailer_url = _allocine_extract_trailer_url(html_text, film_id)
+    age_min = _extract_jp_age_from_allocine_html(fiche)
+    trailer_url = _allocine_extract_trailer_url(fiche)
     return {
         "affiche": affiche,
         "allocine_title": title or alt_title,
@@ -824,76 +1006,48 @@ def _allocine_fetch_search(title: str) -> str:
 
 
 def _allocine_movies_section(html_text: str) -> str:
-    match = re.search(
-        r'<section[^>]*class="[^"]*movies-results[^"]*"[^>]*>(.*?)</section>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    match = ALLOCINE_MOVIES_SECTION_RE.search(html_text)
     return match.group(1) if match else ""
 
 
-def _allocine_extract_meta_content(html_text: str, attr: str, key: str) -> str:
-    pattern = rf'<meta[^>]+{attr}="{re.escape(key)}"[^>]+content="([^"]*)"'
-    match = re.search(pattern, html_text or "", flags=re.IGNORECASE)
-    return _clean_html_text(match.group(1)) if match else ""
+def _allocine_extract_meta_content(fiche: "AllocineFiche", attr: str, key: str) -> str:
+    return _clean_html_text(fiche.meta_content(attr, key))
 
 
-def _allocine_extract_og_title(html_text: str) -> str:
+def _allocine_extract_og_title(fiche: "AllocineFiche") -> str:
     return (
-        _allocine_extract_meta_content(html_text, "property", "og:title")
-        or _allocine_extract_meta_content(html_text, "name", "twitter:title")
+        _allocine_extract_meta_content(fiche, "property", "og:title")
+        or _allocine_extract_meta_content(fiche, "name", "twitter:title")
     )
 
 
-def _allocine_extract_og_description(html_text: str) -> str:
+def _allocine_extract_og_description(fiche: "AllocineFiche") -> str:
     return (
-        _allocine_extract_meta_content(html_text, "property", "og:description")
-        or _allocine_extract_meta_content(html_text, "name", "description")
-        or _allocine_extract_meta_content(html_text, "name", "twitter:description")
+        _allocine_extract_meta_content(fiche, "property", "og:description")
+        or _allocine_extract_meta_content(fiche, "name", "description")
+        or _allocine_extract_meta_content(fiche, "name", "twitter:description")
     )
 
 
-def _allocine_parse_synopsis(html_text: str) -> str:
-    section = re.search(
-        r'<section[^>]*class="[^"]*ovw-synopsis[^"]*"[^>]*>(.*?)</section>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    if section:
-        block = section.group(1)
-        paragraphs = re.findall(
-            r'<p[^>]*class="[^"]*bo-p[^"]*"[^>]*>(.*?)</p>',
-            block,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+def _allocine_parse_synopsis(fiche: "AllocineFiche") -> str:
+    if fiche.synopsis_section is not None:
+        block = fiche.synopsis_section
+        paragraphs = ALLOCINE_SYNOPSIS_P_RE.findall(block)
         texts = [_clean_html_text(p) for p in paragraphs if _clean_html_text(p)]
         if texts:
             return " ".join(texts)
-        content = re.search(
-            r'<div[^>]*class="[^"]*content-txt[^"]*"[^>]*>(.*?)</div>',
-            block,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        content = ALLOCINE_CONTENT_TXT_RE.search(block)
         if content:
             parsed = _clean_html_text(content.group(1))
             if parsed:
                 return parsed
-    return _allocine_extract_og_description(html_text)
+    return _allocine_extract_og_description(fiche)
 
 
-def _allocine_parse_main_actors(html_text: str) -> list[str]:
-    block = re.search(
-        r'<div[^>]*class="[^"]*meta-body-actor[^"]*"[^>]*>(.*?)</div>',
-        html_text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    if not block:
+def _allocine_parse_main_actors(fiche: "AllocineFiche") -> list[str]:
+    if fiche.actors_block is None:
         return []
-    names = re.findall(
-        r'<span[^>]*class="[^"]*dark-grey-link[^"]*"[^>]*>(.*?)</span>',
-        block.group(1),
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    names = ALLOCINE_DARK_GREY_LINK_RE.findall(fiche.actors_block)
     cleaned = [_clean_html_text(name) for name in names if _clean_html_text(name)]
     dedup = []
     seen = set()
@@ -905,20 +1059,9 @@ def _allocine_parse_main_actors(html_text: str) -> list[str]:
     return dedup[:8]
 
 
-def _allocine_extract_trailer_url(html_text: str, film_id: str = "") -> str:
-    patterns = [
-        r'https?://www\.allocine\.fr/video/player_gen_cmedia=\d+(?:&amp;|&)cfilm=\d+\.html',
-        r"/video/player_gen_cmedia=\d+(?:&amp;|&)cfilm=\d+\.html",
-        r"/video/player_gen_cmedia=\d+\.html",
-    ]
-    candidates = []
-    for pattern in patterns:
-        for match in re.finditer(pattern, html_text or "", flags=re.IGNORECASE):
-            url = html.unescape(match.group(0))
-            if url.startswith("/"):
-                url = f"{ALLOCINE_BASE_URL}{url}"
-            if url not in candidates:
-                candidates.append(url)
+def _allocine_extract_trailer_url(fiche: "AllocineFiche") -> str:
+    film_id = fiche.film_id
+    candidates = fiche.trailer_links()
     if not candidates:
         return ""
 
@@ -929,11 +1072,11 @@ def _allocine_extract_trailer_url(html_text: str, film_id: str = "") -> str:
                 return url
         no_cfilm_candidates = [
             url for url in candidates
-            if not re.search(r"(?:[?&]|&amp;)cfilm=\d+\.html", url, re.IGNORECASE)
+            if not ALLOCINE_TRAILER_CFILM_RE.search(url)
         ]
         if no_cfilm_candidates:
             return no_cfilm_candidates[0]
-        has_foreign_cfilm = any(re.search(r"(?:[?&]|&amp;)cfilm=\d+\.html", url, re.IGNORECASE) for url in candidates)
+        has_foreign_cfilm = any(ALLOCINE_TRAILER_CFILM_RE.search(url) for url in candidates)
         if has_foreign_cfilm:
             return ""
 
@@ -959,19 +1102,28 @@ def _resolve_allocine_player_trailer_url(url: str) -> str:
     trailer_url = str(url or "").strip()
     if not trailer_url or not _is_allocine_player_trailer_url(trailer_url):
         return trailer_url
+    cache_name = f"allocine-player:{trailer_url}"
+    saved = HTTP_CACHE.get_json(cache_name)
+    if isinstance(saved, dict):
+        return saved.get("video_url") or trailer_url
     try:
         resp = allocine_get(trailer_url)
     except Exception:
         return trailer_url
-    html_text = resp.text or ""
+    video_url = _allocine_player_video_url(resp.text or "")
+    HTTP_CACHE.put_json(cache_name, {"video_url": video_url}, ALLOCINE_PLAYER_RESOLVED_TTL)
+    return video_url or trailer_url
+
 
+def _allocine_player_video_url(html_text: str) -> str:
+    """Page du lecteur Allocine -> MP4 direct, sinon lecteur embarque, sinon ""."""
     mp4_urls = []
-    for raw in re.findall(r'"contentUrl"\s*:\s*"([^"]+)"', html_text, flags=re.IGNORECASE):
+    for raw in PLAYER_CONTENT_URL_RE.findall(html_text):
         parsed = _decode_js_url(raw)
         if TRAILER_DIRECT_VIDEO_RE.search(parsed):
             mp4_urls.append(parsed)
     if not mp4_urls:
-        for raw in re.findall(r'https?://[^\s"\']+\.mp4(?:\?[^\s"\']*)?', html_text, flags=re.IGNORECASE):
+        for raw in PLAYER_MP4_RE.findall(html_text):
             parsed = _decode_js_url(raw)
             if TRAILER_DIRECT_VIDEO_RE.search(parsed):
                 mp4_urls.append(parsed)
@@ -982,25 +1134,25 @@ def _resolve_allocine_player_trailer_url(url: str) -> str:
         return mp4_urls[0]
 
     embed_urls = []
-    for raw in re.findall(r'"embedUrl"\s*:\s*"([^"]+)"', html_text, flags=re.IGNORECASE):
+    for raw in PLAYER_EMBED_URL_RE.findall(html_text):
         parsed = _decode_js_url(raw)
         if TRAILER_ALLOCINE_EMBED_RE.search(parsed):
             embed_urls.append(parsed)
     if not embed_urls:
-        for raw in re.findall(r"https?://player\.allocine\.fr/\d+\.html", html_text, flags=re.IGNORECASE):
+        for raw in TRAILER_ALLOCINE_EMBED_RE.findall(html_text):
             parsed = _decode_js_url(raw)
             if TRAILER_ALLOCINE_EMBED_RE.search(parsed):
                 embed_urls.append(parsed)
     if embed_urls:
         return embed_urls[0]
-    return trailer_url
+    return ""
 
 
 def _is_probable_person_name(value: str) -> bool:
     norm = normalize_for_match(value)
     if not norm:
         return False
-    if len(norm) > 64 or re.search(r"\d", norm):
+    if len(norm) > 64 or DIGIT_RE.search(norm):
         return False
     tokens = [token for token in norm.split() if token]
     if not tokens or len(tokens) > 6:
@@ -1029,25 +1181,17 @@ def _is_probable_person_name(value: str) -> bool:
 
 
 def _allocine_parse_directors(item_html: str) -> str:
-    block = re.search(
-        r'<div[^>]*class="[^"]*meta-body-direction[^"]*"[^>]*>(.*?)</div>',
-        item_html,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    block = ALLOCINE_DIRECTION_RE.search(item_html)
     if block:
-        names = re.findall(
-            r'<span[^>]*class="[^"]*dark-grey-link[^"]*"[^>]*>(.*?)</span>',
-            block.group(1),
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        names = ALLOCINE_DARK_GREY_LINK_RE.findall(block.group(1))
         cleaned = [_clean_html_text(n) for n in names if _clean_html_text(n)]
         if cleaned:
             return ", ".join(cleaned)
     text = _clean_html_text(item_html)
-    match = re.search(r"(?:Un film de|De)\s+([^|]+?)(?:\bAvec\b|$)", text, flags=re.IGNORECASE)
+    match = DIRECTOR_PREFIX_RE.search(text)
     if match:
-        raw = re.sub(r"\s{2,}", " ", match.group(1)).strip(" ,;|-")
-        parts = re.split(r"[,/]| et | and | & ", raw, flags=re.IGNORECASE)
+        raw = MULTI_SPACE_RE.sub(" ", match.group(1)).strip(" ,;|-")
+        parts = DIRECTOR_SPLIT_RE.split(raw)
         cleaned_parts = []
         for part in parts:
             candidate = _clean_html_text(part).strip(" ,;|-")
@@ -1062,24 +1206,16 @@ def _allocine_parse_directors(item_html: str) -> str:
 
 
 def _allocine_parse_movies(section_html: str) -> list[dict]:
-    items = re.findall(
-        r'<li[^>]*class="[^"]*mdl[^"]*"[^>]*>(.*?)</li>',
-        section_html,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
+    items = ALLOCINE_RESULT_ITEM_RE.findall(section_html)
     results = []
     for item in items:
-        title_span = re.search(
-            r'<span[^>]*class="([^"]*meta-title-link[^"]*)"[^>]*>(.*?)</span>',
-            item,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        title_span = ALLOCINE_RESULT_TITLE_RE.search(item)
         if not title_span:
             continue
         class_attr = title_span.group(1)
         title = _clean_html_text(title_span.group(2))
         url = ""
-        token_match = re.search(r"ACr[0-9A-Za-z+/=]+", class_attr)
+        token_match = ALLOCINE_OBFUSCATED_TOKEN_RE.search(class_attr)
         if token_match:
             decoded = _allocine_decode_obfuscated(token_match.group(0))
             if decoded.startswith("http"):
@@ -1087,7 +1223,7 @@ def _allocine_parse_movies(section_html: str) -> list[dict]:
             elif decoded.startswith("/"):
                 url = f"{ALLOCINE_BASE_URL}{decoded}"
         if not url:
-            for token in re.findall(r"ACr[0-9A-Za-z+/=]+", item):
+            for token in ALLOCINE_OBFUSCATED_TOKEN_RE.findall(item):
                 decoded = _allocine_decode_obfuscated(token)
                 if "/film/fichefilm" in decoded:
                     url = (
@@ -1112,16 +1248,17 @@ def allocine_search_movies(title: str) -> list[dict]:
 def _similarity(a: str, b: str) -> float:
     if not a or not b:
         return 0.0
-    return difflib.SequenceMatcher(a=a, b=b).ratio()
+    return similarity.ratio(a, b)
 
 
+@functools.lru_cache(maxsize=TITLE_VARIANTS_CACHE_SIZE)
 def _normalize_title_for_search(title: str) -> str:
     text = str(title or "").strip()
     if not text:
         return ""
-    text = re.sub(r"([A-Za-zÀ-ÖØ-öø-ÿ])\(\s*s\s*\)", r"\1s", text, flags=re.IGNORECASE)
+    text = TITLE_PLURAL_S_RE.sub(r"\1s", text)
     text = TITLE_NOISE_TOKEN_RE.sub(" ", text)
-    text = re.sub(r"\s+", " ", text).strip(" -:/|")
+    text = WHITESPACE_RE.sub(" ", text).strip(" -:/|")
     return text
 
 
@@ -1135,17 +1272,22 @@ def _drop_title_search_stopwords(value: str) -> str:
 
 
 def _title_search_variants(title: str) -> list[str]:
-    raw = str(title or "").strip()
+    return list(_title_search_variants_cached(str(title or "")))
+
+
+@functools.lru_cache(maxsize=TITLE_VARIANTS_CACHE_SIZE)
+def _title_search_variants_cached(title: str) -> tuple[str, ...]:
+    raw = title.strip()
     if not raw:
-        return []
+        return ()
 
     normalized = _normalize_title_for_search(raw)
-    no_paren = re.sub(r"\([^)]*\)", " ", normalized or raw)
-    no_paren = re.sub(r"\s+", " ", no_paren).strip(" -:/|")
+    no_paren = PARENTHESIZED_RE.sub(" ", normalized or raw)
+    no_paren = WHITESPACE_RE.sub(" ", no_paren).strip(" -:/|")
 
     sources = [raw, normalized, no_paren]
     for source in list(sources):
-        for match in re.findall(r"\(([^)]+)\)", source):
+        for match in PAREN_CONTENT_RE.findall(source):
             sources.append(match)
         for sep in (" / ", "/", " - ", " – ", " — ", ":", "|"):
             if sep in source:
@@ -1165,14 +1307,18 @@ def _title_search_variants(title: str) -> list[str]:
         compact = _drop_title_search_stopwords(source)
         add(compact)
 
-    return variants
+    return tuple(variants)
 
 
 def _title_variants(title: str) -> list[str]:
-    raw = str(title or "")
+    return list(_title_variants_cached(str(title or "")))
+
+
+@functools.lru_cache(maxsize=TITLE_VARIANTS_CACHE_SIZE)
+def _title_variants_cached(raw: str) -> tuple[str, ...]:
     normalized = _normalize_title_for_search(raw)
-    no_paren = re.sub(r"\([^)]*\)", " ", normalized or raw)
-    no_paren = re.sub(r"\s+", " ", no_paren).strip()
+    no_paren = PARENTHESIZED_RE.sub(" ", normalized or raw)
+    no_paren = WHITESPACE_RE.sub(" ", no_paren).strip()
 
     sources = [raw, normalized, no_paren]
     variants = set()
@@ -1182,7 +1328,7 @@ def _title_variants(title: str) -> list[str]:
         base = normalize_for_match(source)
         if base and len(base) > 1:
             variants.add(base)
-        for match in re.findall(r"\(([^)]+)\)", source):
+        for match in PAREN_CONTENT_RE.findall(source):
             alt = normalize_for_match(match)
             if alt and len(alt) > 1:
                 variants.add(alt)
@@ -1192,8 +1338,31 @@ def _title_variants(title: str) -> list[str]:
                     part_norm = normalize_for_match(part)
                     if part_norm and len(part_norm) > 1:
                         variants.add(part_norm)
-    variants.update(_title_search_variants(raw))
-    return list(variants)
+    variants.update(_title_search_variants_cached(raw))
+    return tuple(variants)
+
+
+def _match_caches() -> tuple:
+    return (
+        ("normalisation", _normalize_for_match_cached),
+        ("titres recherche", _normalize_title_for_search),
+        ("variantes recherche", _title_search_variants_cached),
+        ("variantes", _title_variants_cached),
+    )
+
+
+def _clear_match_caches() -> None:
+    for _, cached in _match_caches():
+        cached.cache_clear()
+
+
+def _match_cache_stats_line() -> str:
+    """Hits / misses des caches de normalisation et de variantes de titres."""
+    parts = []
+    for label, cached in _match_caches():
+        info = cached.cache_info()
+        parts.append(f"{label} {info.hits}/{info.hits + info.misses} ({info.currsize} entree(s))")
+    return "caches titres: " + ", ".join(parts)
 
 
 def _title_similarity(input_title: str, candidate_title: str) -> float:
@@ -1223,7 +1392,7 @@ def _title_similarity(input_title: str, candidate_title: str) -> float:
 def _split_director_names(value: str) -> list[str]:
     if not value:
         return []
-    parts = re.split(r"[,/]| et | and | & ", str(value), flags=re.IGNORECASE)
+    parts = DIRECTOR_SPLIT_RE.split(str(value))
     names = []
     for part in parts:
         norm = normalize_for_match(part)
@@ -1284,31 +1453,162 @@ def _best_director_match(input_director: str, candidate_directors: str) -> float
     return best
 
 
+def _similarity_matrix(rows: list[str], cols: list[str]) -> np.ndarray:
+    """_similarity pour toutes les paires (lignes x colonnes)."""
+    if not rows or not cols:
+        return np.zeros((len(rows), len(cols)), dtype=np.float64)
+    scores = similarity.ratio_matrix(rows, cols)
+    scores[[not row for row in rows], :] = 0.0
+    scores[:, [not col for col in cols]] = 0.0
+    return scores
+
+
+def _similarity_blocks(pairs: list[tuple[list[str], list[str]]]) -> list[np.ndarray]:
+    """Plusieurs _similarity_matrix en un seul appel (blocs diagonaux d'une matrice commune)."""
+    rows = [text for block_rows, _ in pairs for text in block_rows]
+    cols = [text for _, block_cols in pairs for text in block_cols]
+    scores = _similarity_matrix(rows, cols)
+    blocks = []
+    row_start = col_start = 0
+    for block_rows, block_cols in pairs:
+        row_end = row_start + len(block_rows)
+        col_end = col_start + len(block_cols)
+        blocks.append(scores[row_start:row_end, col_start:col_end])
+        row_start, col_start = row_end, col_end
+    return blocks
+
+
+def _token_incidence(token_sets: list[set[str]], vocabulary: dict[str, int]) -> np.ndarray:
+    incidence = np.zeros((len(token_sets), len(vocabulary)), dtype=np.int64)
+    for idx, tokens in enumerate(token_sets):
+        incidence[idx, [vocabulary[token] for token in tokens]] = 1
+    return incidence
+
+
+def _token_overlap(left_tokens: list[set[str]], right_tokens: list[set[str]]):
+    """(intersection, taille gauche, taille droite) des ensembles de mots, pour toutes les paires."""
+    vocabulary = {token: idx for idx, token in enumerate(set().union(*left_tokens, *right_tokens))}
+    left = _token_incidence(left_tokens, vocabulary)
+    right = _token_incidence(right_tokens, vocabulary)
+    return left @ right.T, left.sum(axis=1)[:, None], right.sum(axis=1)[None, :]
+
+
+def _title_similarity_matrix(input_titles: list[str], candidate_titles: list[str]) -> np.ndarray:
+    """_title_similarity pour toutes les paires (titres d'entree x titres candidats)."""
+    left = [normalize_for_match(title) for title in input_titles]
+    right = [normalize_for_match(title) for title in candidate_titles]
+    scores = _similarity_matrix(left, right)
+    if not scores.size:
+        return scores
+
+    left_arr = np.array(left, dtype=str)[:, None]
+    right_arr = np.array(right, dtype=str)[None, :]
+    left_len = np.array([len(text) for text in left])[:, None]
+    right_len = np.array([len(text) for text in right])[None, :]
+    left_shorter = left_len <= right_len
+    shorter = np.where(left_shorter, left_arr, right_arr)
+    longer = np.where(left_shorter, right_arr, left_arr)
+    contained = (np.minimum(left_len, right_len) >= 6) & (np.strings.find(longer, shorter) >= 0)
+    prefix = np.strings.startswith(longer, np.strings.add(shorter, " "))
+    scores = np.where(contained, np.maximum(scores, np.where(prefix, 0.95, 0.88)), scores)
+
+    inter, left_size, right_size = _token_overlap(
+        [set(text.split()) for text in left], [set(text.split()) for text in right]
+    )
+    union = left_size + right_size - inter
+    jaccard = np.divide(inter, union, out=np.zeros(scores.shape), where=(left_size > 0) & (right_size > 0))
+    scores = np.where(jaccard >= 0.5, np.maximum(scores, 0.70 + (0.30 * jaccard)), scores)
+
+    scores = np.minimum(scores, 1.0)
+    scores[left_arr == right_arr] = 1.0
+    scores[[not text for text in left], :] = 0.0
+    scores[:, [not text for text in right]] = 0.0
+    return scores
+
+
+def _director_pair_scores(input_names: list[str], candidate_names: list[str]):
+    """Pour toutes les paires de noms: (_similarity des noms bruts, _director_name_score)."""
+    left = [normalize_for_match(name) for name in input_names]
+    right = [normalize_for_match(name) for name in candidate_names]
+    left_tokens = [text.split() for text in left]
+    right_tokens = [text.split() for text in right]
+    if not left or not right:
+        empty = np.zeros((len(left), len(right)), dtype=np.float64)
+        return empty, empty.copy()
+    raw, plain, reordered, sorted_tokens = _similarity_blocks(
+        [
+            (input_names, candidate_names),
+            (left, right),
+            ([" ".join(t) for t in left_tokens], [" ".join(reversed(t)) for t in right_tokens]),
+            ([" ".join(sorted(t)) for t in left_tokens], [" ".join(sorted(t)) for t in right_tokens]),
+        ]
+    )
+    scores = np.maximum(np.maximum(plain, reordered), sorted_tokens)
+    inter, left_size, right_size = _token_overlap([set(t) for t in left_tokens], [set(t) for t in right_tokens])
+    largest = np.maximum(left_size, right_size)
+    scores = np.maximum(scores, np.divide(inter, largest, out=np.zeros(scores.shape), where=largest > 0))
+    left_last = np.array([t[-1] if t else "" for t in left_tokens], dtype=str)[:, None]
+    right_last = np.array([t[-1] if t else "" for t in right_tokens], dtype=str)[None, :]
+    same_last = (left_last == right_last) & (left_last != "")
+    scores = np.where(same_last, np.minimum(1.0, scores + 0.15), scores)
+    scores[[not text for text in left], :] = 0.0
+    scores[:, [not text for text in right]] = 0.0
+    return raw, scores
+
+
+def _director_score_vectors(input_director: str, candidate_directors: list[str]):
+    """(_best_director_score, _best_director_match) de chaque candidat, en un seul calcul."""
+    count = len(candidate_directors)
+    best_score = np.zeros(count, dtype=np.float64)
+    best_match = np.zeros(count, dtype=np.float64)
+    input_names = _split_director_names(input_director)
+    names_by_candidate = [_split_director_names(value) for value in candidate_directors]
+    flat_names = [name for names in names_by_candidate for name in names]
+    if not input_names or not flat_names:
+        return best_score, best_match
+
+    plain, named = _director_pair_scores(input_names, flat_names)
+    start = 0
+    for idx, names in enumerate(names_by_candidate):
+        end = start + len(names)
+        if names:
+            total = 0
+            for row in plain[:, start:end].max(axis=1):
+                total = total + row
+            best_score[idx] = total / len(input_names)
+            # Meme ordre que _best_director_match: premiere paire >= 0.99, sinon le maximum.
+            block = named[:, start:end].ravel()
+            hits = np.flatnonzero(block >= 0.99)
+            best_match[idx] = block[hits[0]] if hits.size else block.max()
+        start = end
+    return best_score, best_match
+
+
 def allocine_pick_best(title: str, director: str, candidates: list[dict]):
     variants = _title_variants(title)
     if not variants or not candidates:
         return None
 
     input_has_director = bool(_split_director_names(director))
-    best = None
-    best_score = 0.0
-    for cand in candidates:
-        cand_title = cand.get("title", "")
-        cand_directors = cand.get("directors", "")
-        title_score = max((_title_similarity(v, cand_title) for v in variants), default=0.0)
-        director_score = max(
-            _best_director_score(director, cand_directors),
-            _best_director_match(director, cand_directors),
-        )
-        if input_has_director and _split_director_names(cand_directors):
-            score = (ALLOCINE_WEIGHT_TITLE * title_score) + (ALLOCINE_WEIGHT_DIRECTOR * director_score)
-        else:
-            score = title_score
-        if score > best_score:
-            best_score = score
-            best = {**cand, "score": score, "title_score": title_score, "director_score": director_score}
-    if not best:
+    cand_directors = [cand.get("directors", "") for cand in candidates]
+    title_scores = _title_similarity_matrix(variants, [cand.get("title", "") for cand in candidates]).max(axis=0)
+    director_scores = np.maximum(*_director_score_vectors(director, cand_directors))
+    weighted = input_has_director & np.array([bool(_split_director_names(value)) for value in cand_directors])
+    scores = np.where(
+        weighted,
+        (ALLOCINE_WEIGHT_TITLE * title_scores) + (ALLOCINE_WEIGHT_DIRECTOR * director_scores),
+        title_scores,
+    )
+    pick = int(np.argmax(scores))
+    best_score = float(scores[pick])
+    if best_score <= 0.0:
         return None
+    best = {
+        **candidates[pick],
+        "score": best_score,
+        "title_score": float(title_scores[pick]),
+        "director_score": float(director_scores[pick]),
+    }
 
     has_candidate_director = bool(_split_director_names(best.get("directors", "")))
     if (
@@ -1369,8 +1669,12 @@ def tmdb_get(path: str, params: dict) -> dict:
         raise RuntimeError("TMDB_API_KEY missing. Set it in your environment.")
     full_params = {"api_key": api_key, **params}
     url = f"{TMDB_BASE_URL}{path}"
+    cached = HTTP_CACHE.lookup(url, full_params)
+    if cached is not None:
+        return cached.json()
     resp = TMDB_SESSION.get(url, params=full_params, timeout=TMDB_TIMEOUT)
     resp.raise_for_status()
+    HTTP_CACHE.store(url, resp, full_params)
     return resp.json()
 
 
@@ -1388,8 +1692,12 @@ def tmdb_search_movies(title: str, lang: str) -> list[dict]:
 
 
 def tmdb_get_credits(movie_id: int, lang: str) -> dict:
-    data = tmdb_get(f"/movie/{movie_id}/credits", {"language": lang})
-    return data
+    # Realisateurs et distribution ne dependent pas de la langue: une seule
+    # requete par film, quelle que soit la variante de recherche ou la seance.
+    return TMDB_CREDITS_MEMO.get(
+        int(movie_id),
+        lambda: tmdb_get(f"/movie/{movie_id}/credits", {"language": lang}),
+    )
 
 
 def tmdb_extract_directors(credits: dict) -> list[str]:
@@ -1402,22 +1710,23 @@ def tmdb_pick_best(title: str, director: str, candidates: list[dict], lang: str)
     if not candidates:
         return None
     top = candidates[:TMDB_CANDIDATE_LIMIT]
-
-    def _title_score(cand: dict) -> float:
-        if not variants:
-            return 0.0
-        cand_title = normalize_for_match(cand.get("title", ""))
-        cand_original = normalize_for_match(cand.get("original_title", ""))
-        score = max((_similarity(v, cand_title) for v in variants), default=0.0)
-        if cand_original:
-            score = max(score, max((_similarity(v, cand_original) for v in variants), default=0.0))
-        return score
+    # Titre et titre original de tous les candidats en une matrice; les credits
+    # (realisateurs) restent demandes un par un, avec arret des que l'un convient.
+    cand_titles = [normalize_for_match(cand.get("title", "")) for cand in top]
+    cand_originals = [normalize_for_match(cand.get("original_title", "")) for cand in top]
+    title_scores = [0.0] * len(top)
+    if variants:
+        title_scores = np.maximum(
+            _similarity_matrix(variants, cand_titles).max(axis=0),
+            _similarity_matrix(variants, cand_originals).max(axis=0),
+        ).tolist()
 
     if not director:
         cand = top[0]
-        title_score = _title_score(cand)
+        title_score = title_scores[0]
         if title_score >= TMDB_MATCH_THRESHOLD:
             directors = []
+            credits = None
             movie_id = int(cand.get("id") or 0)
             if movie_id:
                 credits = tmdb_get_credits(movie_id, lang)
@@ -1428,8 +1737,10 @@ def tmdb_pick_best(title: str, director: str, candidates: list[dict], lang: str)
                 "title_score": title_score,
                 "director_score": 0.0,
                 "directors": directors,
+                "credits": credits,
             }
         directors = []
+        credits = None
         movie_id = int(cand.get("id") or 0)
         if movie_id:
             credits = tmdb_get_credits(movie_id, lang)
@@ -1440,19 +1751,20 @@ def tmdb_pick_best(title: str, director: str, candidates: list[dict], lang: str)
             "title_score": title_score,
             "director_score": 0.0,
             "directors": directors,
+            "credits": credits,
         }
     best = None
     best_score = -1.0
     best_title = -1.0
-    for cand in top:
+    for cand, title_score in zip(top, title_scores):
         director_score = 0.0
         directors = []
+        credits = None
         movie_id = int(cand.get("id") or 0)
         if movie_id:
             credits = tmdb_get_credits(movie_id, lang)
             directors = tmdb_extract_directors(credits)
             director_score = _best_director_match(director, ", ".join(directors))
-        title_score = _title_score(cand)
         score = (TMDB_WEIGHT_TITLE * title_score) + (TMDB_WEIGHT_DIRECTOR * director_score)
         if director_score > best_score or (director_score == best_score and title_score > best_title):
             best_score = director_score
@@ -1463,6 +1775,7 @@ def tmdb_pick_best(title: str, director: str, candidates: list[dict], lang: str)
                 "title_score": title_score,
                 "director_score": director_score,
                 "directors": directors,
+                "credits": credits,
             }
         if director_score >= TMDB_DIRECTOR_ACCEPT_THRESHOLD:
             return best
@@ -1512,14 +1825,6 @@ def tmdb_find_movie(title: str, director: str, lang: str) -> dict:
     return {"candidates": all_candidates, "match": match}
 
 
-def tmdb_get_details(movie_id: int, lang: str) -> dict:
-    return tmdb_get(f"/movie/{movie_id}", {"language": lang})
-
-
-def tmdb_get_release_dates(movie_id: int) -> dict:
-    return tmdb_get(f"/movie/{movie_id}/release_dates", {})
-
-
 def _dedupe_videos(items: list[dict]) -> list[dict]:
     seen = set()
     merged = []
@@ -1534,26 +1839,39 @@ def _dedupe_videos(items: list[dict]) -> list[dict]:
     return merged
 
 
-def tmdb_get_videos(movie_id: int, lang: str) -> dict:
-    langs = []
-    if lang:
-        langs.append(lang)
-    if "fr-FR" not in langs:
-        langs.append("fr-FR")
-    if "en-US" not in langs:
-        langs.append("en-US")
-    langs.append("")
-    all_results = []
-    for l in langs:
-        params = {"language": l} if l else {}
-        try:
-            data = tmdb_get(f"/movie/{movie_id}/videos", params)
-        except Exception:
-            continue
-        results = data.get("results") or []
-        if results:
-            all_results.extend(results)
-    return {"results": _dedupe_videos(all_results)}
+def _tmdb_video_languages(lang: str) -> str:
+    codes = []
+    for value in (lang, "fr-FR", "en-US"):
+        code = (value or "").split("-")[0].lower()
+        if code and code not in codes:
+            codes.append(code)
+    codes.append("null")
+    return ",".join(codes)
+
+
+def tmdb_get_movie_bundle(movie_id: int, lang: str, credits: Optional[dict] = None) -> tuple[dict, dict, dict, dict]:
+    """
+    Details + credits + dates de sortie + videos en une seule requete
+    (append_to_response). Les credits deja lus pendant la recherche sont
+    reutilises et ne sont alors pas redemandes.
+    """
+    appended = ["release_dates", "videos"]
+    if credits is None:
+        appended.insert(0, "credits")
+    data = tmdb_get(
+        f"/movie/{movie_id}",
+        {
+            "language": lang,
+            "append_to_response": ",".join(appended),
+            "include_video_language": _tmdb_video_languages(lang),
+        },
+    )
+    details = {k: v for k, v in data.items() if k not in ("credits", "release_dates", "videos")}
+    if credits is None:
+        credits = data.get("credits") or {}
+    release_dates = data.get("release_dates") or {}
+    videos = {"results": _dedupe_videos((data.get("videos") or {}).get("results") or [])}
+    return details, credits, release_dates, videos
 
 
 def _version_prefers_original(version: str) -> Optional[bool]:
@@ -1646,104 +1964,91 @@ def tmdb_pick_trailer(videos: dict, version: str, details: dict) -> str:
     return _tmdb_video_url(best)
 
 
-def _extract_json_object(text: str, start_idx: int) -> str:
-    depth = 0
-    in_string = False
-    escaped = False
-    for idx in range(start_idx, len(text)):
-        char = text[idx]
-        if in_string:
-            if escaped:
-                escaped = False
-            elif char == "\\":
-                escaped = True
-            elif char == '"':
-                in_string = False
-            continue
-        if char == '"':
-            in_string = True
-            continue
-        if char == "{":
-            depth += 1
-        elif char == "}":
-            depth -= 1
-            if depth == 0:
-                return text[start_idx : idx + 1]
-    return ""
-
-
-def _youtube_extract_initial_data(html_text: str) -> dict:
-    markers = [
-        "var ytInitialData =",
-        'window["ytInitialData"] =',
-        "ytInitialData =",
-    ]
-    for marker in markers:
+def _youtube_initial_data_bounds(html_text: str) -> tuple[int, int]:
+    """Debut (premiere accolade) et fin (</script>) du bloc ytInitialData, ou (-1, -1)."""
+    for marker in YOUTUBE_INITIAL_DATA_MARKERS:
         marker_idx = html_text.find(marker)
         if marker_idx < 0:
             continue
         start = html_text.find("{", marker_idx)
         if start < 0:
             continue
-        payload = _extract_json_object(html_text, start)
-        if not payload:
-            continue
+        end = html_text.find("</script>", start)
+        return start, end if end >= 0 else len(html_text)
+    return -1, -1
+
+
+def _youtube_iter_video_renderers(html_text: str):
+    """
+    Objets videoRenderer de ytInitialData dans l'ordre du document. Chaque
+    objet est decode seul (raw_decode a partir de son accolade): ni parcours
+    caractere par caractere ni decodage de tout le bloc de plusieurs Mo.
+    """
+    start, end = _youtube_initial_data_bounds(html_text)
+    if start < 0:
+        return
+    pos = start
+    while True:
+        match = YOUTUBE_VIDEO_RENDERER_RE.search(html_text, pos, end)
+        if not match:
+            return
         try:
-            data = json.loads(payload)
-        except Exception:
-            continue
-        if isinstance(data, dict):
-            return data
-    return {}
+            renderer, _ = YOUTUBE_JSON_DECODER.raw_decode(html_text, match.end() - 1)
+        except ValueError:
+            renderer = None
+        if isinstance(renderer, dict):
+            yield renderer
+        pos = match.end()
 
 
-def _youtube_collect_video_renderers(node, output: list[dict]) -> None:
-    if isinstance(node, dict):
-        renderer = node.get("videoRenderer")
-        if isinstance(renderer, dict):
-            video_id = str(renderer.get("videoId") or "").strip()
-            title = ""
-            title_info = renderer.get("title") or {}
-            if isinstance(title_info, dict):
-                if title_info.get("simpleText"):
-                    title = str(title_info.get("simpleText"))
-                elif isinstance(title_info.get("runs"), list):
-                    title = "".join(
-                        str(run.get("text") or "")
-                        for run in title_info.get("runs")
-                        if isinstance(run, dict)
-                    )
-            if video_id:
-                output.append({"video_id": video_id, "title": title.strip()})
-        for value in node.values():
-            _youtube_collect_video_renderers(value, output)
-    elif isinstance(node, list):
-        for item in node:
-            _youtube_collect_video_renderers(item, output)
+def _youtube_renderer_candidate(renderer: dict) -> Optional[dict]:
+    video_id = str(renderer.get("videoId") or "").strip()
+    if not video_id:
+        return None
+    title = ""
+    title_info = renderer.get("title") or {}
+    if isinstance(title_info, dict):
+        if title_info.get("simpleText"):
+            title = str(title_info.get("simpleText"))
+        elif isinstance(title_info.get("runs"), list):
+            title = "".join(
+                str(run.get("text") or "")
+                for run in title_info.get("runs")
+                if isinstance(run, dict)
+            )
+    return {"video_id": video_id, "title": title.strip()}
 
 
 def _youtube_search_candidates(query: str) -> list[dict]:
     if not query:
         return []
-    try:
-        resp = YOUTUBE_SESSION.get(
-            YOUTUBE_SEARCH_URL,
-            params={"search_query": query, "hl": "fr", "gl": "FR"},
-            timeout=YOUTUBE_TIMEOUT,
-        )
-    except requests.RequestException:
-        return []
-    if resp.status_code != 200:
-        return []
+    params = {"search_query": query, "hl": "fr", "gl": "FR"}
+    resp = HTTP_CACHE.lookup(YOUTUBE_SEARCH_URL, params)
+    if resp is None:
+        try:
+            resp = YOUTUBE_SESSION.get(YOUTUBE_SEARCH_URL, params=params, timeout=YOUTUBE_TIMEOUT)
+        except requests.RequestException:
+            return []
+        if resp.status_code != 200:
+            return []
+        HTTP_CACHE.store(YOUTUBE_SEARCH_URL, resp, params)
+    return _youtube_parse_candidates(resp.text, query)
+
 
-    html_text = resp.text
+def _youtube_parse_candidates(html_text: str, query: str) -> list[dict]:
     candidates = []
-    data = _youtube_extract_initial_data(html_text)
-    if data:
-        _youtube_collect_video_renderers(data, candidates)
+    video_ids = set()
+    for renderer in _youtube_iter_video_renderers(html_text):
+        candidate = _youtube_renderer_candidate(renderer)
+        if candidate is None:
+            continue
+        candidates.append(candidate)
+        video_ids.add(candidate["video_id"])
+        if len(video_ids) >= YOUTUBE_MAX_RESULTS:
+            break
 
     if not candidates:
-        video_ids = re.findall(r"watch\?v=([A-Za-z0-9_-]{11})", html_text)
+        video_ids = YOUTUBE_WATCH_ID_RE.findall(html_text)
         seen = set()
         for video_id in video_ids:
             if video_id not in seen:
@@ -1771,7 +2076,7 @@ def _youtube_search_candidates(query: str) -> list[dict]:
 
 def _year_from_date(value: str) -> str:
     text = str(value or "").strip()
-    if re.match(r"^\d{4}", text):
+    if YEAR_PREFIX_RE.match(text):
         return text[:4]
     return ""
 
@@ -1796,6 +2101,19 @@ def _is_allocine_player_trailer_url(url: str) -> bool:
     return bool(TRAILER_ALLOCINE_PLAYER_RE.search(value))
 
 
+def _preferred_trailer_url(pref: str, allocine_trailer: str, tmdb_trailer: str) -> str:
+    """Bande-annonce retenue selon le choix de source (s/t/a/m, sinon TMDB d'abord)."""
+    if pref == "s":
+        return ""
+    if pref == "t":
+        return tmdb_trailer or ""
+    if pref == "a":
+        return allocine_trailer or ""
+    if pref == "m":
+        return allocine_trailer or tmdb_trailer or ""
+    return tmdb_trailer or allocine_trailer or ""
+
+
 def _youtube_search_queries(title: str, year: str, director: str, extra_titles: list[str]) -> list[str]:
     bases = []
     for value in [title] + list(extra_titles or []):
@@ -1832,50 +2150,56 @@ def _youtube_search_queries(title: str, year: str, director: str, extra_titles:
     return queries[:8]
 
 
-def youtube_pick_trailer(title: str, year: str, director: str, extra_titles: list[str]) -> str:
-    queries = _youtube_search_queries(title, year, director, extra_titles)
-    if not queries:
-        return ""
+def _youtube_pick_variants(title: str, extra_titles: list[str]) -> list[str]:
     variants = []
     for value in [title] + list(extra_titles or []):
         variants.extend(_title_variants(value))
     variants = [v for v in variants if v]
     if not variants:
         variants = _title_variants(title)
+    return variants
 
-    best_url = ""
-    best_score = -1.0
-    fallback_url = ""
-    seen_ids = set()
-    for query in queries:
-        for candidate in _youtube_search_candidates(query):
-            video_id = candidate.get("video_id") or ""
-            if not video_id or video_id in seen_ids:
-                continue
-            seen_ids.add(video_id)
-            url = f"https://www.youtube.com/watch?v={video_id}"
-            if not fallback_url:
-                fallback_url = url
-            cand_title = candidate.get("title") or ""
-            if not cand_title:
-                continue
-            score = max((_title_similarity(v, cand_title) for v in variants), default=0.0)
-            cand_norm = normalize_for_match(cand_title)
-            if "bande annonce" in cand_norm or "trailer" in cand_norm or "teaser" in cand_norm:
-                score += 0.15
-            years = re.findall(r"(?:19|20)\d{2}", cand_title)
-            if year:
-                if year in years:
-                    score += 0.10
-                elif years:
-                    score -= 0.20
-            if score > best_score:
-                best_score = score
-                best_url = url
-
-    if best_url and best_score >= 0.45:
-        return best_url
-    return fallback_url
+
+def _youtube_pick_state() -> dict:
+    return {"best_url": "", "best_score": -1.0, "fallback_url": "", "seen_ids": set()}
+
+
+def _youtube_score_candidates(state: dict, candidates: list[dict], variants: list[str], year: str) -> None:
+    """Note les resultats d'une requete et garde le meilleur dans `state`."""
+    for candidate in candidates:
+        video_id = candidate.get("video_id") or ""
+        if not video_id or video_id in state["seen_ids"]:
+            continue
+        state["seen_ids"].add(video_id)
+        url = f"https://www.youtube.com/watch?v={video_id}"
+        if not state["fallback_url"]:
+            state["fallback_url"] = url
+        cand_title = candidate.get("title") or ""
+        if not cand_title:
+            continue
+        score = max((_title_similarity(v, cand_title) for v in variants), default=0.0)
+        cand_norm = normalize_for_match(cand_title)
+        if "bande annonce" in cand_norm or "trailer" in cand_norm or "teaser" in cand_norm:
+            score += 0.15
+        years = YEAR_RE.findall(cand_title)
+        if year:
+            if year in years:
+                score += 0.10
+            elif years:
+                score -= 0.20
+        if score > state["best_score"]:
+            state["best_score"] = score
+            state["best_url"] = url
+
+
+def _youtube_pick_done(state: dict) -> bool:
+    return state["best_score"] >= YOUTUBE_EARLY_STOP_SCORE
+
+
+def _youtube_pick_result(state: dict) -> str:
+    if state["best_url"] and state["best_score"] >= YOUTUBE_ACCEPT_SCORE:
+        return state["best_url"]
+    return state["fallback_url"]
 
 
 def _google_api_key() -> str:
@@ -1909,7 +2233,7 @@ def _google_search(query: str, site_search: str = "") -> list[dict]:
     if site_search:
         params["siteSearch"] = site_search
     try:
-        resp = requests.get(GOOGLE_CSE_URL, params=params, timeout=GOOGLE_TIMEOUT)
+        resp = GOOGLE_SESSION.get(GOOGLE_CSE_URL, params=params, timeout=GOOGLE_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
     except Exception as exc:
@@ -1924,7 +2248,7 @@ def _google_search_queries(title: str, director: str, year: str = "") -> list[st
     seen = set()
 
     def add(value: str) -> None:
-        text = re.sub(r"\s+", " ", str(value or "")).strip()
+        text = WHITESPACE_RE.sub(" ", str(value or "")).strip()
         key = normalize_for_match(text)
         if key and key not in seen:
             seen.add(key)
@@ -1945,17 +2269,13 @@ def _extract_allocine_movie_urls_from_google_items(items: list[dict]) -> list[st
     seen = set()
     for item in items:
         candidates = [item.get("link", "")]
-        candidates.extend(re.findall(r"https?://www\.allocine\.fr/film/[^\s\"<>]+", json.dumps(item, ensure_ascii=False)))
+        candidates.extend(ALLOCINE_FILM_URL_RE.findall(json.dumps(item, ensure_ascii=False)))
         for value in candidates:
-            match = re.search(
-                r"https?://www\.allocine\.fr/film/(?:fichefilm_gen_cfilm=\d+|fichefilm-\d+)[^\"'<>\s]*",
-                str(value or ""),
-                flags=re.IGNORECASE,
-            )
+            match = ALLOCINE_FICHE_URL_RE.search(str(value or ""))
             if not match:
                 continue
             url = html.unescape(match.group(0)).split("#", 1)[0]
-            url = re.sub(r"[?&](?:utm_[^=&]+|cmpid)=[^&]+", "", url)
+            url = TRACKING_PARAM_RE.sub("", url)
             if url not in seen:
                 seen.add(url)
                 urls.append(url)
@@ -2022,71 +2342,58 @@ def google_find_allocine_movie(title: str, director: str, year: str = "") -> dic
     return best
 
 
-def get_movies_from_google(films: list[dict]) -> None:
-    missing = [
-        (idx, film)
-        for idx, film in enumerate(films)
-        if not film.get("allocine_url") and not film.get("tmdb_id")
-    ]
-    if not missing:
-        return
-    if not _google_search_enabled():
-        log_step("google: secours web desactive (GOOGLE_API_KEY ou GOOGLE_CX manquant)")
+def _apply_google_match(film: dict) -> None:
+    title = film.get("titre", "")
+    director = film.get("realisateur", "")
+    year = _year_from_date(film.get("date", ""))
+    match = google_find_allocine_movie(title, director, year)
+    if not match:
+        log_step(f"google: no match for {title}")
         return
-
-    log_step("google: secours web pour fiches sans resultat Allocine/TMDB")
-    for idx, film in missing:
-        title = film.get("titre", "")
-        director = film.get("realisateur", "")
-        year = _year_from_date(film.get("date", ""))
-        match = google_find_allocine_movie(title, director, year)
-        if not match:
-            log_step(f"google: no match for {title}")
-            continue
-        film["allocine_url"] = match.get("url", "")
-        film["allocine_match_query"] = match.get("query", "")
-        film["allocine_title"] = match.get("title", "")
-        film["allocine_directors"] = match.get("directors", "")
-        film["allocine_score"] = match.get("score", 0.0)
-        film["allocine_title_score"] = match.get("title_score", 0.0)
-        film["allocine_director_score"] = match.get("director_score", 0.0)
-        meta = match.get("meta") or {}
-        enriched = film.setdefault("enriched", {})
-        if meta.get("affiche"):
-            enriched["affiche"] = meta.get("affiche")
-        for key in (
-            "allocine_title",
-            "allocine_alt_title",
-            "allocine_directors",
-            "allocine_release_date",
-            "allocine_synopsis",
-            "allocine_genres",
-            "allocine_duree_min",
-            "allocine_pays",
-            "allocine_acteurs",
-            "allocine_trailer_url",
-        ):
-            if meta.get(key):
-                enriched[key] = meta.get(key)
-        if meta.get("allocine_recompenses"):
-            enriched["allocine_recompenses"] = _merge_list_pref_allocine(
-                film.get("recompenses", ""),
-                meta.get("allocine_recompenses", []),
-            )
-        age_min = meta.get("allocine_age_min")
-        if isinstance(age_min, int) and age_min > 0:
-            enriched["allocine_age_min"] = age_min
-        try:
-            photos = allocine_photo_urls(film["allocine_url"], enriched.get("affiche", ""))
-        except Exception:
-            photos = []
-        if photos:
-            enriched["backdrops"] = photos
-        log_step(
-            "google: "
-            f"{title} -> {film['allocine_url']} "
-            f"(title={match.get('title_score', 0):.2f}, director={match.get('director_score', 0):.2f})"
+    film["allocine_url"] = match.get("url", "")
+    film["allocine_match_query"] = match.get("query", "")
+    film["allocine_title"] = match.get("title", "")
+    film["allocine_directors"] = match.get("directors", "")
+    film["allocine_score"] = match.get("score", 0.0)
+    film["allocine_title_score"] = match.get("title_score", 0.0)
+    film["allocine_director_score"] = match.get("director_score", 0.0)
+    meta = match.get("meta") or {}
+    enriched = film.setdefault("enriched", {})
+    if meta.get("affiche"):
+        enriched["affiche"] = meta.get("affiche")
+    for key in (
+        "allocine_title",
+        "allocine_alt_title",
+        "allocine_directors",
+        "allocine_release_date",
+        "allocine_synopsis",
+        "allocine_genres",
+        "allocine_duree_min",
+        "allocine_pays",
+        "allocine_acteurs",
+        "allocine_trailer_url",
+    ):
+        if meta.get(key):
+            enriched[key] = meta.get(key)
+    if meta.get("allocine_recompenses"):
+        enriched["allocine_recompenses"] = _merge_list_pref_allocine(
+            film.get("recompenses", ""),
+            meta.get("allocine_recompenses", []),
         )
+    age_min = meta.get("allocine_age_min")
+    if isinstance(age_min, int) and age_min > 0:
+        enriched["allocine_age_min"] = age_min
+    try:
+        photos = allocine_photo_urls(film["allocine_url"], enriched.get("affiche", ""))
+    except Exception:
+        photos = []
+    if photos:
+        enriched["backdrops"] = photos
+    log_step(
+        "google: "
+        f"{title} -> {film['allocine_url']} "
+        f"(title={match.get('title_score', 0):.2f}, director={match.get('director_score', 0):.2f})"
+    )
 
 
 def tmdb_release_date_fr(release_dates: dict) -> str:
@@ -2112,14 +2419,8 @@ def _title_similarity_allocine_tmdb(allocine_title: str, tmdb_title: str, tmdb_o
     variants = _title_variants(allocine_title or "")
     if not variants:
         return 0.0
-    candidates = [tmdb_title or "", tmdb_original or ""]
-    best = 0.0
-    for cand in candidates:
-        cand_norm = normalize_for_match(cand)
-        if not cand_norm:
-            continue
-        best = max(best, max((_similarity(v, cand_norm) for v in variants), default=0.0))
-    return best
+    candidates = [normalize_for_match(tmdb_title or ""), normalize_for_match(tmdb_original or "")]
+    return float(_similarity_matrix(variants, candidates).max())
 
 
 def verify_allocine_tmdb(allocine_meta: dict, tmdb_meta: dict) -> dict:
@@ -2150,46 +2451,82 @@ def verify_allocine_tmdb(allocine_meta: dict, tmdb_meta: dict) -> dict:
         "allocine_date": allocine_date_raw,
         "tmdb_date": tmdb_date_raw,
     }
-def _gui_prompt_source_choice(film: dict, allocine_meta: dict, tmdb_meta: dict, match_info: dict) -> str:
 
-    choices={1 : ("Allocine", "a"),
-             2 : ("TMDB", "t"),
-             3 : ("Both / Merge", "m"),
-             4 : ("Skip", "s")
-    }
+
+SOURCE_CHOICE_LABELS = {
+    1: ("Allocine", "a"),
+    2: ("TMDB", "t"),
+    3: ("Both / Merge", "m"),
+    4: ("Skip", "s"),
+}
+
+
+def _source_mismatch_lines(review: dict) -> tuple[str, str, str]:
+    """Textes Allocine, TMDB et scores d'un desaccord a arbitrer."""
+    allocine_meta = review["allocine_meta"]
+    tmdb_meta = review["tmdb_meta"]
+    match_info = review["match_info"]
+    allocine = (
+        f"  titre: {allocine_meta.get('allocine_title', '')}\n"
+        f"  realisateur: {allocine_meta.get('allocine_directors', '')}\n"
+        f"  date: {match_info.get('allocine_date', '')}"
+    )
+    tmdb = (
+        f"  titre: {tmdb_meta.get('tmdb_title', '')}\n"
+        f"  titre original: {tmdb_meta.get('tmdb_original_title', '')}\n"
+        f"  realisateur: {tmdb_meta.get('tmdb_directors', '')}\n"
+        f"  date: {match_info.get('tmdb_date', '')}"
+    )
+    scores = (
+        f"Scores: titre={match_info.get('title_score', 0):.2f} "
+        f"realisateur={match_info.get('director_score', 0):.2f} "
+        f"date_match={match_info.get('date_match')}"
+    )
+    return allocine, tmdb, scores
+
+
+def _gui_review_source_choices(reviews: list[dict]) -> list[Optional[str]]:
+    """
+    Une seule fenetre pour tous les desaccords Allocine/TMDB; un choix par film.
+    None = aucun bouton coche (ou fenetre fermee): Skip pour ce passage, non memorise.
+    """
     global  window
     window.attributes("-topmost", True)
 
     new_window = tk.Toplevel(window)
-    new_window.title(f"selection : {film.get('titre', '')}")
-    hauteur=str(88*len(choices)+30)
-    new_window.geometry("400x%s" %hauteur)
-
-    choice=tk.IntVar(new_window, value = 4  )
-
-    y=10
-    for c in choices.keys():
-        ttk.Radiobutton(new_window, text=choices[c][0], variable=choice, value=c).place(x=10, y=y)
-        y+=18
-        if c == 1:
-            label = f"  titre: {allocine_meta.get('allocine_title', '')}\n" +\
-                    f"  realisateur: {allocine_meta.get('allocine_directors', '')}\n" +\
-                    f"  date: {match_info.get('allocine_date', '')}"
-            ttk.Label(new_window,text=label,anchor='w').place(x=50, y=y)
-            y+=70
-        elif c == 2 :
-            label = f"  titre: {tmdb_meta.get('tmdb_title', '')}\n" + \
-                    f"  titre original: {tmdb_meta.get('tmdb_original_title', '')}\n"+\
-                    f"  realisateur: {tmdb_meta.get('tmdb_directors', '')}\n" +\
-                    f"  date: {tmdb_meta.get('tmdb_date', '')}"
-            ttk.Label(new_window,text=label,anchor='w').place(x=50, y=y)
-            y+=90
-
-    label= f"Scores: titre={match_info.get('title_score', 0):.2f} \n" +\
-           f"           realisateur={match_info.get('director_score', 0):.2f} \n" +\
-           f"           date_match={match_info.get('date_match')}"
-    ttk.Label(new_window, text=label, anchor='w').place(x=100,y=y)
-    tk.Button(new_window, text="Valider", command=new_window.destroy).pack(side='bottom')
+    new_window.title(f"selection : {len(reviews)} film(s) a verifier")
+    new_window.geometry("720x%s" % min(160 * len(reviews) + 60, 700))
+
+    canvas = tk.Canvas(new_window, highlightthickness=0)
+    scrollbar = ttk.Scrollbar(new_window, orient="vertical", command=canvas.yview)
+    frame = ttk.Frame(canvas)
+    frame.bind("<Configure>", lambda _event: canvas.configure(scrollregion=canvas.bbox("all")))
+    canvas.create_window((0, 0), window=frame, anchor="nw")
+    canvas.configure(yscrollcommand=scrollbar.set)
+    tk.Button(new_window, text="Valider", command=new_window.destroy).pack(side="bottom")
+    ttk.Label(new_window, text="Sans choix: Skip pour ce passage, non memorise.").pack(side="bottom")
+    scrollbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+
+    variables = []
+    for row, review in enumerate(reviews):
+        allocine, tmdb, scores = _source_mismatch_lines(review)
+        box = ttk.LabelFrame(frame, text=f"{row + 1}. {review['film'].get('titre', '')}")
+        box.grid(row=row, column=0, sticky="we", padx=10, pady=5)
+        choice = tk.IntVar(new_window, value=0)
+        variables.append(choice)
+        for column, c in enumerate(SOURCE_CHOICE_LABELS.keys()):
+            ttk.Radiobutton(box, text=SOURCE_CHOICE_LABELS[c][0], variable=choice, value=c).grid(
+                row=0, column=column, sticky="w", padx=5
+            )
+        ttk.Label(box, text=f"Allocine\n{allocine}", anchor="w", justify="left").grid(
+            row=1, column=0, columnspan=2, sticky="nw", padx=5
+        )
+        ttk.Label(box, text=f"TMDB\n{tmdb}", anchor="w", justify="left").grid(
+            row=1, column=2, columnspan=2, sticky="nw", padx=5
+        )
+        ttk.Label(box, text=scores, anchor="w").grid(row=2, column=0, columnspan=4, sticky="w", padx=5)
+
     #force display
     window.attributes("-topmost", False)
     new_window.attributes("-topmost", True)
@@ -2198,94 +2535,42 @@ def _gui_prompt_source_choice(film: dict, allocine_meta: dict, tmdb_meta: dict,
 
     window.wait_window(new_window)
 
-
-    selected =  choice.get()
-    return choices[selected][1]
-
+    return [
+        SOURCE_CHOICE_LABELS[choice.get()][1] if choice.get() in SOURCE_CHOICE_LABELS else None
+        for choice in variables
+    ]
 
 
-def _prompt_source_choice(film: dict, allocine_meta: dict, tmdb_meta: dict, match_info: dict) -> str:
-    print("\n--- allocine/tmdb mismatch ---", flush=True)
-    print(f"Titre source: {film.get('titre', '')}", flush=True)
-    print("Allocine:", flush=True)
-    print(f"  titre: {allocine_meta.get('allocine_title', '')}", flush=True)
-    print(f"  realisateur: {allocine_meta.get('allocine_directors', '')}", flush=True)
-    print(f"  date: {match_info.get('allocine_date', '')}", flush=True)
-    print("TMDB:", flush=True)
-    print(f"  titre: {tmdb_meta.get('tmdb_title', '')}", flush=True)
-    print(f"  titre original: {tmdb_meta.get('tmdb_original_title', '')}", flush=True)
-    print(f"  realisateur: {tmdb_meta.get('tmdb_directors', '')}", flush=True)
-    print(f"  date: {match_info.get('tmdb_date', '')}", flush=True)
-    print(
-        f"Scores: titre={match_info.get('title_score', 0):.2f} "
-        f"realisateur={match_info.get('director_score', 0):.2f} "
-        f"date_match={match_info.get('date_match')}",
-        flush=True,
-    )
+def _prompt_source_choices(reviews: list[dict]) -> list[Optional[str]]:
+    """
+    Liste tous les desaccords Allocine/TMDB puis demande un choix par film.
+    None = pas de reponse (mode non interactif): 'm' est applique sans etre memorise.
+    """
+    print(f"\n--- allocine/tmdb: {len(reviews)} desaccord(s) a arbitrer ---", flush=True)
+    for number, review in enumerate(reviews, 1):
+        allocine, tmdb, scores = _source_mismatch_lines(review)
+        print(f"\n[{number}] Titre source: {review['film'].get('titre', '')}", flush=True)
+        print(f"Allocine:\n{allocine}", flush=True)
+        print(f"TMDB:\n{tmdb}", flush=True)
+        print(scores, flush=True)
     if not sys.stdin.isatty():
         print("[info] mode non interactif: choix automatique 'm' (merge).", flush=True)
-        return "m"
-    while True:
-        try:
-            choice = input("Choisir source (a=allocine, t=tmdb, m=both/merge, s=skip): ").strip().lower()
-        except EOFError:
-            print("[info] entree indisponible: choix automatique 'm' (merge).", flush=True)
-            return "m"
-        if choice in {"a", "t", "m", "s"}:
-            return choice
-
-
-def get_movies_from_tmdb(films):
-    log_step("tmdb: chercher par titre (langue principale puis en-US si besoin)")
-
-    def _tmdb_lookup(idx: int, title: str, director: str):
-        if not title:
-            return idx, title, None, None, None, ""
-        try:
-            result = tmdb_find_movie(title, director, TMDB_LANG_DEFAULT)
-            match = result.get("match")
-            used_lang = TMDB_LANG_DEFAULT
-            if not match:
-                result = tmdb_find_movie(title, director, "en-US")
-                match = result.get("match")
-                used_lang = "en-US"
-            return idx, title, result, match, used_lang, ""
-        except Exception as exc:
-            return idx, title, None, None, None, str(exc)
-
-    futures = []
-    max_workers = min(TMDB_MAX_WORKERS, max(1, len(films)))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for idx, film in enumerate(films):
-            titre = film.get("titre", "")
-            realisateur = film.get("realisateur", "")
-            futures.append(executor.submit(_tmdb_lookup, idx, titre, realisateur))
-        for future in as_completed(futures):
-            idx, titre, result, match, used_lang, error = future.result()
-            film = films[idx]
-            if not titre:
-                continue
-            if error:
-                log_step(f"tmdb: erreur recherche {titre} ({error})")
-                continue
-            if not result:
-                log_step(f"tmdb: erreur recherche {titre} (no result)")
-                continue
-            candidates = result.get("candidates") or []
-            film["tmdb_candidates"] = candidates
-            if match:
-                film["tmdb_id"] = str(match.get("id") or "")
-                film["tmdb_title"] = match.get("title") or ""
-                film["tmdb_original_title"] = match.get("original_title") or ""
-                film["tmdb_release_date"] = match.get("release_date") or ""
-                film["tmdb_score"] = match.get("score", 0.0)
-                film["tmdb_title_score"] = match.get("title_score", 0.0)
-                film["tmdb_director_score"] = match.get("director_score", 0.0)
-                film["tmdb_directors"] = ", ".join(match.get("directors") or [])
-                film["tmdb_lang"] = used_lang
-                log_step(f"tmdb: {titre} -> {film['tmdb_id']} ({film['tmdb_title']})")
-            else:
-                log_step(f"tmdb: no match for {titre} ({len(candidates)} candidats)")
+        return [None] * len(reviews)
+    answers: list[Optional[str]] = []
+    for number, review in enumerate(reviews, 1):
+        while True:
+            try:
+                choice = input(
+                    f"[{number}/{len(reviews)}] {review['film'].get('titre', '')}: "
+                    "source (a=allocine, t=tmdb, m=both/merge, s=skip): "
+                ).strip().lower()
+            except EOFError:
+                print("[info] entree indisponible: choix automatique 'm' (merge).", flush=True)
+                return answers + [None] * (len(reviews) - len(answers))
+            if choice in {"a", "t", "m", "s"}:
+                answers.append(choice)
+                break
+    return answers
 
 
 def _dedupe_nonempty(values: list[str]) -> list[str]:
@@ -2301,6 +2586,8 @@ def _dedupe_nonempty(values: list[str]) -> list[str]:
 
 
 def _canonical_title_for_output(film: dict) -> str:
+    if film.get("previous"):
+        return film["previous"].get("titre", "")
     enriched = film.get("enriched", {})
     pref = enriched.get("source_preference", "")
     if pref == "s":
@@ -2316,6 +2603,8 @@ def _canonical_title_for_output(film: dict) -> str:
 
 
 def _canonical_director_for_output(film: dict) -> str:
+    if film.get("previous"):
+        return film["previous"].get("realisateur", "")
     enriched = film.get("enriched", {})
     pref = enriched.get("source_preference", "")
     if pref == "s":
@@ -2402,184 +2691,607 @@ def _open_report_for_reading(path: Path) -> None:
         log_step(f"rapport: impossible d'ouvrir automatiquement {path} ({exc})")
 
 
-def get_movies_from_allociné(films, only_missing: bool = False, include_tmdb_titles: bool = False):
-    # 1) Recherche Allocine par titre + realisateur (scraping)
-    log_step("allocine: chercher par titre + realisateur (scraping)")
+def _tmdb_lookup(title: str, director: str) -> tuple[dict, Optional[dict], str]:
+    result = tmdb_find_movie(title, director, TMDB_LANG_DEFAULT)
+    match = result.get("match")
+    used_lang = TMDB_LANG_DEFAULT
+    if not match:
+        result = tmdb_find_movie(title, director, "en-US")
+        match = result.get("match")
+        used_lang = "en-US"
+    return result, match, used_lang
+
+
+def _apply_allocine_match(film: dict, titre: str, result: dict) -> None:
+    film["allocine_candidates"] = result.get("candidates") or []
+    match = result.get("match")
+    if match:
+        film["allocine_url"] = match.get("url", "")
+        film["allocine_match_query"] = titre
+        film["allocine_title"] = match.get("title", "")
+        film["allocine_directors"] = match.get("directors", "")
+        film["allocine_score"] = match.get("score", 0.0)
+        film["allocine_title_score"] = match.get("title_score", 0.0)
+        film["allocine_director_score"] = match.get("director_score", 0.0)
+
+
+def _apply_allocine_meta(film: dict, meta: dict) -> None:
+    if meta:
+        if meta.get("affiche"):
+            film["enriched"]["affiche"] = meta.get("affiche")
+        if meta.get("allocine_title"):
+            film["enriched"]["allocine_title"] = meta.get("allocine_title")
+        if meta.get("allocine_alt_title"):
+            film["enriched"]["allocine_alt_title"] = meta.get("allocine_alt_title")
+        if meta.get("allocine_directors"):
+            film["enriched"]["allocine_directors"] = meta.get("allocine_directors")
+        if meta.get("allocine_release_date"):
+            film["enriched"]["allocine_release_date"] = meta.get("allocine_release_date")
+        if meta.get("allocine_synopsis"):
+            film["enriched"]["allocine_synopsis"] = meta.get("allocine_synopsis")
+        if meta.get("allocine_genres"):
+            film["enriched"]["allocine_genres"] = meta.get("allocine_genres")
+        if meta.get("allocine_duree_min"):
+            film["enriched"]["allocine_duree_min"] = meta.get("allocine_duree_min")
+        if meta.get("allocine_pays"):
+            film["enriched"]["allocine_pays"] = meta.get("allocine_pays")
+        if meta.get("allocine_acteurs"):
+            film["enriched"]["allocine_acteurs"] = meta.get("allocine_acteurs")
+        if meta.get("allocine_recompenses"):
+            base_rewards = film.get("recompenses", "")
+            film["enriched"]["allocine_recompenses"] = _merge_list_pref_allocine(
+                base_rewards,
+                meta.get("allocine_recompenses", []),
+            )
+        if meta.get("allocine_trailer_url"):
+            film["enriched"]["allocine_trailer_url"] = meta.get("allocine_trailer_url")
+        age_min = meta.get("allocine_age_min")
+        if isinstance(age_min, int) and age_min > 0:
+            film["enriched"]["allocine_age_min"] = age_min
+    if not film["enriched"].get("allocine_directors"):
+        fallback_directors = film.get("allocine_directors", "")
+        if fallback_directors:
+            film["enriched"]["allocine_directors"] = fallback_directors
+    if not film["enriched"].get("allocine_title"):
+        fallback_title = film.get("allocine_title", "")
+        if fallback_title:
+            film["enriched"]["allocine_title"] = fallback_title
+    if not film["enriched"].get("allocine_recompenses"):
+        base_rewards = film.get("recompenses", "")
+        if base_rewards:
+            film["enriched"]["allocine_recompenses"] = _split_list(base_rewards)
+
+
+def _apply_tmdb_match(film: dict, result: dict, match: Optional[dict], used_lang: str) -> None:
+    film["tmdb_candidates"] = result.get("candidates") or []
+    if match:
+        film["tmdb_id"] = str(match.get("id") or "")
+        film["tmdb_title"] = match.get("title") or ""
+        film["tmdb_original_title"] = match.get("original_title") or ""
+        film["tmdb_release_date"] = match.get("release_date") or ""
+        film["tmdb_score"] = match.get("score", 0.0)
+        film["tmdb_title_score"] = match.get("title_score", 0.0)
+        film["tmdb_director_score"] = match.get("director_score", 0.0)
+        film["tmdb_directors"] = ", ".join(match.get("directors") or [])
+        film["tmdb_lang"] = used_lang
+        film["tmdb_credits"] = match.get("credits")
+
+
+def _apply_tmdb_details(film: dict, details: dict, credits: dict, release_dates: dict, videos: dict) -> None:
+    synopsis = details.get("overview") or ""
+    genres = [g.get("name") for g in (details.get("genres") or []) if g.get("name")]
+    runtime = details.get("runtime") or 0
+    countries = _normalize_country_names(
+        [c.get("name") for c in (details.get("production_countries") or []) if c.get("name")]
+    )
+    cast = tmdb_extract_main_cast(credits)
+    trailer_url = tmdb_pick_trailer(videos, film.get("version", ""), details)
+    backdrop_path = str(details.get("backdrop_path") or "").strip()
+    poster_path = str(details.get("poster_path") or "").strip()
+    tmdb_backdrops = []
+    tmdb_affiche = ""
+    if backdrop_path:
+        tmdb_backdrops = [f"https://image.tmdb.org/t/p/original{backdrop_path}"]
+    if poster_path:
+        tmdb_affiche = f"https://image.tmdb.org/t/p/w780{poster_path}"
+    film["enriched"]["tmdb_synopsis"] = synopsis
+    film["enriched"]["tmdb_genres"] = genres
+    film["enriched"]["tmdb_duree_min"] = str(runtime) if runtime else ""
+    film["enriched"]["tmdb_pays"] = ", ".join(countries)
+    film["enriched"]["tmdb_acteurs"] = ", ".join(cast)
+    film["enriched"]["tmdb_recompenses"] = []
+    film["enriched"]["tmdb_trailer_url"] = trailer_url
+    film["tmdb_details"] = details
+    film["tmdb_videos"] = videos
+    film["enriched"]["tmdb_backdrops"] = tmdb_backdrops
+    film["enriched"]["tmdb_affiche"] = tmdb_affiche
+    if not film.get("tmdb_title"):
+        # Id TMDB connu sans recherche (index des films): titres et realisateurs des details.
+        film["tmdb_title"] = details.get("title") or ""
+        film["tmdb_original_title"] = details.get("original_title") or ""
+        film["tmdb_directors"] = ", ".join(tmdb_extract_directors(credits))
+    fr_date = tmdb_release_date_fr(release_dates)
+    if fr_date:
+        film["tmdb_release_date"] = fr_date
+    elif details.get("release_date"):
+        film["tmdb_release_date"] = details.get("release_date") or film.get("tmdb_release_date", "")
+
+
+# Champs propres a chaque seance: ils restent sur la ligne source lors de la
+# redistribution des resultats d'une oeuvre vers ses seances.
+SCREENING_FIELDS = (
+    "titre",
+    "realisateur",
+    "version",
+    "categorie",
+    "commentaire",
+    "date",
+    "heure",
+    "cm",
+    "recompenses",
+    "tarif",
+    "is_cineclub",
+    "is_scolaire",
+    "raw",
+)
+
+
+def _group_screenings_into_works(films: list[dict]) -> list[dict]:
+    """
+    Regroupe les seances d'un meme film (titre + realisateur normalises) en une
+    oeuvre unique. Deux URL Allocine differentes dans la source donnent deux
+    oeuvres; une seance sans URL rejoint la premiere oeuvre de son groupe.
+    """
+    groups: dict[tuple[str, str], list[dict]] = {}
+    for film in films:
+        key = (normalize_for_match(film.get("titre", "")), normalize_for_match(film.get("realisateur", "")))
+        if not key[0]:
+            key = (f"#{len(groups)}", key[1])
+        groups.setdefault(key, []).append(film)
+
+    works = []
+    for key, screenings in groups.items():
+        by_url: dict[str, list[dict]] = {}
+        for film in screenings:
+            by_url.setdefault(film.get("allocine_url", ""), []).append(film)
+        urls = [url for url in by_url if url]
+        if urls and "" in by_url:
+            by_url[urls[0]].extend(by_url.pop(""))
+        for url, members in by_url.items():
+            first = members[0]
+            works.append(
+                {
+                    "work_key": f"{key[0]}|{key[1]}|{url}",
+                    "titre": first.get("titre", ""),
+                    "realisateur": first.get("realisateur", ""),
+                    "version": first.get("version", ""),
+                    "date": first.get("date", ""),
+                    "recompenses": next((f.get("recompenses") for f in members if f.get("recompenses")), ""),
+                    "enriched": {},
+                    "allocine_url": url,
+                    "screenings": members,
+                }
+            )
+    return works
+
 
-    def _allocine_lookup(title: str, director: str):
-        if not title:
-            return title, director, None, None, ""
+def _fan_out_work(work: dict) -> None:
+    """Recopie les resultats d'une oeuvre sur chacune de ses seances."""
+    for film in work["screenings"]:
+        for key, value in work.items():
+            if key in SCREENING_FIELDS or key == "screenings":
+                continue
+            film[key] = dict(value) if key == "enriched" else value
+        # La bande-annonce TMDB depend de la version (VF/VO) de chaque seance.
+        details = work.get("tmdb_details")
+        videos = work.get("tmdb_videos")
+        if details is not None and videos is not None and film.get("version", "") != work.get("version", ""):
+            film["enriched"]["tmdb_trailer_url"] = tmdb_pick_trailer(videos, film.get("version", ""), details)
+
+
+def _previous_index_keys(titre: str, realisateur: str, allocine_url: str, tmdb_id: str = "") -> list[str]:
+    keys = []
+    if allocine_url:
+        keys.append(f"url:{allocine_url.strip()}")
+    if str(tmdb_id or "").strip():
+        keys.append(f"tmdb:{str(tmdb_id).strip()}")
+    title_key = normalize_for_match(titre)
+    if title_key:
+        keys.append(f"film:{title_key}|{normalize_for_match(realisateur)}")
+    return keys
+
+
+def _previous_entries(enriched_path: Path, programme_path: Path, label: str) -> list[dict]:
+    """Lignes de work/enriched.xlsx du dernier passage puis de data/programme.json."""
+    entries = []
+    if enriched_path.exists():
         try:
-            result = allocine_find_movie(title, director)
-            match = result.get("match")
-            return title, director, result, match, ""
+            previous_df = pd.read_excel(enriched_path, sheet_name=0, dtype=str).fillna("")
+        except Exception as exc:
+            log_step(f"{label}: lecture impossible de {enriched_path} ({exc})")
+            previous_df = pd.DataFrame()
+        for row in previous_df.to_dict("records"):
+            entry = {str(k): str(v).strip() for k, v in row.items()}
+            entry["titre"] = entry.get("Titre", "")
+            entry["realisateur"] = entry.get("Realisateur", "")
+            entries.append(entry)
+    if programme_path.exists():
+        try:
+            items = json.loads(programme_path.read_text(encoding="utf-8"))
         except Exception as exc:
-            return title, director, None, None, str(exc)
+            log_step(f"{label}: lecture impossible de {programme_path} ({exc})")
+            items = []
+        for item in items if isinstance(items, list) else []:
+            entry = dict(item)
+            entry.setdefault("date_sortie", entry.get("annee", ""))
+            entries.append(entry)
+    return entries
+
+
+def _load_previous_index(enriched_path: Path, programme_path: Path) -> dict[str, dict]:
+    """
+    Index des films deja enrichis: work/enriched.xlsx du dernier passage, complete
+    par data/programme.json. Cle par URL Allocine, par id TMDB et par
+    titre|realisateur normalises (titres de sortie, tels qu'ecrits par l'etape 13).
+    """
+    index: dict[str, dict] = {}
+    for entry in _previous_entries(enriched_path, programme_path, "incremental"):
+        if not entry.get("synopsis") or not entry.get("affiche_url"):
+            continue
+        keys = _previous_index_keys(
+            entry.get("titre", ""), entry.get("realisateur", ""), entry.get("allocine_url", ""), entry.get("tmdb_id", "")
+        )
+        for key in keys:
+            index.setdefault(key, entry)
+    return index
+
+
+def _previous_entry_for(
+    work: dict, index: dict[str, dict], identities: Optional[film_index.FilmIndex] = None
+) -> Optional[dict]:
+    """
+    Sortie precedente d'une oeuvre: par URL Allocine de la source ou titre de sortie,
+    sinon par l'identite (URL Allocine, id TMDB) que l'index des films garde sous le
+    titre source, quand celui-ci differe du titre Allocine/TMDB ecrit en sortie.
+    """
+    source_url = work.get("allocine_url", "")
+    keys = _previous_index_keys(work.get("titre", ""), work.get("realisateur", ""), source_url)
+    if identities is not None:
+        identity = identities.lookup(work.get("titre", ""), work.get("realisateur", ""), count=False)
+        if identity is not None:
+            keys += _previous_index_keys("", "", identity.get("allocine_url", ""), identity.get("tmdb_id", ""))
+    for key in keys:
+        entry = index.get(key)
+        if entry is None:
+            continue
+        # Une URL Allocine differente dans la source = film change: on recherche.
+        if source_url and entry.get("allocine_url", "") != source_url:
+            return None
+        return entry
+    return None
 
-    search_groups = {}
-    target_indices = set()
-    for idx, film in enumerate(films):
-        if only_missing and film.get("allocine_url"):
+
+def _apply_previous_entry(film: dict, entry: dict) -> None:
+    """Reprend les champs de sortie d'un enrichissement precedent (etape 11)."""
+    enriched = film["enriched"]
+    backdrops = entry.get("backdrops") or []
+    if isinstance(backdrops, str):
+        try:
+            backdrops = json.loads(backdrops)
+        except Exception:
+            backdrops = []
+    enriched["affiche"] = entry.get("affiche_url", "")
+    enriched["backdrops"] = backdrops
+    enriched["synopsis"] = entry.get("synopsis", "")
+    enriched["genres"] = entry.get("genres", "")
+    enriched["duree_min"] = entry.get("duree_min", "")
+    enriched["pays"] = entry.get("pays", "")
+    enriched["acteurs_principaux"] = entry.get("acteurs_principaux", "")
+    enriched["recompenses"] = entry.get("recompenses", "")
+    enriched["date_sortie"] = entry.get("date_sortie", "")
+    enriched["trailer_url"] = entry.get("trailer_url", "")
+    try:
+        age_min = int(str(entry.get("age_min", "")).strip() or 0)
+    except ValueError:
+        age_min = 0
+    if age_min > 0:
+        enriched["allocine_age_min"] = age_min
+
+
+def _load_film_index(enriched_path: Path, programme_path: Path) -> film_index.FilmIndex:
+    """Index des identites (FILM_INDEX_PATH), amorce depuis les sorties precedentes a la creation."""
+    index = film_index.FilmIndex(FILM_INDEX_PATH, normalize_for_match)
+    if index.load():
+        return index
+    for entry in _previous_entries(enriched_path, programme_path, "index films"):
+        index.record(
+            entry.get("titre", ""),
+            entry.get("realisateur", ""),
+            entry.get("date_sortie", ""),
+            entry.get("allocine_url", ""),
+            entry.get("tmdb_id", ""),
+            replace=False,
+        )
+    log_step(f"index films: amorce avec {len(index)} film(s) deja publie(s) ou enrichi(s)")
+    return index
+
+
+def _apply_film_index(work: dict, index: film_index.FilmIndex) -> bool:
+    """Reprend l'URL Allocine / l'id TMDB connus d'une oeuvre; True si l'oeuvre est identifiee."""
+    entry = index.lookup(work.get("titre", ""), work.get("realisateur", ""))
+    if entry is None:
+        return False
+    source_url = work.get("allocine_url", "")
+    # Une URL Allocine differente dans la source l'emporte: on recherche.
+    if source_url and entry.get("allocine_url") and entry.get("allocine_url") != source_url:
+        return False
+    work["allocine_url"] = source_url or entry.get("allocine_url", "")
+    if entry.get("tmdb_id"):
+        work["tmdb_id"] = entry["tmdb_id"]
+        work["tmdb_lang"] = entry.get("tmdb_lang") or TMDB_LANG_DEFAULT
+    work["film_index"] = True
+    return True
+
+
+def _record_film_index(index: film_index.FilmIndex, films: list[dict]) -> int:
+    """
+    Enregistre l'identite retenue de chaque seance, sous son titre source et son
+    titre de sortie. Le choix de source manuel compte: "a" ne garde que
+    l'URL Allocine, "t" que l'id TMDB, "s" (aucune des deux) n'enregistre rien.
+    """
+    changed = 0
+    for film in films:
+        enriched = film.get("enriched", {})
+        pref = enriched.get("source_preference", "")
+        if pref == "s":
             continue
-        titres = [film.get("titre", "")]
-        if include_tmdb_titles:
-            titres.extend([film.get("tmdb_title", ""), film.get("tmdb_original_title", "")])
+        allocine_url = "" if pref == "t" else film.get("allocine_url", "")
+        tmdb_id = "" if pref == "a" else str(film.get("tmdb_id", "") or "")
+        tmdb_lang = film.get("tmdb_lang", "") if tmdb_id else ""
+        year = enriched.get("date_sortie", "")
+        names = {
+            (film.get("titre", ""), film.get("realisateur", "")),
+            (_canonical_title_for_output(film), _canonical_director_for_output(film)),
+        }
+        for titre, realisateur in names:
+            changed += index.record(titre, realisateur, year, allocine_url, tmdb_id, tmdb_lang)
+    return changed
+
+
+async def _run_enrichment_pipeline(
+    engine: fetch_engine.FetchEngine,
+    films: list[dict],
+    on_done: Optional[Callable[[dict], None]] = None,
+) -> None:
+    """
+    Chaque film avance seul dans ses etapes:
+      Allocine: recherche -> metadonnees -> photos
+      TMDB:     recherche -> details
+      puis rattrapage Allocine avec les titres TMDB, puis secours Google.
+    Les recherches identiques (meme titre/realisateur, meme URL, meme id TMDB)
+    ne partent qu'une fois et leur resultat est partage entre les films.
+    Une oeuvre deja identifiee (work/film_index.json) ne lance aucune recherche:
+    seulement les metadonnees Allocine et les details TMDB.
+    """
+
+    async def _allocine_search(film: dict, titre: str) -> None:
         realisateur = film.get("realisateur", "")
-        for titre in _dedupe_nonempty(titres):
-            key = (titre, realisateur)
-            search_groups.setdefault(key, []).append(idx)
-            target_indices.add(idx)
-
-    futures = []
-    max_workers = min(ALLOCINE_MAX_WORKERS, max(1, len(search_groups)))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for titre, realisateur in search_groups:
-            futures.append(executor.submit(_allocine_lookup, titre, realisateur))
-        for future in as_completed(futures):
-            titre, realisateur, result, match, error = future.result()
-            if not titre:
-                continue
-            if error:
-                log_step(f"allocine: erreur recherche {titre} ({error})")
-                continue
-            if not result:
-                log_step(f"allocine: erreur recherche {titre} (no result)")
-                continue
-            candidates = result.get("candidates") or []
+
+        async def _search():
+            try:
+                result = await engine.call(
+                    "allocine", allocine_find_movie, titre, realisateur, stage="allocine_search"
+                )
+            except Exception as exc:
+                log_step(f"allocine: erreur recherche {titre} ({exc})")
+                return None
+            match = result.get("match")
             if match:
                 log_step(f"allocine: {titre} -> {match.get('url', '')}")
             else:
-                log_step(f"allocine: no match for {titre} ({len(candidates)} candidats)")
-            for idx in search_groups.get((titre, realisateur), []):
-                film = films[idx]
-                if only_missing and film.get("allocine_url"):
-                    continue
-                film["allocine_candidates"] = candidates
-                if match:
-                    film["allocine_url"] = match.get("url", "")
-                    film["allocine_match_query"] = titre
-                    film["allocine_title"] = match.get("title", "")
-                    film["allocine_directors"] = match.get("directors", "")
-                    film["allocine_score"] = match.get("score", 0.0)
-                    film["allocine_title_score"] = match.get("title_score", 0.0)
-                    film["allocine_director_score"] = match.get("director_score", 0.0)
-    # 2) Recuperer metadonnees Allocine (affiche, titre, realisateurs, date)
-    log_step("allocine: recuperer metadonnees (scraping)")
-
-    def _allocine_meta_lookup(allocine_url: str):
-        if not allocine_url:
-            return allocine_url, {}, ""
-        try:
-            meta = allocine_movie_meta(allocine_url)
-            return allocine_url, meta, ""
-        except Exception as exc:
-            return allocine_url, {}, str(exc)
+                log_step(f"allocine: no match for {titre} ({len(result.get('candidates') or [])} candidats)")
+            return result
 
-    url_groups = {}
-    if not only_missing:
-        target_indices = set(range(len(films)))
+        if not titre:
+            return
+        result = await engine.once(("allocine_search", titre, realisateur), _search)
+        if result and not film.get("allocine_url"):
+            _apply_allocine_match(film, titre, result)
 
-    for idx in sorted(target_indices):
-        film = films[idx]
+    async def _allocine_details(film: dict) -> None:
         allocine_url = film.get("allocine_url", "")
-        if allocine_url:
-            url_groups.setdefault(allocine_url, []).append(idx)
-
-    futures = []
-    max_workers = min(ALLOCINE_MAX_WORKERS, max(1, len(url_groups)))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for allocine_url in url_groups:
-            futures.append(executor.submit(_allocine_meta_lookup, allocine_url))
-        for future in as_completed(futures):
-            allocine_url, meta, error = future.result()
-            if not allocine_url:
-                continue
-            if error:
-                log_step(f"allocine: erreur metadonnees {allocine_url} ({error})")
-                continue
-            for idx in url_groups.get(allocine_url, []):
-                film = films[idx]
-                if meta:
-                    if meta.get("affiche"):
-                        film["enriched"]["affiche"] = meta.get("affiche")
-                    if meta.get("allocine_title"):
-                        film["enriched"]["allocine_title"] = meta.get("allocine_title")
-                    if meta.get("allocine_alt_title"):
-                        film["enriched"]["allocine_alt_title"] = meta.get("allocine_alt_title")
-                    if meta.get("allocine_directors"):
-                        film["enriched"]["allocine_directors"] = meta.get("allocine_directors")
-                    if meta.get("allocine_release_date"):
-                        film["enriched"]["allocine_release_date"] = meta.get("allocine_release_date")
-                    if meta.get("allocine_synopsis"):
-                        film["enriched"]["allocine_synopsis"] = meta.get("allocine_synopsis")
-                    if meta.get("allocine_genres"):
-                        film["enriched"]["allocine_genres"] = meta.get("allocine_genres")
-                    if meta.get("allocine_duree_min"):
-                        film["enriched"]["allocine_duree_min"] = meta.get("allocine_duree_min")
-                    if meta.get("allocine_pays"):
-                        film["enriched"]["allocine_pays"] = meta.get("allocine_pays")
-                    if meta.get("allocine_acteurs"):
-                        film["enriched"]["allocine_acteurs"] = meta.get("allocine_acteurs")
-                    if meta.get("allocine_recompenses"):
-                        base_rewards = film.get("recompenses", "")
-                        film["enriched"]["allocine_recompenses"] = _merge_list_pref_allocine(
-                            base_rewards,
-                            meta.get("allocine_recompenses", []),
-                        )
-                    if meta.get("allocine_trailer_url"):
-                        film["enriched"]["allocine_trailer_url"] = meta.get("allocine_trailer_url")
-                    age_min = meta.get("allocine_age_min")
-                    if isinstance(age_min, int) and age_min > 0:
-                        film["enriched"]["allocine_age_min"] = age_min
-                if not film["enriched"].get("allocine_directors"):
-                    fallback_directors = film.get("allocine_directors", "")
-                    if fallback_directors:
-                        film["enriched"]["allocine_directors"] = fallback_directors
-                if not film["enriched"].get("allocine_title"):
-                    fallback_title = film.get("allocine_title", "")
-                    if fallback_title:
-                        film["enriched"]["allocine_title"] = fallback_title
-                if not film["enriched"].get("allocine_recompenses"):
-                    base_rewards = film.get("recompenses", "")
-                    if base_rewards:
-                        film["enriched"]["allocine_recompenses"] = _split_list(base_rewards)
-
-    # 3) Recuperer les photos Allocine
-    log_step("allocine: recuperer photos (scraping)")
-
-    def _allocine_photos_lookup(allocine_url: str, poster_url: str):
-        if not allocine_url:
-            return allocine_url, [], ""
+
+        async def _meta():
+            try:
+                return await engine.call("allocine", allocine_movie_meta, allocine_url, stage="allocine_meta")
+            except Exception as exc:
+                log_step(f"allocine: erreur metadonnees {allocine_url} ({exc})")
+                return None
+
+        meta = await engine.once(("allocine_meta", allocine_url), _meta)
+        if meta is not None:
+            _apply_allocine_meta(film, meta)
+
+        poster_url = film["enriched"].get("affiche", "")
+
+        async def _photos():
+            try:
+                return await engine.call(
+                    "allocine", allocine_photo_urls, allocine_url, poster_url, stage="allocine_photos"
+                )
+            except Exception as exc:
+                log_step(f"allocine: erreur photos {allocine_url} ({exc})")
+                return None
+
+        photos = await engine.once(("allocine_photos", allocine_url), _photos)
+        if photos is not None:
+            film["enriched"]["backdrops"] = photos
+
+    async def _tmdb_search(film: dict) -> None:
+        titre = film.get("titre", "")
+        realisateur = film.get("realisateur", "")
+
+        async def _search():
+            try:
+                found = await engine.call("tmdb", _tmdb_lookup, titre, realisateur, stage="tmdb_search")
+            except Exception as exc:
+                log_step(f"tmdb: erreur recherche {titre} ({exc})")
+                return None
+            result, match, _ = found
+            if match:
+                log_step(f"tmdb: {titre} -> {match.get('id') or ''} ({match.get('title') or ''})")
+            else:
+                log_step(f"tmdb: no match for {titre} ({len(result.get('candidates') or [])} candidats)")
+            return found
+
+        if not titre:
+            return
+        found = await engine.once(("tmdb_search", titre, realisateur), _search)
+        if found:
+            _apply_tmdb_match(film, *found)
+
+    async def _tmdb_details(film: dict) -> None:
+        movie_id = film.get("tmdb_id", "")
+        lang = film.get("tmdb_lang", TMDB_LANG_DEFAULT)
+        credits = film.get("tmdb_credits")
         try:
-            photos = allocine_photo_urls(allocine_url, poster_url)
-            return allocine_url, photos, ""
-        except Exception as exc:
-            return allocine_url, [], str(exc)
+            movie_id_int = int(movie_id)
+        except Exception:
+            return
 
-    photo_targets = {}
-    for idx in sorted(target_indices):
-        film = films[idx]
-        allocine_url = film.get("allocine_url", "")
-        if allocine_url and allocine_url not in photo_targets:
-            photo_targets[allocine_url] = film.get("enriched", {}).get("affiche", "")
-
-    futures = []
-    max_workers = min(ALLOCINE_MAX_WORKERS, max(1, len(photo_targets)))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for allocine_url, poster_url in photo_targets.items():
-            futures.append(executor.submit(_allocine_photos_lookup, allocine_url, poster_url))
-        for future in as_completed(futures):
-            allocine_url, photos, error = future.result()
-            if not allocine_url:
-                continue
-            if error:
-                log_step(f"allocine: erreur photos {allocine_url} ({error})")
-                continue
-            for idx in url_groups.get(allocine_url, []):
-                films[idx]["enriched"]["backdrops"] = photos
+        async def _details():
+            try:
+                return await engine.call(
+                    "tmdb", tmdb_get_movie_bundle, movie_id_int, lang, credits, stage="tmdb_details"
+                )
+            except Exception as exc:
+                log_step(f"tmdb: erreur details {movie_id} ({exc})")
+                return None
+
+        found = await engine.once(("tmdb_details", movie_id_int, lang), _details)
+        if found:
+            _apply_tmdb_details(film, *found)
+
+    async def _film_flow(film: dict) -> None:
+        async def _allocine_branch() -> None:
+            if not film.get("allocine_url") and not film.get("film_index"):
+                await _allocine_search(film, film.get("titre", ""))
+            if film.get("allocine_url"):
+                await _allocine_details(film)
+
+        async def _tmdb_branch() -> None:
+            if not film.get("tmdb_id"):
+                await _tmdb_search(film)
+            if film.get("tmdb_id"):
+                await _tmdb_details(film)
+
+        await asyncio.gather(_allocine_branch(), _tmdb_branch())
+        if film.get("film_index"):
+            return
+
+        # Une recherche Allocine de rattrapage avec les titres TMDB permet de
+        # retrouver les films dont le titre source est approximatif ou en anglais.
+        if not film.get("allocine_url"):
+            titres = _dedupe_nonempty(
+                [film.get("titre", ""), film.get("tmdb_title", ""), film.get("tmdb_original_title", "")]
+            )
+            for titre in titres:
+                await _allocine_search(film, titre)
+                if film.get("allocine_url"):
+                    await _allocine_details(film)
+                    break
+
+        # Dernier recours optionnel: Google Custom Search peut retrouver une
+        # fiche Allocine quand le moteur interne Allocine/TMDB ne propose rien.
+        if not film.get("allocine_url") and not film.get("tmdb_id") and _google_search_enabled():
+            await engine.call("google", _apply_google_match, film, stage="google")
+
+    async def _film_done(film: dict) -> None:
+        await _film_flow(film)
+        if on_done is not None:
+            on_done(film)
+
+    log_step("pipeline: recherches Allocine/TMDB par film (attente/en cours/termines par etape)")
+    reporter = asyncio.ensure_future(
+        engine.report_depth(
+            PIPELINE_REPORT_INTERVAL,
+            log_step,
+            lambda: f"allocine {ALLOCINE_RATE_LIMITER.rate_line()}",
+        )
+    )
+    try:
+        await asyncio.gather(*(_film_done(film) for film in films))
+    finally:
+        reporter.cancel()
+    for line in engine.monitor.summary_lines():
+        log_step(f"pipeline: {line}")
+
+    if not _google_search_enabled() and any(
+        not film.get("allocine_url") and not film.get("tmdb_id") for film in films
+    ):
+        log_step("google: secours web desactive (GOOGLE_API_KEY ou GOOGLE_CX manquant)")
+
+
+async def _run_allocine_player_resolution(engine: fetch_engine.FetchEngine, urls: list[str]) -> dict:
+    """Resout les lecteurs Allocine en parallele (slots "allocine"). Retourne {url lecteur: url video}."""
+
+    async def _resolve(url: str) -> tuple[str, str]:
+        return url, await engine.call("allocine", _resolve_allocine_player_trailer_url, url, stage="allocine_player")
+
+    log_step(f"allocine: resoudre {len(urls)} lecteur(s) de bande-annonce")
+    resolved = dict(await asyncio.gather(*(_resolve(url) for url in urls)))
+    for line in engine.monitor.summary_lines():
+        log_step(f"allocine: {line}")
+    return resolved
+
+
+async def _run_youtube_fallback(engine: fetch_engine.FetchEngine, requests_by_key: dict) -> dict:
+    """
+    Secours YouTube pour tous les films sans bande-annonce exploitable, en
+    parallele (limite par hote "youtube"). Pour un film, les requetes partent
+    dans l'ordre et s'arretent des qu'un resultat atteint
+    YOUTUBE_EARLY_STOP_SCORE; une requete identique pour deux films ne part
+    qu'une fois. Retourne {cle: url}.
+    """
+
+    async def _search(query: str) -> list[dict]:
+        async def _fetch():
+            try:
+                return await engine.call("youtube", _youtube_search_candidates, query, stage="youtube_search")
+            except Exception as exc:
+                log_step(f"youtube: erreur recherche {query} ({exc})")
+                return []
+
+        return await engine.once(("youtube_search", query), _fetch)
+
+    async def _pick(args: dict) -> str:
+        queries = _youtube_search_queries(args["title"], args["year"], args["director"], args["extra_titles"])
+        if not queries:
+            return ""
+        variants = _youtube_pick_variants(args["title"], args["extra_titles"])
+        state = _youtube_pick_state()
+        for query in queries:
+            _youtube_score_candidates(state, await _search(query), variants, args["year"])
+            if _youtube_pick_done(state):
+                break
+        return _youtube_pick_result(state)
+
+    async def _pick_into(key, args: dict, results: dict) -> None:
+        results[key] = await _pick(args)
+
+    results = {}
+    log_step(f"youtube: secours bande-annonce pour {len(requests_by_key)} film(s)")
+    reporter = asyncio.ensure_future(engine.report_depth(PIPELINE_REPORT_INTERVAL, log_step))
+    try:
+        await asyncio.gather(*(_pick_into(key, args, results) for key, args in requests_by_key.items()))
+    finally:
+        reporter.cancel()
+    for line in engine.monitor.summary_lines():
+        log_step(f"youtube: {line}")
+    return results
 
 
-def main(main_window=None) -> int:
+def main(main_window=None, refresh: bool = False, incremental: bool = False, resume: bool = False) -> int:
 
 
     # positionnement de mode_GUI afin de gérer  la selection des films
@@ -2589,9 +3301,14 @@ def main(main_window=None) -> int:
         mode_Gui=True
         window=main_window
 
+    # --refresh: ignorer le cache HTTP (les reponses recuperees le remettent a jour)
+    HTTP_CACHE.refresh = refresh
+
     # Charger l'environnement (.env) pour utiliser les clés API de Google et TMDB
     env_path = root/ ".env"
     load_env_file(env_path)
+    backend = similarity.set_backend(os.environ.get(similarity.SIMILARITY_BACKEND_ENV, ""))
+    log_step(f"similarite: moteur {backend}")
 
 
     # Charger work/normalized.xlsx
@@ -2603,11 +3320,14 @@ def main(main_window=None) -> int:
     if columns:
         log_step(f"colonnes detectees: {', '.join(columns)}")
 
+    # Colonnes nettoyees en une passe (une conversion par valeur distincte)
+    values = {col: map_unique(lambda value: str(value).strip(), column_values(df, col)) for col in columns}
+    values["Date"] = map_unique(lambda value: pd.to_datetime(value).strftime("%Y-%m-%d"), values["Date"])
+
     # 4) Pour chaque film (chaque ligne)
     films = []
-    for _, row in df.iterrows():
-        row_data = {col: str(row.get(col, "")).strip() for col in columns}
-        row_data['Date']=pd.to_datetime(row_data['Date']).strftime("%Y-%m-%d")
+    for row in zip(*(values[col] for col in columns)):
+        row_data = dict(zip(columns, row))
         date = row_data.get("Date", "")
         heure = row_data.get("Heure", "")
         titre = row_data.get("Titre", "")
@@ -2644,25 +3364,84 @@ def main(main_window=None) -> int:
         }
         films.append(film_info)
 
-    # 5) rechercher les films,synopsis,Bande Annonce, etc...  sur allociné
-    get_movies_from_allociné(films, only_missing=True)
-
-    # 6) rechercher les films,synopsis,Bande Annonce, etc...  sur TMDB
-    get_movies_from_tmdb(films)
+    # Une oeuvre par film: recherches, controle et choix de source ne sont
+    # faits qu'une fois, puis les resultats sont recopies sur chaque seance.
+    works = _group_screenings_into_works(films)
+    log_step(f"films: {len(films)} seance(s) -> {len(works)} oeuvre(s)")
+
+    # --incremental: reprendre les films deja enrichis (enriched.xlsx precedent,
+    # data/programme.json); seuls les films nouveaux ou modifies sont recherches.
+    # Index des identites (work/film_index.json): titres source et de sortie.
+    identities = _load_film_index(root / "work/enriched.xlsx", PROGRAMME_JSON_PATH)
+
+    to_fetch = works
+    if incremental:
+        previous_index = _load_previous_index(root / "work/enriched.xlsx", PROGRAMME_JSON_PATH)
+        for work in works:
+            entry = _previous_entry_for(work, previous_index, identities)
+            if entry is not None:
+                work["previous"] = entry
+                work["allocine_url"] = entry.get("allocine_url", "")
+                work["tmdb_id"] = str(entry.get("tmdb_id", "") or "")
+        to_fetch = [work for work in works if not work.get("previous")]
+        log_step(
+            f"incremental: {len(works) - len(to_fetch)} oeuvre(s) reprise(s), "
+            f"{len(to_fetch)} a rechercher"
+        )
 
-    # 6b) Une recherche Allocine de rattrapage avec les titres TMDB permet de
-    # retrouver les films dont le titre source est approximatif ou en anglais.
-    if any(not film.get("allocine_url") and (film.get("tmdb_title") or film.get("tmdb_original_title")) for film in films):
-        get_movies_from_allociné(films, only_missing=True, include_tmdb_titles=True)
+    # Points de reprise: chaque oeuvre recherchee, chaque choix de source et
+    # chaque seance fusionnee est ecrit dans work/enrich_checkpoint.jsonl.
+    # --resume repart de ce fichier s'il correspond au meme normalized.xlsx.
+    checkpoint = enrich_checkpoint.Checkpoint(
+        CHECKPOINT_PATH,
+        enrich_checkpoint.data_signature([columns, df.values.tolist()]),
+    )
+    if checkpoint.start(resume):
+        log_step(
+            f"reprise: {checkpoint.count('fetch')} oeuvre(s) recherchee(s), "
+            f"{checkpoint.count('check')} controle(s), {checkpoint.count('merge')} seance(s) fusionnee(s)"
+        )
+    elif resume:
+        log_step(f"reprise: aucun point de reprise pour ce fichier ({CHECKPOINT_PATH}), depart de zero")
+
+    pending = []
+    for work in to_fetch:
+        saved = checkpoint.get("fetch", work["work_key"])
+        if saved is None:
+            pending.append(work)
+        else:
+            work.update(saved)
+
+    # Les oeuvres deja connues de l'index des films (titre + realisateur)
+    # passent directement aux metadonnees, sans recherche.
+    identified = sum(1 for work in pending if _apply_film_index(work, identities))
+    log_step(f"index films: {identified} oeuvre(s) identifiee(s), {len(pending) - identified} a rechercher")
+
+    def _checkpoint_work(work: dict) -> None:
+        checkpoint.record(
+            "fetch",
+            work["work_key"],
+            {key: value for key, value in work.items() if key not in ("screenings", "work_key")},
+        )
 
-    # 6c) Dernier recours optionnel: Google Custom Search peut retrouver une
-    # fiche Allocine quand le moteur interne Allocine/TMDB ne propose rien.
-    get_movies_from_google(films)
+    # 5) 6) 10) Recherches Allocine, TMDB (recherche + details) et secours Google,
+    # oeuvre par oeuvre dans une seule boucle asyncio (voir _run_enrichment_pipeline)
+    fetch_engine.run(
+        lambda engine: _run_enrichment_pipeline(engine, pending, _checkpoint_work),
+        FETCH_HOST_LIMITS,
+    )
 
-    # 7) Verifier correspondance Allocine/TMDB
+    # 7) Verifier correspondance Allocine/TMDB. Un choix de source deja fait pour
+    # le meme couple de fiches (URL Allocine + id TMDB) est rejoue; les autres
+    # desaccords sont arbitres ensemble, en un seul ecran, a la fin de l'etape.
     log_step("allocine/tmdb: verifier correspondance")
 
-    for film in films:
+    reviews = []
+    for film in to_fetch:
+        saved = checkpoint.get("check", film["work_key"])
+        if saved is not None:
+            film["enriched"] = saved
+            continue
         allocine_meta = film.get("enriched", {})
         tmdb_meta = {
             "tmdb_title": film.get("tmdb_title", ""),
@@ -2688,82 +3467,72 @@ def main(main_window=None) -> int:
                 f"director={result.get('director_score', 0):.2f}, "
                 f"date_match={date_match})"
             )
-
-            print(f'mode_gui: {mode_Gui}')
-            if mode_Gui:
-                choice = _gui_prompt_source_choice(film, allocine_meta, tmdb_meta, result)
-            else:
-                choice = _prompt_source_choice(film, allocine_meta, tmdb_meta, result)
+            choice = identities.choice_for(film.get("allocine_url", ""), film.get("tmdb_id", ""))
+            if not choice:
+                reviews.append(
+                    {"film": film, "allocine_meta": allocine_meta, "tmdb_meta": tmdb_meta, "match_info": result}
+                )
+                continue
+            log_step(f"allocine/tmdb: choix deja fait '{choice}' pour {film.get('titre', '')}")
             film["enriched"]["source_preference"] = choice
+        checkpoint.record("check", film["work_key"], film["enriched"])
+
+    if reviews:
+        log_step(f"allocine/tmdb: {len(reviews)} desaccord(s) a arbitrer")
+        # Sans reponse (None): Skip dans l'interface, merge en ligne de
+        # commande, pour ce passage seulement. Seuls les choix explicites
+        # sont memorises.
+        if mode_Gui:
+            choices = _gui_review_source_choices(reviews)
+            default_choice = "s"
+        else:
+            choices = _prompt_source_choices(reviews)
+            default_choice = "m"
+        for review, choice in zip(reviews, choices):
+            film = review["film"]
+            if choice:
+                identities.record_choice(film.get("allocine_url", ""), film.get("tmdb_id", ""), choice)
+            film["enriched"]["source_preference"] = choice or default_choice
+            checkpoint.record("check", film["work_key"], film["enriched"])
+        # Les choix sont gardes tout de suite: un arret plus loin ne les perd pas.
+        identities.save()
+
+    for work in works:
+        _fan_out_work(work)
 
-    # 10) Recuperer details TMDB (synopsis, genres, pays, duree, acteurs, trailers)
-    log_step("tmdb: recuperer details (synopsis, genres, pays, duree, acteurs, trailers)")
-    def _tmdb_details_lookup(idx: int, movie_id: str, lang: str):
-        if not movie_id:
-            return idx, movie_id, {}, {}, {}, {}, ""
-        try:
-            movie_id_int = int(movie_id)
-        except Exception:
-            return idx, movie_id, {}, {}, {}, {}, ""
-        try:
-            details = tmdb_get_details(movie_id_int, lang)
-            credits = tmdb_get_credits(movie_id_int, lang)
-            release_dates = tmdb_get_release_dates(movie_id_int)
-            videos = tmdb_get_videos(movie_id_int, lang)
-            return idx, movie_id, details, credits, release_dates, videos, ""
-        except Exception as exc:
-            return idx, movie_id, {}, {}, {}, {}, str(exc)
-
-    futures = []
-    max_workers = min(TMDB_MAX_WORKERS, max(1, len(films)))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for idx, film in enumerate(films):
-            movie_id = film.get("tmdb_id", "")
-            lang = film.get("tmdb_lang", TMDB_LANG_DEFAULT)
-            futures.append(executor.submit(_tmdb_details_lookup, idx, movie_id, lang))
-        for future in as_completed(futures):
-            idx, movie_id, details, credits, release_dates, videos, error = future.result()
-            film = films[idx]
-            if not movie_id:
-                continue
-            if error:
-                log_step(f"tmdb: erreur details {movie_id} ({error})")
-                continue
-            synopsis = details.get("overview") or ""
-            genres = [g.get("name") for g in (details.get("genres") or []) if g.get("name")]
-            runtime = details.get("runtime") or 0
-            countries = _normalize_country_names(
-                [c.get("name") for c in (details.get("production_countries") or []) if c.get("name")]
-            )
-            cast = tmdb_extract_main_cast(credits)
-            trailer_url = tmdb_pick_trailer(videos, film.get("version", ""), details)
-            backdrop_path = str(details.get("backdrop_path") or "").strip()
-            poster_path = str(details.get("poster_path") or "").strip()
-            tmdb_backdrops = []
-            tmdb_affiche = ""
-            if backdrop_path:
-                tmdb_backdrops = [f"https://image.tmdb.org/t/p/original{backdrop_path}"]
-            if poster_path:
-                tmdb_affiche = f"https://image.tmdb.org/t/p/w780{poster_path}"
-            film["enriched"]["tmdb_synopsis"] = synopsis
-            film["enriched"]["tmdb_genres"] = genres
-            film["enriched"]["tmdb_duree_min"] = str(runtime) if runtime else ""
-            film["enriched"]["tmdb_pays"] = ", ".join(countries)
-            film["enriched"]["tmdb_acteurs"] = ", ".join(cast)
-            film["enriched"]["tmdb_recompenses"] = []
-            film["enriched"]["tmdb_trailer_url"] = trailer_url
-            film["enriched"]["tmdb_backdrops"] = tmdb_backdrops
-            film["enriched"]["tmdb_affiche"] = tmdb_affiche
-            fr_date = tmdb_release_date_fr(release_dates)
-            if fr_date:
-                film["tmdb_release_date"] = fr_date
-            elif details.get("release_date"):
-                film["tmdb_release_date"] = details.get("release_date") or film.get("tmdb_release_date", "")
     # 11) Choisir la source et fusionner pour les champs principaux
     log_step("fusion: choisir source pour synopsis/genres/duree/pays/acteurs/recompenses")
-    youtube_cache = {}
-    allocine_trailer_cache = {}
-    for film in films:
+    # Lecteurs Allocine a resoudre (page du lecteur -> MP4): une etape
+    # parallele sous le limiteur Allocine, avant la boucle de fusion.
+    player_urls = []
+    for idx, film in enumerate(films):
+        if film.get("previous") or checkpoint.get("merge", str(idx)) is not None:
+            continue
+        enriched = film.get("enriched", {})
+        trailer_url = _preferred_trailer_url(
+            enriched.get("source_preference", ""),
+            enriched.get("allocine_trailer_url", ""),
+            enriched.get("tmdb_trailer_url", ""),
+        )
+        if _is_allocine_player_trailer_url(trailer_url) and trailer_url not in player_urls:
+            player_urls.append(trailer_url)
+    allocine_trailer_urls = {}
+    if player_urls:
+        allocine_trailer_urls = fetch_engine.run(
+            lambda engine: _run_allocine_player_resolution(engine, player_urls),
+            FETCH_HOST_LIMITS,
+        )
+
+    youtube_requests = {}
+    youtube_pending = []
+    for idx, film in enumerate(films):
+        if film.get("previous"):
+            _apply_previous_entry(film, film["previous"])
+            continue
+        saved = checkpoint.get("merge", str(idx))
+        if saved is not None:
+            film["enriched"] = saved
+            continue
         enriched = film.get("enriched", {})
         pref = enriched.get("source_preference", "")
         allocine_pays = enriched.get("allocine_pays", "")
@@ -2779,7 +3548,6 @@ def main(main_window=None) -> int:
             pays = []
             acteurs = []
             recompenses = []
-            trailer_url = ""
         elif pref == "t":
             synopsis = enriched.get("tmdb_synopsis", "")
             genres = enriched.get("tmdb_genres", [])
@@ -2787,7 +3555,6 @@ def main(main_window=None) -> int:
             pays = tmdb_pays or ""
             acteurs = tmdb_acteurs or ""
             recompenses = enriched.get("tmdb_recompenses", [])
-            trailer_url = tmdb_trailer or ""
         elif pref == "a":
             synopsis = enriched.get("allocine_synopsis", "")
             genres = enriched.get("allocine_genres", [])
@@ -2795,7 +3562,6 @@ def main(main_window=None) -> int:
             pays = allocine_pays or ""
             acteurs = allocine_acteurs or ""
             recompenses = enriched.get("allocine_recompenses", [])
-            trailer_url = allocine_trailer or ""
         elif pref == "m":
             synopsis = enriched.get("allocine_synopsis", "") or enriched.get("tmdb_synopsis", "")
             genres = _merge_list_pref_allocine(
@@ -2809,7 +3575,6 @@ def main(main_window=None) -> int:
                 enriched.get("allocine_recompenses", []),
                 enriched.get("tmdb_recompenses", []),
             )
-            trailer_url = allocine_trailer or tmdb_trailer or ""
         else:
             synopsis = enriched.get("allocine_synopsis", "") or enriched.get("tmdb_synopsis", "")
             genres = enriched.get("allocine_genres", []) or enriched.get("tmdb_genres", [])
@@ -2817,17 +3582,15 @@ def main(main_window=None) -> int:
             pays = allocine_pays or tmdb_pays or ""
             acteurs = allocine_acteurs or tmdb_acteurs or ""
             recompenses = enriched.get("allocine_recompenses", []) or enriched.get("tmdb_recompenses", [])
-            trailer_url = tmdb_trailer or allocine_trailer or ""
 
         if not enriched.get("affiche") and enriched.get("tmdb_affiche"):
             enriched["affiche"] = enriched.get("tmdb_affiche")
         if not enriched.get("backdrops") and enriched.get("tmdb_backdrops"):
             enriched["backdrops"] = enriched.get("tmdb_backdrops")
 
+        trailer_url = _preferred_trailer_url(pref, allocine_trailer, tmdb_trailer)
         if _is_allocine_player_trailer_url(trailer_url):
-            if trailer_url not in allocine_trailer_cache:
-                allocine_trailer_cache[trailer_url] = _resolve_allocine_player_trailer_url(trailer_url)
-            resolved_trailer_url = allocine_trailer_cache.get(trailer_url, "")
+            resolved_trailer_url = allocine_trailer_urls.get(trailer_url, "")
             if resolved_trailer_url:
                 trailer_url = resolved_trailer_url
 
@@ -2852,17 +3615,11 @@ def main(main_window=None) -> int:
                 normalize_for_match(director),
                 normalize_for_match(" ".join(extra_titles)),
             )
-            if cache_key not in youtube_cache:
-                youtube_cache[cache_key] = youtube_pick_trailer(
-                    title=title,
-                    year=release_year,
-                    director=director,
-                    extra_titles=extra_titles,
-                )
-            youtube_url = youtube_cache.get(cache_key, "")
-            if youtube_url:
-                trailer_url = youtube_url
-                log_step(f"youtube: trailer fallback {title} -> {trailer_url}")
+            youtube_requests.setdefault(
+                cache_key,
+                {"title": title, "year": release_year, "director": director, "extra_titles": extra_titles},
+            )
+            youtube_pending.append((idx, cache_key, enriched))
 
         enriched["synopsis"] = synopsis
         enriched["genres"] = genres
@@ -2874,6 +3631,22 @@ def main(main_window=None) -> int:
             enriched.get("allocine_release_date") or film.get("tmdb_release_date", "")
         )
         enriched["trailer_url"] = trailer_url
+        if not should_try_youtube:
+            checkpoint.record("merge", str(idx), enriched)
+
+    # Secours YouTube en une etape parallele sur tous les films concernes
+    # (leur point de reprise "merge" est ecrit une fois la recherche faite).
+    if youtube_requests:
+        youtube_urls = fetch_engine.run(
+            lambda engine: _run_youtube_fallback(engine, youtube_requests),
+            FETCH_HOST_LIMITS,
+        )
+        for idx, cache_key, enriched in youtube_pending:
+            youtube_url = youtube_urls.get(cache_key, "")
+            if youtube_url:
+                enriched["trailer_url"] = youtube_url
+                log_step(f"youtube: trailer fallback {films[idx].get('titre', '')} -> {youtube_url}")
+            checkpoint.record("merge", str(idx), enriched)
 
     # 12) Ajouter l'age conseille JP dans le commentaire quand disponible
     log_step("jp: detecter age conseille")
@@ -2928,6 +3701,7 @@ def main(main_window=None) -> int:
             row_data["annee"] = row_data.get("date_sortie")
         row_data["trailer_url"] = enriched.get("trailer_url", "")
         row_data["allocine_url"] = film.get("allocine_url", "")
+        row_data["tmdb_id"] = str(film.get("tmdb_id", "") or "")
         backdrops = enriched.get("backdrops", [])
         row_data["backdrops"] = json.dumps(backdrops, ensure_ascii=False) if backdrops else ""
         out_rows.append(row_data)
@@ -2955,6 +3729,8 @@ def main(main_window=None) -> int:
         out_df["trailer_url"] = ""
     if "allocine_url" not in out_df.columns:
         out_df["allocine_url"] = ""
+    if "tmdb_id" not in out_df.columns:
+        out_df["tmdb_id"] = ""
     if "backdrops" not in out_df.columns:
         out_df["backdrops"] = ""
     ordered = list(columns)
@@ -2980,6 +3756,8 @@ def main(main_window=None) -> int:
         ordered.append("trailer_url")
     if "allocine_url" not in ordered:
         ordered.append("allocine_url")
+    if "tmdb_id" not in ordered:
+        ordered.append("tmdb_id")
     if "backdrops" not in ordered:
         ordered.append("backdrops")
     for col in ordered:
@@ -3001,11 +3779,63 @@ def main(main_window=None) -> int:
         log_step(f"rapport: {report['issue_count']} fiche(s) a verifier dans {ENRICHMENT_REPORT_PATH}")
     else:
         log_step(f"rapport: aucun probleme detecte dans {ENRICHMENT_REPORT_PATH}")
+    _record_film_index(identities, films)
+    identities.save()
+    log_step(identities.stats_line())
+    checkpoint.discard()
     _open_report_for_reading(ENRICHMENT_REPORT_PATH)
+    log_step(HTTP_CACHE.stats_line())
+    log_step(TMDB_CREDITS_MEMO.stats_line())
+    log_step(ALLOCINE_FICHE_MEMO.stats_line())
+    log_step(_match_cache_stats_line())
+    # Les fiches gardent le HTML complet: on les libere (processus GUI longue duree).
+    ALLOCINE_FICHE_MEMO.clear()
+    log_step(f"allocine: debit {ALLOCINE_RATE_LIMITER.stats_line()}")
 
     return 0
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Enrichit work/normalized.xlsx (Allocine, TMDB, YouTube) vers work/enriched.xlsx."
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore le cache HTTP (work/http_cache.sqlite) et retelecharge toutes les pages.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reprend les films deja enrichis (work/enriched.xlsx, data/programme.json) sans les rechercher.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprend un enrichissement interrompu depuis work/enrich_checkpoint.jsonl.",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FIXTURES",
+        help=(
+            "Enregistre toutes les reponses Allocine/TMDB/YouTube/Google dans une archive "
+            "(ex: work/fixtures/enrich.jsonl.gz) pour bench_enrich.py. Desactive le cache HTTP."
+        ),
+    )
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    args = parse_args()
+    if not args.record:
+        raise SystemExit(main(refresh=args.refresh, incremental=args.incremental, resume=args.resume))
+    # --record: passage reel, sans cache, dont chaque reponse est archivee
+    fixtures = http_replay.FixtureArchive(Path(args.record))
+    http_replay.install(sys.modules[__name__], fixtures)
+    HTTP_CACHE.enabled = False
+    try:
+        exit_code = main(incremental=args.incremental, resume=args.resume)
+    finally:
+        fixtures.save()
+        log_step(f"record: {len(fixtures.entries)} reponse(s) dans {fixtures.path}")
+    raise SystemExit(exit_code)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+enrich_checkpoint.py
+Points de reprise de l'enrichissement (JSON lines dans outils/work/).
+
+- Premiere ligne: empreinte du contenu d'entree (lignes de work/normalized.xlsx).
+  Un fichier de reprise fait pour une autre entree est ignore.
+- Une ligne par etape terminee: {"stage": ..., "key": ..., "data": ...}.
+  Etapes utilisees par enrich_3_0.py: fetch (par oeuvre), check (par oeuvre,
+  apres le choix de source), merge (par seance).
+- Chaque ligne est ecrite et videe sur disque immediatement: un arret brutal
+  ne perd que l'etape en cours. Une derniere ligne tronquee est ignoree et
+  retiree du fichier a la reprise, avant d'ecrire les nouvelles lignes.
+- Le fichier est supprime quand l'enrichissement se termine normalement.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+
+
+def data_signature(value: Any) -> str:
+    """Empreinte du contenu d'entree (pas du fichier: openpyxl y ecrit la date)."""
+    raw = json.dumps(value, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Checkpoint:
+    def __init__(self, path: Path, signature: str):
+        self.path = Path(path)
+        self.signature = signature
+        self._entries: dict[tuple[str, str], Any] = {}
+        self._lock = Lock()
+        self._handle = None
+        # taille du fichier jusqu'a la derniere ligne complete (fin de ligne comprise)
+        self._complete_size = 0
+
+    def load(self) -> bool:
+        """Charge un fichier de reprise compatible. Retourne False s'il n'y en a pas."""
+        self._entries = {}
+        if not self.path.exists():
+            return False
+        content = self.path.read_bytes()
+        self._complete_size = content.rfind(b"\n") + 1
+        lines = content[: self._complete_size].decode("utf-8", "replace").splitlines()
+        if not lines:
+            return False
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return False
+        if header.get("signature") != self.signature:
+            return False
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._entries[(record.get("stage", ""), record.get("key", ""))] = record.get("data")
+        return True
+
+    def start(self, resume: bool) -> bool:
+        """Ouvre le fichier en ecriture; repart de zero sauf reprise compatible."""
+        resumed = resume and self.load()
+        if not resumed:
+            self._entries = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resumed:
+            # Ligne tronquee par un arret brutal: retiree, sinon la ligne
+            # suivante s'y colle et serait illisible a la prochaine reprise.
+            with self.path.open("r+b") as handle:
+                handle.truncate(self._complete_size)
+        self._handle = self.path.open("a" if resumed else "w", encoding="utf-8")
+        if not resumed:
+            self._write({"signature": self.signature})
+        return resumed
+
+    def _write(self, payload: dict) -> None:
+        self._handle.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+        self._handle.flush()
+
+    def get(self, stage: str, key: str) -> Optional[Any]:
+        return self._entries.get((stage, key))
+
+    def count(self, stage: str) -> int:
+        return sum(1 for entry_stage, _ in self._entries if entry_stage == stage)
+
+    def record(self, stage: str, key: str, data: Any) -> None:
+        with self._lock:
+            self._entries[(stage, key)] = data
+            if self._handle is not None:
+                self._write({"stage": stage, "key": key, "data": data})
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def discard(self) -> None:
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
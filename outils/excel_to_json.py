@@ -22,6 +22,8 @@ import pandas as pd
 import re
 import unicodedata
 
+from columnar import column_values, map_unique
+
 # Emplacements
 BASE_DIR = Path(__file__).resolve().parent
 IN_XLSX  = BASE_DIR / "work/enriched.xlsx"
@@ -137,45 +139,45 @@ def load_existing() -> list:
             pass
     return []
 
-def row_to_obj(r: pd.Series) -> dict:
+JSON_LIST_FIELDS = {"backdrops", "courts_metrages"}
+
+def parse_json_list(value) -> list:
+    s = safe_str(value)
+    if s and s.lstrip().startswith("["):
+        try:
+            return json.loads(s)
+        except Exception:
+            return []
+    return []
+
+def rows_to_objs(df: pd.DataFrame) -> list:
     """
-    Convertit une ligne pandas -> dict pour JSON, avec gestion case-insensible.
+    Convertit les lignes pandas -> dicts pour JSON, colonne par colonne
+    (gestion case-insensible des noms de colonnes, chaque valeur distincte
+    n'est convertie qu'une fois).
     """
-    # dictionnaire "clé minuscule -> valeur"
-    raw = {}
-    try:
-        raw = {str(k).strip().lower(): r[k] for k in r.index}
-    except Exception:
-        for k in r.index:
-            try:
-                raw[str(k).strip().lower()] = r[k]
-            except Exception:
-                pass
-
-    obj = {}
-    json_list_fields = {"backdrops", "courts_metrages"}
+    # nom de colonne en minuscules -> colonne (la derniere l'emporte)
+    lower_columns = {str(k).strip().lower(): k for k in df.columns}
 
+    fields = []
     for k in FIELDS_TO_KEEP:
-        if k in json_list_fields:
-            val = r.get(k, "")
-            if val == "" and "backdrops" not in r and "backdrops" in raw:
-                val = raw.get(k.lower(), "")
-            s = safe_str(val)
-            if s and s.lstrip().startswith("["):
-                try:
-                    obj[k] = json.loads(s)
-                except Exception:
-                    obj[k] = []
-            else:
-                obj[k] = []
+        fallback = lower_columns.get(k.lower())
+        fallback_values = column_values(df, fallback, "") if fallback is not None else None
+
+        if k in JSON_LIST_FIELDS:
+            values = column_values(df, k, "")
+            if fallback_values is not None and "backdrops" in lower_columns and "backdrops" not in df.columns:
+                values = [fb if v == "" else v for v, fb in zip(values, fallback_values)]
+            fields.append(map_unique(parse_json_list, values))
             continue
 
-        v = r.get(k, None)
-        if v is None:
-            v = raw.get(k.lower(), "")
-        obj[k] = safe_str(v)
+        values = column_values(df, k, None)
+        if fallback_values is None:
+            fallback_values = [""] * len(df)
+        values = [fb if v is None else v for v, fb in zip(values, fallback_values)]
+        fields.append(map_unique(safe_str, values))
 
-    return obj
+    return [dict(zip(FIELDS_TO_KEEP, values)) for values in zip(*fields)]
 
 def drop_past(items: list, mode: str) -> list:
     """
@@ -218,9 +220,14 @@ def main():
             merged[make_key(x)] = x
 
     # 2) Ajouter / ecraser avec les lignes publiables de l'Excel
-    for _, r in df.iterrows():
-        obj = row_to_obj(r)
-        if is_school_screening(obj):
+    objs = rows_to_objs(df)
+    school = map_unique(
+        lambda categorie, titre: is_school_screening({"categorie": categorie, "titre": titre}),
+        [obj["categorie"] for obj in objs],
+        [obj["titre"] for obj in objs],
+    )
+    for obj, is_school in zip(objs, school):
+        if is_school:
             skipped_excel_school += 1
             continue
         merged[make_key(obj)] = obj
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+fetch_engine.py
+Moteur asyncio pour les recherches de l'enrichissement.
+
+- Une seule boucle d'evenements pour toutes les taches Allocine, TMDB et YouTube.
+- Limite de concurrence par hote (semaphore par hote).
+- Les clients HTTP restent synchrones (requests.Session dans enrich_3_0.py):
+  chaque appel tourne dans un thread de travail. Remplacer les sessions du module
+  par n'importe quel objet exposant .get() suffit pour travailler hors ligne.
+- TokenBucket: limiteur de debit partage entre threads.
+- AdaptiveTokenBucket: TokenBucket AIMD (utilise pour Allocine): le debit monte
+  doucement tant que les reponses sont propres, est divise et mis en pause pour
+  tous les threads a la premiere reponse 429/5xx ou Retry-After.
+- SharedMemo: memo partage entre threads, un seul calcul par cle meme en parallele.
+- StageMonitor: profondeur de file et temps passe par etape du pipeline.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+
+
+class TokenBucket:
+    """Limiteur de debit partage entre threads: `rate` jetons par seconde, `burst` au maximum."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + (elapsed * self.rate))
+            self._updated_at = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Debit additif-croissant / multiplicatif-decroissant (AIMD).
+    - success(): +increase jeton/s, borne par max_rate.
+    - throttle(pause): debit * decrease (borne par min_rate) et pause globale de
+      `pause` secondes. Les refus recus pendant `cooldown` apres une baisse
+      (requetes deja parties) prolongent la pause sans rebaisser le debit.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        decrease: float = 0.5,
+        cooldown: float = 2.0,
+        burst: float = 1.0,
+    ):
+        super().__init__(rate, burst)
+        self.initial_rate = self.rate
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.cooldown = float(cooldown)
+        self.throttles = 0
+        self.lowest_rate = self.rate
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.rate = self.initial_rate
+            self.lowest_rate = self.rate
+            self.throttles = 0
+            self._tokens = self.burst
+            self._updated_at = time.monotonic()
+            self._paused_until = 0.0
+            self._last_decrease = float("-inf")
+
+    def success(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttle(self, pause: float = 0.0) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.throttles += 1
+            if now - self._last_decrease >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self.lowest_rate = min(self.lowest_rate, self.rate)
+                self._last_decrease = now
+            self._tokens = 0.0
+            self._updated_at = max(now, self._updated_at)
+            self._paused_until = max(self._paused_until, now + max(0.0, pause))
+
+    def rate_line(self) -> str:
+        return f"{self.rate:.2f} req/s"
+
+    def stats_line(self) -> str:
+        return (
+            f"{self.rate:.2f} req/s en fin de passage (min {self.lowest_rate:.2f}), "
+            f"{self.throttles} refus/ralentissement(s)"
+        )
+
+
+class SharedMemo:
+    """
+    Memo de processus partage entre threads. Le premier appelant d'une cle
+    calcule la valeur; les appelants concurrents attendent ce meme calcul.
+    Une erreur n'est pas memorisee: l'appel suivant retente.
+    """
+
+    def __init__(self, label: str):
+        self.label = label
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._entries: dict[Any, Future] = {}
+
+    def get(self, key: Any, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                owner = False
+            else:
+                self.misses += 1
+                entry = Future()
+                self._entries[key] = entry
+                owner = True
+        if not owner:
+            return entry.result()
+        try:
+            value = compute()
+        except BaseException as exc:
+            with self._lock:
+                self._entries.pop(key, None)
+            entry.set_exception(exc)
+            raise
+        entry.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats_line(self) -> str:
+        return f"{self.label}: {self.hits} hit(s), {self.misses} miss(es), {len(self._entries)} entree(s)"
+
+
+class StageMonitor:
+    """Compteurs par etape: en attente d'un slot, en cours, termines, temps cumule."""
+
+    def __init__(self):
+        self._stages: dict[str, dict[str, float]] = {}
+
+    def _stage(self, stage: str) -> dict[str, float]:
+        if stage not in self._stages:
+            self._stages[stage] = {"queued": 0, "running": 0, "done": 0, "busy": 0.0, "cpu": 0.0, "max_queued": 0}
+        return self._stages[stage]
+
+    def queued(self, stage: str) -> None:
+        stats = self._stage(stage)
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+
+    def started(self, stage: str) -> None:
+        stats = self._stage(stage)
+        stats["queued"] -= 1
+        stats["running"] += 1
+
+    def finished(self, stage: str, elapsed: float, cpu: float = 0.0) -> None:
+        stats = self._stage(stage)
+        stats["running"] -= 1
+        stats["done"] += 1
+        stats["busy"] += elapsed
+        stats["cpu"] += cpu
+
+    def depth_line(self) -> str:
+        parts = [
+            f"{stage} {int(stats['queued'])}/{int(stats['running'])}/{int(stats['done'])}"
+            for stage, stats in self._stages.items()
+            if stats["queued"] or stats["running"]
+        ]
+        return " | ".join(parts)
+
+    def summary_lines(self) -> list[str]:
+        return [
+            f"{stage}: {int(stats['done'])} tache(s), {stats['busy']:.1f}s cumulees "
+            f"(cpu {stats['cpu']:.2f}s), file max {int(stats['max_queued'])}"
+            for stage, stats in self._stages.items()
+        ]
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        return {stage: dict(stats) for stage, stats in self._stages.items()}
+
+
+class FetchEngine:
+    """Execute des fonctions bloquantes dans des threads, sous une limite par hote."""
+
+    def __init__(self, host_limits: dict[str, int]):
+        self.host_limits = dict(host_limits)
+        self.monitor = StageMonitor()
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._shared: dict[Any, asyncio.Future] = {}
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(max(1, self.host_limits.get(host, 1)))
+        return self._semaphores[host]
+
+    async def call(self, host: str, fn: Callable[..., Any], *args, stage: str = "") -> Any:
+        stage = stage or host
+        self.monitor.queued(stage)
+        cpu = [0.0]
+
+        def _timed():
+            started_cpu = time.thread_time()
+            try:
+                return fn(*args)
+            finally:
+                cpu[0] = time.thread_time() - started_cpu
+
+        async with self._semaphore(host):
+            self.monitor.started(stage)
+            started_at = time.perf_counter()
+            try:
+                return await asyncio.to_thread(_timed)
+            finally:
+                self.monitor.finished(stage, time.perf_counter() - started_at, cpu[0])
+
+    def once(self, key: Any, factory: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """Une seule tache par cle: les appelants suivants attendent le meme resultat."""
+        if key not in self._shared:
+            self._shared[key] = asyncio.ensure_future(factory())
+        return self._shared[key]
+
+    async def report_depth(
+        self,
+        interval: float,
+        log: Callable[[str], None],
+        status: Optional[Callable[[], str]] = None,
+    ) -> None:
+        """Journalise la profondeur des files (attente/en cours/termines) jusqu'a annulation."""
+        while True:
+            await asyncio.sleep(interval)
+            line = self.monitor.depth_line()
+            if line:
+                if status is not None:
+                    line = f"{line} | {status()}"
+                log(f"pipeline: {line}")
+
+    async def map_unordered(
+        self,
+        host: str,
+        fn: Callable[..., Any],
+        args_list: Iterable[tuple],
+    ) -> AsyncIterator[Any]:
+        """Equivalent de executor.submit + as_completed: resultats dans l'ordre d'arrivee."""
+        tasks = [asyncio.ensure_future(self.call(host, fn, *args)) for args in args_list]
+        for future in asyncio.as_completed(tasks):
+            yield await future
+
+
+def run(main: Callable[[FetchEngine], Awaitable[Any]], host_limits: dict[str, int]) -> Any:
+    """Lance `main(engine)` dans une nouvelle boucle, avec assez de threads pour tous les hotes."""
+
+    async def _runner():
+        loop = asyncio.get_running_loop()
+        workers = max(1, sum(max(1, limit) for limit in host_limits.values()))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+        loop.set_default_executor(executor)
+        return await main(FetchEngine(host_limits))
+
+    return asyncio.run(_runner())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+film_index.py
+Index local des identites de films (JSON dans outils/work/film_index.json).
+
+- Cle: titre | realisateur normalises; chaque cle garde une entree par annee
+  de sortie connue: {"annee", "allocine_url", "tmdb_id", "tmdb_lang", "maj"}.
+- Amorce a la creation depuis les fichiers deja produits (data/programme.json,
+  work/enriched.xlsx), puis mis a jour a la fin de chaque enrichissement,
+  choix de source manuels compris.
+- lookup() avant toute recherche: une entree trouvee evite les recherches
+  Allocine, TMDB et Google. Sans annee, une cle a plusieurs entrees
+  (remakes homonymes) est ambigue et ne donne rien.
+- Choix de source manuels (desaccord Allocine/TMDB: a, t, m ou s), cle
+  "URL Allocine|id TMDB": rejoues tels quels aux passages suivants.
+- Ecriture atomique (fichier temporaire puis remplacement).
+"""
+
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Callable, Optional
+
+from enrich_checkpoint import data_signature
+
+
+FILM_INDEX_VERSION = 1
+SOURCE_CHOICES = ("a", "t", "m", "s")
+
+
+def year_of(value) -> str:
+    """Annee (4 chiffres) en tete d'une date ISO / d'une annee, sinon ""."""
+    text = str(value or "").strip()[:4]
+    return text if len(text) == 4 and text.isdigit() else ""
+
+
+class FilmIndex:
+    def __init__(self, path: Path, normalize: Callable[[str], str]):
+        self.path = Path(path)
+        self.normalize = normalize
+        self.films: dict[str, list[dict]] = {}
+        self.choices: dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+        self._saved_signature = ""
+
+    def load(self) -> bool:
+        """Charge l'index. Retourne False s'il n'existe pas (ou illisible)."""
+        self.films = {}
+        self.choices = {}
+        if not self.path.exists():
+            return False
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            return False
+        films = payload.get("films") if isinstance(payload, dict) else None
+        if not isinstance(films, dict):
+            return False
+        self.films = {
+            key: [entry for entry in entries if isinstance(entry, dict)]
+            for key, entries in films.items()
+            if isinstance(entries, list)
+        }
+        choices = payload.get("choix")
+        if isinstance(choices, dict):
+            self.choices = {key: entry for key, entry in choices.items() if isinstance(entry, dict)}
+        self._saved_signature = self._signature()
+        return True
+
+    def _signature(self) -> str:
+        return data_signature([self.films, self.choices])
+
+    def key(self, titre: str, realisateur: str) -> str:
+        title_key = self.normalize(titre)
+        if not title_key:
+            return ""
+        return f"{title_key}|{self.normalize(realisateur)}"
+
+    def lookup(self, titre: str, realisateur: str, annee: str = "", count: bool = True) -> Optional[dict]:
+        """Identite connue du film; count=False: sans compter hit / miss (consultation annexe)."""
+        entries = self.films.get(self.key(titre, realisateur)) or []
+        year = year_of(annee)
+        found = None
+        if year:
+            found = next((entry for entry in entries if entry.get("annee") == year), None)
+        if found is None and len(entries) == 1:
+            found = entries[0]
+        if count:
+            if found is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return found
+
+    def record(
+        self,
+        titre: str,
+        realisateur: str,
+        annee: str,
+        allocine_url: str,
+        tmdb_id: str,
+        tmdb_lang: str = "",
+        replace: bool = True,
+    ) -> bool:
+        """Ajoute / met a jour une identite. replace=False: garde une entree existante."""
+        key = self.key(titre, realisateur)
+        allocine_url = str(allocine_url or "").strip()
+        tmdb_id = str(tmdb_id or "").strip()
+        if not key or not (allocine_url or tmdb_id):
+            return False
+        year = year_of(annee)
+        entries = self.films.setdefault(key, [])
+        current = next(
+            (
+                entry
+                for entry in entries
+                if (year and entry.get("annee") == year)
+                or (allocine_url and entry.get("allocine_url") == allocine_url)
+                or (tmdb_id and entry.get("tmdb_id") == tmdb_id)
+            ),
+            None,
+        )
+        if current is None and not year and len(entries) == 1:
+            # Sans annee, une nouvelle identite remplace l'unique entree (correction).
+            current = entries[0]
+        values = {
+            "annee": year,
+            "allocine_url": allocine_url,
+            "tmdb_id": tmdb_id,
+            "tmdb_lang": str(tmdb_lang or "").strip(),
+        }
+        if current is None:
+            entries.append({**values, "maj": date.today().isoformat()})
+            return True
+        if not replace:
+            return False
+        values["annee"] = year or current.get("annee", "")
+        if all(current.get(field, "") == value for field, value in values.items()):
+            return False
+        current.update(values, maj=date.today().isoformat())
+        return True
+
+    @staticmethod
+    def choice_key(allocine_url: str, tmdb_id: str) -> str:
+        allocine_url = str(allocine_url or "").strip()
+        tmdb_id = str(tmdb_id or "").strip()
+        if not allocine_url or not tmdb_id:
+            return ""
+        return f"{allocine_url}|{tmdb_id}"
+
+    def choice_for(self, allocine_url: str, tmdb_id: str) -> str:
+        """Choix de source deja fait pour ce couple de fiches, sinon ""."""
+        entry = self.choices.get(self.choice_key(allocine_url, tmdb_id)) or {}
+        choice = entry.get("choix", "")
+        return choice if choice in SOURCE_CHOICES else ""
+
+    def record_choice(self, allocine_url: str, tmdb_id: str, choice: str) -> bool:
+        key = self.choice_key(allocine_url, tmdb_id)
+        if not key or choice not in SOURCE_CHOICES:
+            return False
+        if self.choice_for(allocine_url, tmdb_id) == choice:
+            return False
+        self.choices[key] = {"choix": choice, "maj": date.today().isoformat()}
+        return True
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.films.values())
+
+    def save(self) -> bool:
+        """Ecrit l'index s'il a change depuis le chargement / la derniere ecriture."""
+        signature = self._signature()
+        if signature == self._saved_signature:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        payload = {
+            "version": FILM_INDEX_VERSION,
+            "films": dict(sorted(self.films.items())),
+            "choix": dict(sorted(self.choices.items())),
+        }
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._saved_signature = signature
+        return True
+
+    def stats_line(self) -> str:
+        return (
+            f"index films: {len(self)} entree(s), {len(self.choices)} choix de source, "
+            f"{self.hits} oeuvre(s) identifiee(s), {self.misses} a rechercher ({self.path})"
+        )
@@ -214,12 +214,9 @@ def _allocine_candidate(title: str) -> PosterCandidate | None:
     release_date = ""
 
     try:
-        resp = enrich.allocine_get(url)
-        html_text = resp.text or ""
-        poster_url = enrich._allocine_extract_og_image(html_text) or enrich._allocine_extract_affiche_thumbnail(
-            html_text
-        )
-        release_date = enrich._allocine_parse_release_date(html_text) or ""
+        fiche = enrich.allocine_fiche(url)
+        poster_url = enrich._allocine_extract_og_image(fiche) or enrich._allocine_extract_affiche_thumbnail(fiche)
+        release_date = enrich._allocine_parse_release_date(fiche) or ""
     except Exception:
         poster_url = ""
 
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+http_cache.py
+Cache HTTP persistant (SQLite) partage par les scrapers Allocine / TMDB / YouTube.
+
+- Une entree par requete GET (URL + parametres tries, sans les cles API).
+- Duree de vie par type de page (CACHE_TTL_RULES); une URL sans regle n'est pas cachee.
+- Taille bornee: au-dela de max_bytes, les entrees lues le moins recemment sont evincees.
+- refresh=True ignore les entrees existantes mais enregistre les nouvelles reponses.
+- get_json / put_json: petites valeurs derivees (ex: URL video d'un lecteur
+  Allocine deja resolue) rangees dans la meme base, avec leur propre duree de vie.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from threading import Lock
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+import requests
+
+
+DAY = 24 * 60 * 60
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+CACHE_EVICT_RATIO = 0.9
+
+# Premiere regle qui correspond a l'URL -> duree de vie en secondes.
+CACHE_TTL_RULES = [
+    (re.compile(r"allocine\.fr/rechercher/", re.IGNORECASE), 7 * DAY),
+    (re.compile(r"allocine\.fr/film/fichefilm-\d+/palmares/", re.IGNORECASE), 90 * DAY),
+    (re.compile(r"allocine\.fr/film/fichefilm-\d+/photos/", re.IGNORECASE), 30 * DAY),
+    (re.compile(r"allocine\.fr/video/player_gen_cmedia=", re.IGNORECASE), 90 * DAY),
+    (re.compile(r"allocine\.fr/film/", re.IGNORECASE), 30 * DAY),
+    (re.compile(r"themoviedb\.org/3/search/", re.IGNORECASE), 7 * DAY),
+    (re.compile(r"themoviedb\.org/3/movie/\d+/credits", re.IGNORECASE), 90 * DAY),
+    (re.compile(r"themoviedb\.org/3/movie/\d+", re.IGNORECASE), 30 * DAY),
+    (re.compile(r"youtube\.com/results", re.IGNORECASE), 30 * DAY),
+]
+
+# Parametres exclus de la cle (secrets qui ne changent pas la reponse).
+IGNORED_PARAMS = {"api_key", "key"}
+
+
+def build_response(url: str, status_code: int, body: bytes, encoding: str) -> requests.Response:
+    """Reconstruit une requests.Response a partir d'une entree du cache."""
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response._content = body
+    response.encoding = encoding or "utf-8"
+    response.headers["X-Cache"] = "HIT"
+    return response
+
+
+class HttpCache:
+    def __init__(self, path: Path, max_bytes: int = CACHE_MAX_BYTES, enabled: bool = True):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.refresh = False
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " url TEXT NOT NULL,"
+                " status INTEGER NOT NULL,"
+                " encoding TEXT,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)")
+            conn.commit()
+            row = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+            self._total_bytes = int(row[0] or 0)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def ttl_for(url: str) -> int:
+        for pattern, ttl in CACHE_TTL_RULES:
+            if pattern.search(url or ""):
+                return ttl
+        return 0
+
+    @staticmethod
+    def make_key(url: str, params: Optional[dict] = None) -> str:
+        items = sorted(
+            (str(k), str(v))
+            for k, v in (params or {}).items()
+            if str(k) not in IGNORED_PARAMS
+        )
+        raw = f"GET {url}?{urlencode(items)}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _read(self, key: str) -> Optional[tuple[int, str, bytes]]:
+        """Entree valide (status, encoding, corps) ou None; compte hits / misses."""
+        if self.refresh:
+            self.misses += 1
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT status, encoding, body, size, expires_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            status, encoding, body, size, expires_at = row
+            if expires_at < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+                self._total_bytes -= int(size)
+                self.misses += 1
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+        return int(status), encoding, zlib.decompress(body)
+
+    def _write(self, key: str, url: str, status: int, encoding: str, content: bytes, ttl: int) -> None:
+        body = zlib.compress(content)
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            old = conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries"
+                " (key, url, status, encoding, body, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status, encoding, body, len(body), now + ttl, now),
+            )
+            self._total_bytes += len(body) - (int(old[0]) if old else 0)
+            self.writes += 1
+            if self._total_bytes > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+
+    def lookup(self, url: str, params: Optional[dict] = None) -> Optional[requests.Response]:
+        if not self.enabled or not self.ttl_for(url):
+            return None
+        entry = self._read(self.make_key(url, params))
+        if entry is None:
+            return None
+        status, encoding, body = entry
+        return build_response(url, status, body, encoding)
+
+    def store(self, url: str, response: requests.Response, params: Optional[dict] = None) -> None:
+        ttl = self.ttl_for(url)
+        if not self.enabled or not ttl or response.status_code != 200:
+            return
+        self._write(
+            self.make_key(url, params),
+            url,
+            response.status_code,
+            response.encoding or "",
+            response.content or b"",
+            ttl,
+        )
+
+    def get_json(self, name: str) -> Any:
+        """Valeur enregistree par put_json sous `name`, ou None (absente / expiree)."""
+        if not self.enabled:
+            return None
+        entry = self._read(self.make_key(f"json:{name}"))
+        if entry is None:
+            return None
+        try:
+            return json.loads(entry[2].decode("utf-8"))
+        except ValueError:
+            return None
+
+    def put_json(self, name: str, value: Any, ttl: int) -> None:
+        if not self.enabled or ttl <= 0:
+            return
+        content = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self._write(self.make_key(f"json:{name}"), f"json:{name}", 200, "json", content, ttl)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        target = int(self.max_bytes * CACHE_EVICT_RATIO)
+        conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall()
+        total = sum(int(size) for _, size in rows)
+        victims = []
+        for key, size in rows:
+            if total <= target:
+                break
+            victims.append((key,))
+            total -= int(size)
+        conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._total_bytes = total
+
+    def stats_line(self) -> str:
+        return (
+            f"cache http: {self.hits} hit(s), {self.misses} miss(es), "
+            f"{self.writes} ecriture(s), {self._total_bytes / (1024 * 1024):.1f} Mo"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+http_replay.py
+Enregistrement / rejeu des echanges HTTP de l'enrichissement (hors ligne).
+
+- FixtureArchive: une reponse par requete GET dans un fichier JSON lines
+  gzip (cle = meme empreinte que le cache HTTP: URL + parametres tries,
+  sans les cles API ni l'identifiant du moteur Google).
+- RecordingSession: enveloppe une requests.Session et archive chaque reponse.
+- ReplaySession: rejoue l'archive, avec une latence synthetique par requete;
+  une requete absente de l'archive repond 404.
+- install(): remplace les sessions Allocine / TMDB / YouTube / Google d'un
+  module (enrich_3_0.py) et renvoie les sessions installees.
+"""
+
+import base64
+import gzip
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from http_cache import IGNORED_PARAMS, HttpCache, build_response
+
+
+SESSION_NAMES = ("ALLOCINE_SESSION", "TMDB_SESSION", "YOUTUBE_SESSION", "GOOGLE_SESSION")
+KEPT_HEADERS = ("Content-Type", "Retry-After")
+REPLAY_IGNORED_PARAMS = IGNORED_PARAMS | {"cx"}
+
+
+def _public_params(params: Optional[dict]) -> dict:
+    return {str(k): v for k, v in (params or {}).items() if str(k) not in REPLAY_IGNORED_PARAMS}
+
+
+def fixture_key(url: str, params: Optional[dict]) -> str:
+    return HttpCache.make_key(url, _public_params(params))
+
+
+class FixtureArchive:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        self._lock = Lock()
+
+    def load(self) -> "FixtureArchive":
+        with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    self.entries[entry["key"]] = entry
+        return self
+
+    def add(self, url: str, params: Optional[dict], response: requests.Response) -> None:
+        entry = {
+            "key": fixture_key(url, params),
+            "url": url,
+            "params": _public_params(params),
+            "status": response.status_code,
+            "encoding": response.encoding or "",
+            "headers": {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            "body": base64.b64encode(response.content or b"").decode("ascii"),
+        }
+        with self._lock:
+            self.entries[entry["key"]] = entry
+
+    def get(self, url: str, params: Optional[dict]) -> Optional[dict]:
+        return self.entries.get(fixture_key(url, params))
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt", encoding="utf-8") as handle:
+            for entry in self.entries.values():
+                handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class RecordingSession:
+    """Session reelle dont chaque reponse est copiee dans l'archive."""
+
+    def __init__(self, inner: requests.Session, archive: FixtureArchive):
+        self.inner = inner
+        self.archive = archive
+        self.headers = inner.headers
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+        response = self.inner.get(url, params=params, **kwargs)
+        self.archive.add(url, params, response)
+        return response
+
+
+class ReplaySession:
+    """Rejoue l'archive; `latency` secondes d'attente simulee par requete."""
+
+    def __init__(self, archive: FixtureArchive, latency: float = 0.0):
+        self.archive = archive
+        self.latency = latency
+        self.headers: dict[str, str] = {}
+        self.requests_by_host: dict[str, int] = {}
+        self.missing: list[str] = []
+        self._lock = Lock()
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            self.requests_by_host[host] = self.requests_by_host.get(host, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        entry = self.archive.get(url, params)
+        if entry is None:
+            with self._lock:
+                self.missing.append(url)
+            response = build_response(url, 404, b"", "utf-8")
+        else:
+            response = build_response(
+                url,
+                int(entry["status"]),
+                base64.b64decode(entry["body"]),
+                entry.get("encoding", ""),
+            )
+            response.headers.update(entry.get("headers") or {})
+        del response.headers["X-Cache"]
+        return response
+
+    def request_count(self) -> int:
+        return sum(self.requests_by_host.values())
+
+
+def install(module, session) -> dict:
+    """Remplace les sessions HTTP du module; renvoie {nom: session installee}."""
+    installed = {}
+    for name in SESSION_NAMES:
+        current = getattr(module, name, None)
+        if current is None:
+            continue
+        replacement = RecordingSession(current, session) if isinstance(session, FixtureArchive) else session
+        setattr(module, name, replacement)
+        installed[name] = replacement
+    return installed
@@ -9,18 +9,25 @@ Sorties :
     - work/prochainement.json  (liste de textes "prochainement")
 """
 from contextlib import nullcontext
+import functools
+import itertools
 from pathlib import Path
 import re
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta
 from dateutil import parser as dtparser
 import json
 import unicodedata
 
+import numpy as np
 import pandas as pd
-from openpyxl.styles import numbers
+from pandas.io.parsers import TextParser
 from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
 from openpyxl.styles import Border, Side,Font, Alignment
 
+from columnar import column_values, map_unique
+from xlsx_writer import frame_rows, write_sheet
+
 
 # --- chemins ---
 BASE_DIR            = Path(__file__).resolve().parent
@@ -47,6 +54,21 @@ WEEKDAYS_FR = {"lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dim
 EXEC_DATE   = datetime.today().date()
 IS_DECEMBER = (EXEC_DATE.month == 12)
 
+# --- parsing des cellules date / heure ---
+# Cache par valeur brute de cellule (un programme repete les memes dates et
+# horaires), formats stricts d'abord, dateutil en dernier recours seulement.
+CELL_PARSE_CACHE_SIZE = 65536
+EXCEL_EPOCH      = datetime(1899, 12, 30)
+# numeros de serie Excel acceptes comme dates en colonne B: 1950 -> 2100
+EXCEL_SERIAL_MIN = (datetime(1950, 1, 1) - EXCEL_EPOCH).days
+EXCEL_SERIAL_MAX = (datetime(2100, 12, 31) - EXCEL_EPOCH).days
+ISO_DATE_RE  = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$")
+EU_DATE_RE   = re.compile(r"^(\d{1,2})([/.-])(\d{1,2})\2(\d{4})$")
+HOUR_RE      = re.compile(r"(\d{1,2})\s*[h:]\s*(\d{1,2})?$")
+HMS_RE       = re.compile(r"^(\d{1,2}):(\d{2}):(\d{2})$")
+# cellules passees par dateutil (valeurs distinctes, le cache evite les repetitions)
+SLOW_PARSE_COUNTS = {"date": 0, "heure": 0}
+
 
 # ------------------------------------------------------------
 # utilitaires
@@ -59,54 +81,93 @@ def is_weekday_label(x):
     return any(s.startswith(w) for w in WEEKDAYS_FR)
 
 
-def parse_date_cell(x):
-    """Parse une cellule de date Excel (ou texte) en date, avec correction décembre → janvier N+1."""
-    if pd.isna(x):
+def adjust_december(d):
+    """Correction décembre → janvier N+1 (programme de janvier préparé en décembre)."""
+    if IS_DECEMBER and d.month == 1 and d.year == EXEC_DATE.year:
+        return d.replace(year=EXEC_DATE.year + 1)
+    return d
+
+
+def is_number(x):
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def parse_date_fast(x):
+    """Formats stricts: numero de serie Excel, ISO (AAAA-MM-JJ), JJ/MM/AAAA. None sinon."""
+    if is_number(x):
+        if EXCEL_SERIAL_MIN <= x <= EXCEL_SERIAL_MAX:
+            return (EXCEL_EPOCH + timedelta(days=int(x))).date()
         return None
+    s = str(x).strip()
+    try:
+        m = ISO_DATE_RE.match(s)
+        if m:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        m = EU_DATE_RE.match(s)
+        if m:
+            return date(int(m.group(4)), int(m.group(3)), int(m.group(1)))
+    except ValueError:
+        pass
+    return None
+
 
+@functools.lru_cache(maxsize=CELL_PARSE_CACHE_SIZE, typed=True)
+def _parse_date_cell_cached(x):
     # 1) Cas : vrai datetime / Timestamp venant d'Excel
     if isinstance(x, (pd.Timestamp, datetime)):
-        d = pd.to_datetime(x).date()
+        return adjust_december(x.date())
+    if isinstance(x, date):
+        return adjust_december(x)
 
-        # Ajustement "décembre → janvier N+1"
-        if IS_DECEMBER and d.month == 1 and d.year == EXEC_DATE.year:
-            d = d.replace(year=EXEC_DATE.year + 1)
+    # 2) Formats stricts
+    d = parse_date_fast(x)
+    if d is not None:
+        return adjust_december(d)
 
-        return d
-
-    # 2) Cas : texte à parser
+    # 3) Texte libre : dateutil (jour d'abord, puis mois d'abord)
+    SLOW_PARSE_COUNTS["date"] += 1
     s = str(x).strip()
     for dayfirst in (True, False):
         try:
-            d = dtparser.parse(s, dayfirst=dayfirst, fuzzy=True).date()
-
-            # Même ajustement pour le texte
-            if IS_DECEMBER and d.month == 1 and d.year == EXEC_DATE.year:
-                d = d.replace(year=EXEC_DATE.year + 1)
-
-            return d
+            return adjust_december(dtparser.parse(s, dayfirst=dayfirst, fuzzy=True).date())
         except Exception:
             pass
 
     return None
 
-def parse_time_cell(x):
+
+def parse_date_cell(x):
+    """Parse une cellule de date Excel (ou texte) en date, avec correction décembre → janvier N+1."""
     if pd.isna(x):
         return None
+    return _parse_date_cell_cached(x)
+
+
+@functools.lru_cache(maxsize=CELL_PARSE_CACHE_SIZE, typed=True)
+def _parse_time_cell_cached(x):
     if isinstance(x, (pd.Timestamp, datetime)):
-        t = pd.to_datetime(x).time()
-        return t.replace(second=0, microsecond=0)
+        return x.time().replace(second=0, microsecond=0)
     if isinstance(x, time):
         return x.replace(second=0, microsecond=0)
 
+    # fraction de journee Excel (heure sans format)
+    if is_number(x) and 0 < x < 1:
+        minutes = round(x * 24 * 60)
+        if minutes < 24 * 60:
+            return time(minutes // 60, minutes % 60)
+
     s = str(x).strip()
-    m = re.search(r"(\d{1,2})\s*[h:]\s*(\d{1,2})?$", s)
+    m = HOUR_RE.search(s)
     if m:
         hh = int(m.group(1))
         mm = int(m.group(2)) if m.group(2) else 0
         if 0 <= hh < 24 and 0 <= mm < 60:
             return time(hh, mm)
+    m = HMS_RE.match(s)
+    if m and int(m.group(1)) < 24 and int(m.group(2)) < 60 and int(m.group(3)) < 60:
+        return time(int(m.group(1)), int(m.group(2)))
 
+    SLOW_PARSE_COUNTS["heure"] += 1
     try:
         t = dtparser.parse(s).time()
         return t.replace(second=0, microsecond=0)
@@ -114,6 +175,24 @@ def parse_time_cell(x):
         return None
 
 
+def parse_time_cell(x):
+    if pd.isna(x):
+        return None
+    return _parse_time_cell_cached(x)
+
+
+def parse_stats_line():
+    """Cellules date / heure: valeurs distinctes parsees, dont via dateutil."""
+    parts = []
+    for label, cached in (("date", _parse_date_cell_cached), ("heure", _parse_time_cell_cached)):
+        info = cached.cache_info()
+        parts.append(
+            f"{label} {info.misses} valeur(s) distincte(s) / {info.hits + info.misses} cellule(s), "
+            f"{SLOW_PARSE_COUNTS[label]} via dateutil"
+        )
+    return "parsing cellules: " + ", ".join(parts)
+
+
 def norm_str(x):
     if x is None or (isinstance(x, float) and pd.isna(x)):
         return None
@@ -121,42 +200,39 @@ def norm_str(x):
     return s or None
 
 
-def extract_prochainement_blocks(raw):
+def parse_day_columns(raw):
+    """
+    Colonnes A/B/C de toute la feuille en une passe (date / heure: parsing en cache par valeur):
+    {"weekday": bool par ligne, "date": date ou None, "time": heure ou None}.
+    """
+    return {
+        "weekday": np.array(map_unique(is_weekday_label, column_values(raw, COL_A, None)), dtype=bool),
+        "date": [parse_date_cell(x) for x in column_values(raw, COL_B, None)],
+        "time": [parse_time_cell(x) for x in column_values(raw, COL_C, None)],
+    }
+
+
+def extract_prochainement_blocks(raw, day_columns=None):
     """Return upcoming text blocks from explicit markers or a trailing title list."""
+    if day_columns is None:
+        day_columns = parse_day_columns(raw)
     upcoming_blocks = []
-    index_list = list(raw.index)
     trailing_candidates = []
+    markers = map_unique(norm_str, column_values(raw, COL_URL, None))
+    titles = map_unique(norm_str, column_values(raw, COL_TITRE, None))
 
-    for pos, idx in enumerate(index_list):
-        row = raw.loc[idx]
-        a = row.get(COL_A)
-        b = row.get(COL_B)
-        c = row.get(COL_C)
-
-        titre_cell_value = row.get(COL_URL)
-        titre_norm = norm_str(titre_cell_value)
-
-        has_weekday = is_weekday_label(a)
-        has_date = parse_date_cell(b) is not None
-        has_time = parse_time_cell(c) is not None
-
-        if not (titre_norm and "prochainement" in titre_norm.lower() and not has_weekday and not has_date):
-            if (
-                titre_norm
-                and not has_weekday
-                and not has_date
-                and not has_time
-                and ("," in titre_norm or ";" in titre_norm or "\n" in titre_norm)
+    for pos, titre_norm in enumerate(markers):
+        if not titre_norm or day_columns["weekday"][pos] or day_columns["date"][pos] is not None:
+            continue
+
+        if "prochainement" not in titre_norm.lower():
+            if day_columns["time"][pos] is None and (
+                "," in titre_norm or ";" in titre_norm or "\n" in titre_norm
             ):
                 trailing_candidates.append(titre_norm)
             continue
 
-        next_pos = pos + 1
-        if next_pos >= len(index_list):
-            continue
-        next_idx = index_list[next_pos]
-        next_row = raw.loc[next_idx]
-        next_title = norm_str(next_row.get(COL_TITRE))
+        next_title = titles[pos + 1] if pos + 1 < len(titles) else None
         if next_title:
             upcoming_blocks.append(next_title)
 
@@ -459,6 +535,235 @@ def is_red_background(cell):
     return code == "FF0000"
 
 
+def excel_cell_value(cell):
+    """Valeur d'une cellule convertie comme pd.read_excel (moteur openpyxl)."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return float("nan")
+    if cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+    return cell.value
+
+
+def read_source_sheet(path, sheet_name):
+    """
+    Lit la feuille source en un seul passage openpyxl (lecture seule, en flux).
+    Retourne (raw, red_rows):
+      - raw: meme DataFrame que pd.read_excel(header=None, dtype=object);
+      - red_rows: index (0-based, comme raw) des lignes dont le titre est sur fond rouge.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet_name]
+        ws.reset_dimensions()
+        data = []
+        red_rows = set()
+        last_row_with_data = -1
+        for row_number, row in enumerate(ws.rows):
+            if len(row) > COL_TITRE and is_red_background(row[COL_TITRE]):
+                red_rows.add(row_number)
+            values = [excel_cell_value(cell) for cell in row]
+            while values and values[-1] == "":
+                values.pop()
+            if values:
+                last_row_with_data = row_number
+            data.append(values)
+    finally:
+        wb.close()
+
+    data = data[: last_row_with_data + 1]
+    if not data:
+        return pd.DataFrame(), red_rows
+    width = max(len(values) for values in data)
+    data = [values + [""] * (width - len(values)) for values in data]
+    raw = TextParser(data, header=None, dtype=object, skip_blank_lines=False).read()
+    return raw, red_rows
+
+
+OUTPUT_COLUMNS = [
+    "Date", "Heure", "Titre", "Version", "CM", "courts_metrages", 'Realisateur',
+    "Recompenses", "Categorie", "Tarif", "url_allocine", ""
+]
+
+
+def title_parts(value):
+    """(titre nettoye, version, jp, scolaire) d'une cellule titre; titre "" si vide."""
+    titre = norm_str(value)
+    if not titre:
+        return "", None, False, False
+    return normalize_title_field(titre)
+
+
+def rewards_of(prix_invites):
+    """Colonne "prix / invites": gardee comme recompenses si c'en est."""
+    if prix_invites and is_rewards_text(prix_invites):
+        return prix_invites
+    return None
+
+
+def final_categorie(categorie, jp, scol):
+    categorie = normalize_categorie_field(categorie, jp_in_tarif=jp)
+    if scol:
+        categorie = append_category_label(categorie, "Scolaire")
+    return categorie
+
+
+def format_heure(t):
+    return f"{t.hour:02d}:{t.minute:02d}"
+
+
+def normalize_screenings(raw, red_rows, cm_catalog, day_columns):
+    """
+    Passe colonnaire: une ligne par seance (jour courant + horaire + titre).
+    Chaque normalisation (date, heure, titre, version, tarif, categorie...)
+    ne tourne qu'une fois par valeur distincte de sa colonne.
+    """
+    # 1) Jour courant: date des lignes "jour de semaine + date", propagee vers le bas
+    row_dates = pd.Series(day_columns["date"], index=raw.index, dtype=object)
+    day_rows = day_columns["weekday"] & row_dates.notna().to_numpy()
+    current_dates = row_dates.where(day_rows).ffill()
+
+    # 2) Seances: jour courant connu + horaire en colonne C + titre non vide,
+    #    hors titres sur fond rouge
+    times = pd.Series(day_columns["time"], index=raw.index, dtype=object)
+    titles = map_unique(title_parts, column_values(raw, COL_TITRE, None))
+    keep = (
+        current_dates.notna().to_numpy()
+        & times.notna().to_numpy()
+        & np.array([bool(title[0]) for title in titles], dtype=bool)
+        & ~raw.index.isin(list(red_rows))
+    )
+    positions = np.flatnonzero(keep)
+    rows = raw.take(positions)
+    titles = [titles[pos] for pos in positions]
+
+    def column(col):
+        return map_unique(norm_str, column_values(rows, col, None))
+
+    # 3) Colonnes de la seance
+    versions = [
+        version_in_title or version
+        for (_, version_in_title, _, _), version in zip(titles, map_unique(normalize_version, column(COL_VERSION)))
+    ]
+    cms = column(COL_CM)
+    courts_metrages = map_unique(
+        lambda cm: json.dumps(resolve_courts_metrages(cm_catalog, cm), ensure_ascii=False) if parse_cm_refs(cm) else "",
+        cms,
+    )
+
+    # --- Normalisation categorie/tarif ---
+    tarifs = map_unique(normalize_tarif_field, column(COL_TARIF))
+    categories = map_unique(
+        final_categorie,
+        column(COL_CATEG),
+        [jp_in_tarif or title[2] for (_, jp_in_tarif), title in zip(tarifs, titles)],
+        [title[3] for title in titles],
+    )
+
+    return pd.DataFrame(
+        {
+            "Date": current_dates.iloc[positions].tolist(),
+            "Heure": map_unique(format_heure, times.iloc[positions].tolist()),
+            "Titre": [title[0] for title in titles],
+            "Version": versions,
+            "CM": cms,
+            "courts_metrages": courts_metrages,
+            "Realisateur": column(COL_REAL),
+            "Recompenses": map_unique(rewards_of, column(COL_PRIX_INVITES)),
+            "Categorie": categories,
+            "Tarif": [tarif for tarif, _ in tarifs],
+            "url_allocine": column(COL_URL),
+        },
+        columns=OUTPUT_COLUMNS,
+    )
+
+
+# ------------------------------------------------------------
+# mise en forme de work/normalized.xlsx
+# ------------------------------------------------------------
+
+# ajout d'une bordure Bleu autour de 3 serie de film pour les  caissiere
+SERIES_COUNT  = 3
+SERIES_COLUMN = 12  # L: "Saisie N", fusionnee sur chaque serie
+SERIES_SIDE   = Side(border_style="double", color="000000FF")
+SERIES_BORDERS = {
+    "top": Border(top=SERIES_SIDE),
+    "bottom": Border(bottom=SERIES_SIDE),
+    "left": Border(left=SERIES_SIDE),
+    "right": Border(right=SERIES_SIDE),
+}
+NORMALIZED_COLUMNS = {
+    "A": {"auto_size": True},
+    "B": {"auto_size": True},
+    "C": {"width": 50},
+    "H": {"width": 30},
+    "I": {"width": 30},
+    "L": {
+        "width": 40,
+        "alignment": Alignment(horizontal='center', vertical='center'),
+        "font": Font(name='Calibri', size=14, bold=True, color='000000FF'),
+    },
+}
+
+
+def series_blocks(row_count):
+    """(premiere, derniere) ligne Excel de chaque serie, en-tete comprise."""
+    per_series = int(row_count / SERIES_COUNT)
+    blocks = []
+    for index in range(SERIES_COUNT):
+        first_row = 1 + index + index * per_series
+        blocks.append((first_row, first_row + per_series))
+    return blocks
+
+
+def write_normalized(df, path):
+    """
+    Ecrit les seances et leur mise en forme en une passe: dates JJ/MM/AAAA,
+    3 series encadrees (la derniere peut deborder de 2 lignes vides) et
+    colonne L fusionnee par serie avec son libelle "Saisie N".
+    """
+    blocks = series_blocks(len(df))
+    data_last_row = len(df) + 1
+    last_row = max(data_last_row, blocks[-1][1])
+    labels = {first_row: f"Saisie {index + 1}" for index, (first_row, _) in enumerate(blocks)}
+    first_rows = set(labels)
+    last_rows = {last for _, last in blocks}
+
+    def cell_style(row, col, value):
+        style = {}
+        if col == 1 and row <= data_last_row:
+            style["number_format"] = "DD/MM/YYYY"
+        # bas de serie > haut de serie > bords gauche / droit
+        if row in last_rows:
+            style["border"] = SERIES_BORDERS["bottom"]
+        elif row in first_rows:
+            style["border"] = SERIES_BORDERS["top"]
+        elif col == 1:
+            style["border"] = SERIES_BORDERS["left"]
+        elif col == SERIES_COLUMN:
+            style["border"] = SERIES_BORDERS["right"]
+        return style
+
+    def rows():
+        padding = ([None] * SERIES_COLUMN for _ in range(last_row - data_last_row))
+        for row, values in enumerate(itertools.chain(frame_rows(df), padding), start=1):
+            # seule la premiere cellule d'une plage fusionnee garde une valeur
+            values[SERIES_COLUMN - 1] = labels.get(row)
+            yield values
+
+    write_sheet(
+        path,
+        rows(),
+        cell_style=cell_style,
+        columns=NORMALIZED_COLUMNS,
+        merges=[f"L{first_row}:L{last}" for first_row, last in blocks],
+    )
+
+
 # ------------------------------------------------------------
 # MAIN
 # ------------------------------------------------------------
@@ -467,145 +772,19 @@ def main():
     if not INPUT_PATH.exists():
         raise SystemExit(f"[ERREUR] Fichier introuvable : {INPUT_PATH}")
 
-    # pandas : valeurs
-    raw = pd.read_excel(INPUT_PATH, sheet_name=SHEET_NAME, header=None, dtype=object)
+    # une seule lecture du classeur : valeurs + lignes a titre sur fond rouge
+    raw, red_rows = read_source_sheet(INPUT_PATH, SHEET_NAME)
 
     cm_catalog = extract_cm_catalog(raw)
 
-    # openpyxl : styles (couleurs)
-    wb = load_workbook(INPUT_PATH, data_only=True)
-    ws = wb[SHEET_NAME]
-
-    records = []
-    upcoming_blocks = extract_prochainement_blocks(raw)
-    current_date = None
-
-    for idx, row in raw.iterrows():
-        # --------------------------------------------------------
-        # 1) Mise à jour du jour courant
-        # --------------------------------------------------------
-        a = row.get(COL_A)
-        b = row.get(COL_B)
-        row_date = parse_date_cell(b)
-        if is_weekday_label(a) and row_date:
-            current_date = row_date
-
-        # --------------------------------------------------------
-        # 2) Détection séance classique
-        #    Règle: on avance d'abord par date, puis on ne s'intéresse
-        #    qu'aux lignes qui portent un horaire en colonne C.
-        # --------------------------------------------------------
-        t = parse_time_cell(row.get(COL_C))
-        if not current_date or not t:
-            continue
-
-        titre = norm_str(row.get(COL_TITRE))
-        if not titre:
-            continue
-        titre, version_in_title, jp_in_title, scol_in_title = normalize_title_field(titre)
-        if not titre:
-            continue
-
-        titre_cell_excel = ws.cell(row=idx + 1, column=COL_TITRE + 1)  # openpyxl = 1-based
-        if is_red_background(titre_cell_excel):
-            continue
-
-        version = normalize_version(norm_str(row.get(COL_VERSION)))
-        if version_in_title:
-            version = version_in_title
-        cm = norm_str(row.get(COL_CM))
-        courts_metrages = resolve_courts_metrages(cm_catalog, cm)
-        realisateur =  norm_str(row.get(COL_REAL))
-        prix_invites = norm_str(row.get(COL_PRIX_INVITES))
-        categorie = norm_str(row.get(COL_CATEG))
-        tarif = norm_str(row.get(COL_TARIF))
-        commentaire = norm_str(row.get(COL_COMMENT))
-        url_allocine = norm_str(row.get(COL_URL))
-        recompenses = None
-
-        if prix_invites:
-            if is_rewards_text(prix_invites):
-                recompenses = prix_invites
-            else:
-                commentaire = merge_comment_parts(prix_invites, commentaire)
-
-        # --- Normalisation categorie/tarif ---
-        tarif, jp_in_tarif = normalize_tarif_field(tarif)
-        categorie = normalize_categorie_field(categorie, jp_in_tarif=jp_in_tarif or jp_in_title)
-        if scol_in_title:
-            categorie = append_category_label(categorie, "Scolaire")
-
-        records.append({
-            # "Date": current_date.strftime("%Y-%m-%d"),
-            "Date": current_date,
-            "Heure": f"{t.hour:02d}:{t.minute:02d}",
-            "Titre": titre,
-            "Version": version,
-            "CM": cm,
-            "courts_metrages": json.dumps(courts_metrages, ensure_ascii=False) if courts_metrages else "",
-            "Realisateur" : realisateur,
-            "Recompenses": recompenses,
-            "Categorie": categorie,
-            "Tarif": tarif,
-            "Commentaire": commentaire,
-            "url_allocine": url_allocine,
-        })
+    day_columns = parse_day_columns(raw)
+    upcoming_blocks = extract_prochainement_blocks(raw, day_columns)
+    df = normalize_screenings(raw, red_rows, cm_catalog, day_columns)
 
     # --------------------------------------------------------
     # export des séances
     # --------------------------------------------------------
-    df = pd.DataFrame(records, columns=[
-        "Date", "Heure", "Titre", "Version", "CM", "courts_metrages", 'Realisateur',
-        "Recompenses", "Categorie", "Tarif", "url_allocine", ""
-    ])
-
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    df.to_excel(OUTPUT_PATH, index=False)
-    wb = load_workbook(OUTPUT_PATH)
-    ws = wb.active
-    for c in ws['A:A'] :
-        c.number_format = "DD/MM/YYYY"
-    #ws.column_dimensions["A"].number_format = "DD/MM/YYYY"
-    ws.column_dimensions["A"].auto_size = True
-    ws.column_dimensions["B"].auto_size = True
-    ws.column_dimensions["C"].width = 50
-
-    ws.column_dimensions["H"].witdth = 30
-    ws.column_dimensions["I"].witdth = 30
-
-    # ajout d'une bordure Bleu autour de 3 serie de film pour les  caissiere
-
-    def set_border(ws, cell_range):
-        Large = Side(border_style="double", color="000000FF")
-        rows = ws[cell_range]
-        for row in rows:
-            row[0].border  = Border(left=Large)
-            row[-1].border = Border(right=Large)
-        for c in rows[0]:
-             c.border = Border(top=Large)
-        for c in rows[-1]:
-            c.border = Border(bottom=Large)
-
-    nb_row_per_series=int ((ws.max_row-1)/3)
-    ws.column_dimensions["L"].witdth = 40
-    ws.column_dimensions["L"].alignment = Alignment(horizontal='center', vertical='center')
-    ws.column_dimensions["L"].font  = Font(name='Calibri',
-                size=14,
-                bold=True,
-                color='000000FF')
-    for index in [0,1,2] :
-        label=f'Saisie {index+1}'
-        first_row=1++index+index*nb_row_per_series
-        last_row=first_row+nb_row_per_series
-        try :
-            ws.unmerge_cells(f"L{first_row}:L{last_row}")
-        except:
-            print('')
-        ws.cell(first_row,12).value=label
-        ws.merge_cells(f"L{first_row}:L{last_row}")
-        set_border(ws, f'A{first_row}:L{last_row}')
-
-    wb.save( OUTPUT_PATH)
+    write_normalized(df, OUTPUT_PATH)
 
     print(f"[done] Ecrit : {OUTPUT_PATH} ({len(df)} lignes)")
 
@@ -618,6 +797,7 @@ def main():
         json.dump(upcoming_blocks, f, ensure_ascii=False, indent=2)
 
     print(f"[done] Ecrit : {PROCHAINEMENT_PATH} ({len(upcoming_blocks)} bloc(s))")
+    print(f"[info] {parse_stats_line()}")
 
 
 if __name__ == "__main__":
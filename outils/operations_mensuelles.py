@@ -54,8 +54,8 @@ def select_steps(from_step: str, to_step: str) -> list[Step]:
     return STEPS[start_index : end_index + 1]
 
 
-def build_command(python_exe: Path, step: Step) -> list[str]:
-    return [str(python_exe), str(step.script_path)]
+def build_command(python_exe: Path, step: Step, step_args: dict[str, list[str]] | None = None) -> list[str]:
+    return [str(python_exe), str(step.script_path), *(step_args or {}).get(step.id, [])]
 
 
 def ensure_inputs(selected_steps: list[Step]) -> None:
@@ -71,8 +71,9 @@ def run_step(
     step_count: int,
     python_exe: Path,
     step: Step,
+    step_args: dict[str, list[str]] | None = None,
 ) -> None:
-    command = build_command(python_exe, step)
+    command = build_command(python_exe, step, step_args)
     print(f"[{step_number}/{step_count}] {step.label}", flush=True)
     print(f"    commande: {' '.join(command)}", flush=True)
     started_at = time.perf_counter()
@@ -109,8 +110,31 @@ def main() -> int:
         action="store_true",
         help="Affiche les etapes et les commandes sans rien executer.",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore le cache HTTP de l'etape enrich et retelecharge les pages Allocine/TMDB/YouTube.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Etape enrich: reprend les films deja enrichis le mois precedent sans les rechercher.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Etape enrich: reprend un enrichissement interrompu la ou il s'est arrete.",
+    )
     args = parser.parse_args()
 
+    step_args: dict[str, list[str]] = {}
+    if args.refresh:
+        step_args.setdefault("enrich", []).append("--refresh")
+    if args.incremental:
+        step_args.setdefault("enrich", []).append("--incremental")
+    if args.resume:
+        step_args.setdefault("enrich", []).append("--resume")
+
     selected_steps = select_steps(args.from_step, args.to_step)
     ensure_inputs(selected_steps)
 
@@ -120,12 +144,12 @@ def main() -> int:
     if args.dry_run:
         print("Mode dry-run:", flush=True)
         for index, step in enumerate(selected_steps, start=1):
-            command = build_command(python_exe, step)
+            command = build_command(python_exe, step, step_args)
             print(f"[{index}/{len(selected_steps)}] {step.id}: {' '.join(command)}", flush=True)
         return 0
 
     for index, step in enumerate(selected_steps, start=1):
-        run_step(index, len(selected_steps), python_exe, step)
+        run_step(index, len(selected_steps), python_exe, step, step_args)
 
     print("Termine.", flush=True)
     return 0
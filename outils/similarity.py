@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+similarity.py
+Similarite de chaines pour rapprocher titres et realisateurs (Allocine, TMDB,
+YouTube, Google).
+
+- ratio(a, b) = 1 - distance Indel / (len(a) + len(b)), soit
+  2 * plus longue sous-suite commune / (len(a) + len(b)), entre 0 et 1.
+- Moteurs (variable SIMILARITY_BACKEND, ou set_backend()):
+  "difflib" ("auto", defaut): difflib.SequenceMatcher.ratio (Ratcliff/Obershelp),
+  les scores sur lesquels les seuils de enrich_3_0.py sont regles;
+  "rapidfuzz": ratio Indel par l'extension C rapidfuzz (pip install rapidfuzz,
+  optionnelle);
+  "python": meme ratio Indel en pur Python (LCS bit-parallele), scores
+  identiques au bit pres a rapidfuzz (meme distance entiere).
+  Le ratio Indel note plus haut que difflib: seuils a recalibrer avant de
+  l'utiliser (bench_enrich.py --similarity).
+- ratio_matrix(lignes, colonnes): tous les ratios d'un coup, en tableau NumPy
+  (difflib: un SequenceMatcher par colonne; rapidfuzz: process.cdist; python:
+  LCS bit-parallele vectorisee sur toutes les paires, lignes de 64 caracteres
+  au plus). Memes valeurs que ratio().
+"""
+
+import difflib
+import functools
+import os
+from typing import Callable, Optional
+
+import numpy as np
+
+try:
+    from rapidfuzz import process as _rapidfuzz_process
+    from rapidfuzz.distance import Indel as _rapidfuzz_indel
+except ModuleNotFoundError:
+    _rapidfuzz_process = None
+    _rapidfuzz_indel = None
+
+
+SIMILARITY_BACKEND_ENV = "SIMILARITY_BACKEND"
+MATRIX_WORD_BITS = 64
+DIFFLIB_CACHE_SIZE = 65536
+
+
+def lcs_length(a: str, b: str) -> int:
+    """Longueur de la plus longue sous-suite commune (Allison-Dix / Hyyro, bits = positions de a)."""
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return 0
+    masks: dict[str, int] = {}
+    for idx, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << idx)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count("1")
+
+
+def _indel_distance_python(a: str, b: str) -> int:
+    return len(a) + len(b) - 2 * lcs_length(a, b)
+
+
+def _indel_distance_rapidfuzz(a: str, b: str) -> int:
+    return int(_rapidfuzz_indel.distance(a, b))
+
+
+def _indel_ratio(distance: Callable[[str, str], int]) -> Callable[[str, str], float]:
+    def _ratio(a: str, b: str) -> float:
+        total = len(a) + len(b)
+        if not total:
+            return 1.0
+        return 1.0 - distance(a, b) / total
+
+    return _ratio
+
+
+@functools.lru_cache(maxsize=DIFFLIB_CACHE_SIZE)
+def _difflib_ratio(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(a=a, b=b).ratio()
+
+
+def _difflib_ratio_matrix(rows: list[str], cols: list[str]) -> np.ndarray:
+    """SequenceMatcher.ratio de toutes les paires; l'index de chaque colonne (b) est construit une fois."""
+    scores = np.zeros((len(rows), len(cols)), dtype=np.float64)
+    matcher = difflib.SequenceMatcher()
+    for col_idx, col in enumerate(cols):
+        matcher.set_seq2(col)
+        for row_idx, row in enumerate(rows):
+            matcher.set_seq1(row)
+            scores[row_idx, col_idx] = matcher.ratio()
+    return scores
+
+
+def _code_points(texts: list[str], width: int):
+    """Points de code des chaines, completes par des zeros: (codes, positions remplies)."""
+    lengths = np.array([len(text) for text in texts], dtype=np.int64)
+    filled = np.arange(width) < lengths[:, None]
+    codes = np.zeros((len(texts), width), dtype=np.uint32)
+    codes[filled] = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    return codes, filled
+
+
+def _lcs_matrix_numpy(rows: list[str], cols: list[str]) -> np.ndarray:
+    """LCS de toutes les paires: un masque uint64 par ligne, une iteration par caractere de colonne."""
+    if not rows or not cols:
+        return np.zeros((len(rows), len(cols)), dtype=np.int64)
+    row_width = max(len(row) for row in rows)
+    width = max(len(col) for col in cols)
+    if width > row_width and width <= MATRIX_WORD_BITS:
+        # LCS symetrique: on itere sur le cote le plus court.
+        return _lcs_matrix_numpy(cols, rows).T
+
+    lcs = np.zeros((len(rows), len(cols)), dtype=np.int64)
+    packed = [idx for idx, row in enumerate(rows) if len(row) <= MATRIX_WORD_BITS]
+    for idx, row in enumerate(rows):
+        if len(row) > MATRIX_WORD_BITS:
+            lcs[idx] = [lcs_length(row, col) for col in cols]
+    if not packed or not width:
+        return lcs
+
+    packed_rows = [rows[idx] for idx in packed]
+    row_codes, row_filled = _code_points(packed_rows, max(len(row) for row in packed_rows))
+    col_codes, col_filled = _code_points(cols, width)
+    row_chars = row_codes[row_filled]
+    _, inverse = np.unique(np.concatenate([row_chars, col_codes[col_filled]]), return_inverse=True)
+    # Identifiant 0 reserve au bourrage.
+    char_ids = inverse.reshape(-1) + 1
+    mask_table = np.zeros((len(packed), int(char_ids.max()) + 1), dtype=np.uint64)
+    owner, position = np.nonzero(row_filled)
+    np.bitwise_or.at(
+        mask_table,
+        (owner, char_ids[: len(row_chars)]),
+        np.left_shift(np.uint64(1), position.astype(np.uint64)),
+    )
+    col_ids = np.zeros(col_codes.shape, dtype=np.intp)
+    col_ids[col_filled] = char_ids[len(row_chars) :]
+
+    row_lengths = row_filled.sum(axis=1)
+    full = np.array([(1 << len(row)) - 1 for row in packed_rows], dtype=np.uint64)[:, None]
+    # Masques de chaque colonne position par position: (largeur, lignes, colonnes).
+    # Caractere de bourrage: masque nul, l'etat ne change pas.
+    column_masks = np.ascontiguousarray(mask_table[:, col_ids].transpose(2, 0, 1))
+    state = np.repeat(full, len(cols), axis=1)
+    matches = np.empty_like(state)
+    carry = np.empty_like(state)
+    for masks_at_pos in column_masks:
+        # Les bits au-dessus de len(ligne) ne redescendent jamais:
+        # un seul masquage par `full` a la fin suffit.
+        np.bitwise_and(state, masks_at_pos, out=matches)
+        np.add(state, matches, out=carry)
+        np.subtract(state, matches, out=state)
+        np.bitwise_or(state, carry, out=state)
+    np.bitwise_and(state, full, out=state)
+    lcs[packed] = row_lengths[:, None] - np.bitwise_count(state).astype(np.int64)
+    return lcs
+
+
+def _indel_distance_matrix_python(rows: list[str], cols: list[str]) -> np.ndarray:
+    lengths = np.array([len(row) for row in rows], dtype=np.int64)[:, None] + np.array(
+        [len(col) for col in cols], dtype=np.int64
+    )
+    return lengths - 2 * _lcs_matrix_numpy(rows, cols)
+
+
+def _indel_distance_matrix_rapidfuzz(rows: list[str], cols: list[str]) -> np.ndarray:
+    return _rapidfuzz_process.cdist(rows, cols, scorer=_rapidfuzz_indel.distance, dtype=np.int64)
+
+
+def _indel_ratio_matrix(distance: Callable[[list[str], list[str]], np.ndarray]):
+    def _ratio_matrix(rows: list[str], cols: list[str]) -> np.ndarray:
+        totals = np.array([len(row) for row in rows], dtype=np.int64)[:, None] + np.array(
+            [len(col) for col in cols], dtype=np.int64
+        )
+        if not totals.size:
+            return np.zeros(totals.shape, dtype=np.float64)
+        scores = np.ones(totals.shape, dtype=np.float64)
+        filled = totals > 0
+        scores[filled] = 1.0 - distance(rows, cols)[filled] / totals[filled]
+        return scores
+
+    return _ratio_matrix
+
+
+BACKENDS: dict[str, Callable[[str, str], float]] = {
+    "python": _indel_ratio(_indel_distance_python),
+    "difflib": _difflib_ratio,
+}
+if _rapidfuzz_indel is not None:
+    BACKENDS["rapidfuzz"] = _indel_ratio(_indel_distance_rapidfuzz)
+
+MATRIX_BACKENDS: dict[str, Callable[[list[str], list[str]], np.ndarray]] = {
+    "python": _indel_ratio_matrix(_indel_distance_matrix_python),
+    "difflib": _difflib_ratio_matrix,
+}
+if _rapidfuzz_indel is not None:
+    MATRIX_BACKENDS["rapidfuzz"] = _indel_ratio_matrix(_indel_distance_matrix_rapidfuzz)
+
+_active: dict[str, Optional[Callable]] = {"name": None, "ratio": None, "matrix": None}
+
+
+def set_backend(name: str = "") -> str:
+    """Choisit le moteur ("", "auto", "rapidfuzz", "python", "difflib"); retourne le moteur retenu."""
+    wanted = str(name or "auto").strip().lower()
+    if wanted == "auto":
+        wanted = "difflib"
+    if wanted == "rapidfuzz" and "rapidfuzz" not in BACKENDS:
+        raise ValueError("rapidfuzz n'est pas installe (pip install rapidfuzz) : utiliser 'python'")
+    if wanted not in BACKENDS:
+        raise ValueError(f"moteur de similarite inconnu: {name} ({', '.join(sorted(BACKENDS))})")
+    _active["name"] = wanted
+    _active["ratio"] = BACKENDS[wanted]
+    _active["matrix"] = MATRIX_BACKENDS[wanted]
+    return wanted
+
+
+def backend_name() -> str:
+    if _active["name"] is None:
+        set_backend(os.environ.get(SIMILARITY_BACKEND_ENV, ""))
+    return _active["name"]
+
+
+def ratio(a: str, b: str) -> float:
+    if _active["ratio"] is None:
+        backend_name()
+    return _active["ratio"](a, b)
+
+
+def ratio_matrix(rows: list[str], cols: list[str]) -> np.ndarray:
+    """Tableau (len(rows), len(cols)) de ratio(row, col)."""
+    if _active["matrix"] is None:
+        backend_name()
+    return _active["matrix"](list(rows), list(cols))
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+tableau_engine.py
+Tableaux internes (ingest, service, ...) generes depuis work/normalized.xlsx.
+
+- TableauData: normalized.xlsx lu une seule fois; les titres CM de
+  input/source.xlsx ne sont lus que si une mise en page en a besoin. Les
+  colonnes derivees (date parsee, libelle VO, titre nettoye) sont calculees
+  une fois et partagees entre les mises en page.
+- Layout / Column: mise en page declarative (en-tete, largeur, police,
+  alignement et valeurs de chaque colonne, hauteur de ligne, fichier de sortie).
+  Layout.before donne les lignes inserees avant chaque seance (lignes CM du
+  tableau ingest).
+- render_tableaux(noms): une lecture des entrees, une ecriture par tableau.
+
+Usage:
+  python outils/tableau_engine.py                  (tous les tableaux)
+  python outils/tableau_engine.py ingest service
+"""
+
+import argparse
+import datetime as dt
+import re
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import Alignment, Font
+
+from columnar import column_values, map_unique
+from xlsx_writer import table_rows, write_sheet
+
+
+BASE_DIR = Path(__file__).resolve().parent
+IN_PATH = BASE_DIR / "work/normalized.xlsx"
+SOURCE_PATH = BASE_DIR / "input/source.xlsx"
+
+WEEKDAY_FR = {
+    0: "lundi",
+    1: "mardi",
+    2: "mercredi",
+    3: "jeudi",
+    4: "vendredi",
+    5: "samedi",
+    6: "dimanche",
+}
+
+MONTH_FR = {
+    1: "janvier",
+    2: "fevrier",
+    3: "mars",
+    4: "avril",
+    5: "mai",
+    6: "juin",
+    7: "juillet",
+    8: "aout",
+    9: "septembre",
+    10: "octobre",
+    11: "novembre",
+    12: "decembre",
+}
+
+CM_KEYS = ("CM1", "CM2")
+
+_ISO_DATE_RE = re.compile(r"^\d{4}([-\/])\d{2}\1\d{2}$")
+_SCOLAIRE_RE = re.compile(r"\bscol(?:aire)?\b")
+
+# Libelles de categorie du tableau service, par groupe: le premier motif
+# trouve dans un groupe donne le libelle, un groupe suivant le remplace.
+SERVICE_CATEGORIES = (
+    (
+        ("SCOL", _SCOLAIRE_RE),
+        ("JP", re.compile(r"\bjeune public\b")),
+        ("Doc", re.compile(r"\bdoc\b")),
+    ),
+    (
+        ("CGout", re.compile(r"\bcine gouter\b")),
+        ("Cdisc", re.compile(r"\bcine discussion\b")),
+        ("Cjeun", re.compile(r"\bcine jeunes\b")),
+        ("CPat", re.compile(r"\bcine patrimoine\b")),
+        ("CDoc", re.compile(r"\bcine coc\b")),
+    ),
+)
+
+
+def to_date(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.date()
+    if isinstance(value, dt.datetime):
+        return value.date()
+    if isinstance(value, dt.date):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return None
+        match = _ISO_DATE_RE.match(text)
+        if match:
+            sep = match.group(1)
+            fmt = "%Y-%m-%d" if sep == "-" else "%Y/%m/%d"
+            parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        else:
+            parsed = pd.to_datetime(text, dayfirst=True, errors="coerce")
+    else:
+        parsed = pd.to_datetime(value, dayfirst=True, errors="coerce")
+    if pd.isna(parsed):
+        return None
+    return parsed.date()
+
+
+def format_time(value) -> str:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, dt.datetime):
+        hour = value.hour
+        minute = value.minute
+    elif isinstance(value, dt.time):
+        hour = value.hour
+        minute = value.minute
+    else:
+        text = str(value).strip()
+        if not text:
+            return ""
+        compact = text.replace(" ", "")
+        if "h" in compact:
+            return compact
+        parts = compact.split(":")
+        if len(parts) >= 2 and parts[0].isdigit() and parts[1].isdigit():
+            hour = int(parts[0])
+            minute = int(parts[1])
+        elif compact.isdigit():
+            hour = int(compact)
+            minute = 0
+        else:
+            return compact
+    return f"{hour}h" if minute == 0 else f"{hour}h{minute:02d}"
+
+
+def format_long_date(date_obj: dt.date | None) -> str:
+    """ex: "mardi 24 mars"."""
+    if not date_obj:
+        return ""
+    weekday = WEEKDAY_FR.get(date_obj.weekday(), "")
+    month = MONTH_FR.get(date_obj.month, "")
+    if not weekday or not month:
+        return ""
+    return f"{weekday} {date_obj.day} {month}"
+
+
+def format_short_date(date_obj: dt.date | None) -> str:
+    """ex: "mar 24/03"."""
+    if not date_obj:
+        return ""
+    weekday = WEEKDAY_FR.get(date_obj.weekday(), "")
+    month = date_obj.month
+    if not weekday or not month:
+        return ""
+    return f"{weekday[0:3]} {date_obj.day}/{month:0>2}"
+
+
+def normalize_text(value: object) -> str:
+    text = str(value or "").strip().lower()
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def is_vo(value: object) -> bool:
+    return normalize_text(value).startswith("vo")
+
+
+def is_scolaire(categorie: object) -> bool:
+    return bool(_SCOLAIRE_RE.search(normalize_text(categorie)))
+
+
+def vo_label(vovf: object, version: object) -> str:
+    text = str(vovf).strip() or str(version).strip()
+    return "VO" if is_vo(text) else ""
+
+
+def service_categorie(categorie: object, vo: str) -> str:
+    text = normalize_text(str(categorie).strip())
+    label = ""
+    for group in SERVICE_CATEGORIES:
+        for name, pattern in group:
+            if pattern.search(text):
+                label = name
+                break
+    return f"{label} {vo}".strip()
+
+
+def extract_cm_title(text: str) -> str:
+    if not text:
+        return ""
+    cleaned = str(text).strip()
+    match = re.match(r"^(CM\d+)\s*:\s*(.+)$", cleaned)
+    if match:
+        cleaned = match.group(2).strip()
+    else:
+        for key in CM_KEYS:
+            if cleaned.startswith(key):
+                cleaned = cleaned[len(key):].strip(" :")
+                break
+    if " - " in cleaned:
+        cleaned = cleaned.split(" - ", 1)[0].strip()
+    return cleaned
+
+
+def load_cm_titles(source_path: Path) -> dict:
+    """Titres CM1 / CM2 (cellules E1 / E2 de source.xlsx)."""
+    wb = load_workbook(source_path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        cm1_raw = ws.cell(row=1, column=5).value or ""
+        cm2_raw = ws.cell(row=2, column=5).value or ""
+    finally:
+        wb.close()
+    return {
+        "CM1": extract_cm_title(cm1_raw),
+        "CM2": extract_cm_title(cm2_raw),
+    }
+
+
+class TableauData:
+    """Seances de normalized.xlsx et colonnes derivees, partagees entre tableaux."""
+
+    def __init__(self, df: pd.DataFrame, source_path: Path = SOURCE_PATH):
+        self.df = df
+        self.source_path = source_path
+        self._cm_titles: Optional[dict] = None
+        self._derived: dict = {}
+
+    @classmethod
+    def load(cls, in_path: Path = IN_PATH, source_path: Path = SOURCE_PATH) -> "TableauData":
+        df = pd.read_excel(in_path, sheet_name=0, dtype=object).fillna("")
+        return cls(df, source_path)
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    @property
+    def cm_titles(self) -> dict:
+        if self._cm_titles is None:
+            self._cm_titles = load_cm_titles(self.source_path)
+        return self._cm_titles
+
+    def column(self, name: str) -> list:
+        return self.derived(None, name)
+
+    def derived(self, func: Optional[Callable], *names: str) -> list:
+        """func appliquee aux colonnes names (une fois par valeur distincte), memoisee."""
+        key = (func, names)
+        if key not in self._derived:
+            if func is None:
+                self._derived[key] = column_values(self.df, names[0])
+            else:
+                self._derived[key] = map_unique(func, *(self.column(name) for name in names))
+        return self._derived[key]
+
+    # Colonnes communes a plusieurs tableaux
+    def dates(self) -> list:
+        return self.derived(to_date, "Date")
+
+    def titres(self) -> list:
+        return self.derived(_strip, "Titre")
+
+    def vo_labels(self) -> list:
+        return self.derived(vo_label, "VOVF", "Version")
+
+    def cm_keys(self) -> list:
+        """Seances avec court metrage: CM1 / CM2 presents dans la colonne CM et dans source.xlsx."""
+        return self.derived(self._cm_keys_of, "CM")
+
+    def _cm_keys_of(self, cm: object) -> list:
+        return [key for key in CM_KEYS if key in str(cm).upper() and self.cm_titles.get(key)]
+
+
+def _strip(value: object) -> str:
+    return str(value).strip()
+
+
+@dataclass(frozen=True)
+class Column:
+    header: str
+    values: Callable[[TableauData], list]
+    width: float
+    font: Font
+    alignment: Alignment
+
+    @property
+    def style(self) -> dict:
+        return {"font": self.font, "alignment": self.alignment}
+
+
+@dataclass(frozen=True)
+class Layout:
+    name: str
+    out_path: Path
+    columns: tuple
+    row_height: float
+    # lignes inserees avant chaque seance (une liste de lignes par seance)
+    before: Optional[Callable[[TableauData], list]] = None
+
+    def rows(self, data: TableauData) -> list:
+        columns = [column.values(data) for column in self.columns]
+        before = self.before(data) if self.before else None
+        rows = []
+        for index, values in enumerate(zip(*columns)):
+            if before:
+                rows.extend(before[index])
+            rows.append(list(values))
+        return rows
+
+
+def render(layout: Layout, data: TableauData, out_path: Optional[Path] = None) -> Path:
+    """Ecrit un tableau; PermissionError -> message si le fichier est ouvert dans Excel."""
+    out_path = out_path or layout.out_path
+    styles = [column.style for column in layout.columns]
+    try:
+        write_sheet(
+            out_path,
+            table_rows([column.header for column in layout.columns], layout.rows(data)),
+            cell_style=lambda row, col, value: styles[col - 1],
+            columns={
+                chr(ord("A") + index): {"width": column.width}
+                for index, column in enumerate(layout.columns)
+            },
+            row_height=layout.row_height,
+        )
+    except PermissionError as exc:
+        raise SystemExit(
+            f"Impossible d'ecrire {out_path}. Ferme le fichier Excel s'il est ouvert, puis relance le script."
+        ) from exc
+    print(f"OK: {out_path}")
+    return out_path
+
+
+# --- Tableau ingest (copier / coller mensuel) ---
+
+def _ingest_titres(data: TableauData) -> list:
+    titres = []
+    for titre, categorie_scolaire, cm_keys in zip(
+        data.titres(), data.derived(is_scolaire, "Categorie"), data.cm_keys()
+    ):
+        if categorie_scolaire:
+            titre = f"{titre} - SCOL" if titre else titre
+        for key in cm_keys:
+            titre = f"{titre} + {key}" if titre else titre
+        titres.append(titre)
+    return titres
+
+
+def _ingest_dates(data: TableauData) -> list:
+    return map_unique(format_long_date, data.dates())
+
+
+def _ingest_cm_rows(data: TableauData) -> list:
+    cm_titles = data.cm_titles
+    return [
+        [[f"{key} - {cm_titles[key]}", "", date_label, heure] for key in cm_keys]
+        for cm_keys, date_label, heure in zip(
+            data.cm_keys(), _ingest_dates(data), data.derived(format_time, "Heure")
+        )
+    ]
+
+
+_INGEST_ALIGN = Alignment(horizontal="center", vertical="center")
+_INGEST_FONT = Font(name="Merriweather", size=13, bold=False)
+
+INGEST = Layout(
+    name="ingest",
+    out_path=BASE_DIR / "work/tableau_ingest.xlsx",
+    columns=(
+        Column("Titre", _ingest_titres, 56, Font(name="Merriweather", size=13, bold=True), _INGEST_ALIGN),
+        Column("VO", TableauData.vo_labels, 10, _INGEST_FONT, _INGEST_ALIGN),
+        Column("Date", _ingest_dates, 24, _INGEST_FONT, _INGEST_ALIGN),
+        Column("Heure", lambda data: data.derived(format_time, "Heure"), 12, _INGEST_FONT, _INGEST_ALIGN),
+    ),
+    row_height=40,
+    before=_ingest_cm_rows,
+)
+
+
+# --- Tableau de service ---
+
+_SERVICE_FONT = Font(name="Colibri", size=14, bold=False)
+_SERVICE_CENTER = Alignment(horizontal="center", vertical="center")
+_SERVICE_LEFT = Alignment(horizontal="left", vertical="center")
+
+SERVICE = Layout(
+    name="service",
+    out_path=BASE_DIR / "work/tableau_service.xlsx",
+    columns=(
+        Column("Date", lambda data: map_unique(format_short_date, data.dates()), 24, _SERVICE_FONT, _SERVICE_CENTER),
+        Column("Heure", lambda data: data.column("Heure"), 12, _SERVICE_FONT, _SERVICE_CENTER),
+        Column("Titre", TableauData.titres, 56, _SERVICE_FONT, _SERVICE_LEFT),
+        Column(
+            "Categorie",
+            lambda data: map_unique(service_categorie, data.column("Categorie"), data.vo_labels()),
+            12,
+            _SERVICE_FONT,
+            _SERVICE_LEFT,
+        ),
+    ),
+    row_height=20,
+)
+
+LAYOUTS = {layout.name: layout for layout in (INGEST, SERVICE)}
+
+
+def render_tableaux(
+    names=None,
+    in_path: Path = IN_PATH,
+    source_path: Path = SOURCE_PATH,
+    out_paths: Optional[dict] = None,
+) -> list:
+    """Lit les entrees une fois et ecrit les tableaux demandes (tous par defaut)."""
+    layouts = [LAYOUTS[name] for name in (names or LAYOUTS)]
+    data = TableauData.load(in_path, source_path)
+    return [render(layout, data, (out_paths or {}).get(layout.name)) for layout in layouts]
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genere les tableaux internes depuis work/normalized.xlsx.")
+    parser.add_argument(
+        "tableaux",
+        nargs="*",
+        metavar="tableau",
+        help=f"Tableaux a generer parmi {', '.join(LAYOUTS)} (defaut: tous).",
+    )
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.tableaux if name not in LAYOUTS]
+    if unknown:
+        parser.error(f"tableau inconnu: {', '.join(unknown)}")
+    render_tableaux(args.tableaux)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+xlsx_writer.py
+Ecriture d'une feuille Excel mise en forme en une seule passe (openpyxl en
+mode write_only: les lignes partent sur disque au fil de l'eau).
+
+Remplace la sequence df.to_excel -> load_workbook -> mise en forme -> save
+de normalize.py et make_tableau_*.py: plus de relecture complete du fichier
+ni de deuxieme copie du tableau en memoire.
+
+- frame_rows(df) / table_rows(en-tete, lignes): lignes a ecrire, valeurs
+  converties comme to_excel (NaN -> "", Timestamp -> datetime, scalaires
+  NumPy -> Python, autres valeurs en texte).
+- write_sheet(path, rows, ...): cell_style(ligne, colonne, valeur) donne la
+  mise en forme de chaque cellule (font, border, alignment, number_format,
+  fill; indices 1-based comme openpyxl), columns / row_height les dimensions.
+- Fusions: la feuille write_only n'a pas de merge_cells(), mais les plages
+  ajoutees a ws.merged_cells sont bien ecrites a la fermeture. Comme avec
+  merge_cells(), seule la cellule en haut a gauche doit porter une valeur;
+  les autres ne gardent que leur mise en forme (bordures).
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.worksheet.cell_range import CellRange
+
+
+SHEET_TITLE = "Sheet1"  # nom par defaut de to_excel
+STYLE_ATTRIBUTES = ("font", "border", "alignment", "number_format", "fill")
+# formats appliques par to_excel aux dates
+DATE_FORMAT = "YYYY-MM-DD"
+DATETIME_FORMAT = "YYYY-MM-DD HH:MM:SS"
+
+
+def excel_value(value: Any) -> Any:
+    """Valeur de cellule ecrite comme par to_excel (na_rep="", le reste en texte)."""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value)
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, (datetime, date)):
+        return value
+    return str(value)
+
+
+def table_rows(header: Iterable, rows: Iterable[Iterable]) -> Iterable[list]:
+    """En-tete puis lignes, valeurs converties par excel_value."""
+    yield [excel_value(value) for value in header]
+    for values in rows:
+        yield [excel_value(value) for value in values]
+
+
+def frame_rows(df: pd.DataFrame) -> Iterable[list]:
+    """En-tete puis lignes du DataFrame (sans index)."""
+    return table_rows(df.columns, df.itertuples(index=False, name=None))
+
+
+def _default_number_format(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return DATETIME_FORMAT
+    if isinstance(value, date):
+        return DATE_FORMAT
+    return None
+
+
+def write_sheet(
+    path: Path,
+    rows: Iterable[list],
+    cell_style: Optional[Callable[[int, int, Any], Optional[dict]]] = None,
+    columns: Optional[dict[str, dict]] = None,
+    row_height: Optional[float] = None,
+    merges: Iterable[str] = (),
+    title: str = SHEET_TITLE,
+) -> int:
+    """
+    Ecrit les lignes (en-tete compris) dans path en une passe.
+    columns: {"A": {"width": 56, "auto_size": True, "font": ..., "alignment": ...}}.
+    row_height: hauteur appliquee a chaque ligne ecrite.
+    Retourne le nombre de lignes ecrites.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+
+    for letter, attributes in (columns or {}).items():
+        dimension = ws.column_dimensions[letter]
+        for name, value in attributes.items():
+            setattr(dimension, name, value)
+    for cell_range in merges:
+        ws.merged_cells.add(CellRange(cell_range))
+
+    row_count = 0
+    for row_idx, values in enumerate(rows, start=1):
+        if row_height is not None:
+            ws.row_dimensions[row_idx].height = row_height
+        cells = []
+        for col_idx, value in enumerate(values, start=1):
+            style = cell_style(row_idx, col_idx, value) if cell_style else None
+            number_format = _default_number_format(value)
+            if not style and number_format is None:
+                # texte vide sans mise en forme: cellule non ecrite
+                cells.append(None if value == "" else value)
+                continue
+            cell = WriteOnlyCell(ws, value=value)
+            if number_format is not None:
+                cell.number_format = number_format
+            for name in STYLE_ATTRIBUTES:
+                if style and style.get(name) is not None:
+                    setattr(cell, name, style[name])
+            cells.append(cell)
+        ws.append(cells)
+        row_count = row_idx
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return row_count